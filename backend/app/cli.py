@@ -0,0 +1,212 @@
+"""
+Maintenance commands, run from backend/:
+
+    python -m app.cli init-db [--check]
+    python -m app.cli backfill-latest-attempts
+    python -m app.cli backfill-attempt-answers [--batch-size N]
+    python -m app.cli rebuild-search-index
+    python -m app.cli rebuild-stats [--quiz-id ID] [--verify]
+    python -m app.cli rebuild-leaderboards [--quiz-id ID]
+    python -m app.cli regrade QUIZ_ID [--chunk-size N] [--restart]
+"""
+import argparse
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.core.database import SessionLocal, create_schema, missing_tables, pending_upgrades
+from app.services.attempts import backfill_attempt_answers, backfill_latest_attempts
+from app.services.leaderboard import rebuild_leaderboard
+from app.services.search import rebuild_search_index
+from app.services.regrade import regrade_quiz
+from app.services.stats import rebuild_stats
+
+
+def _answer_backfill_summary(report: dict) -> str:
+    return (
+        f"{report['answers']} row(s) for {report['attempts']} attempt(s), "
+        f"{report['skipped']} skipped (question deleted)"
+    )
+
+
+def cmd_init_db(args) -> int:
+    if args.check:
+        missing = missing_tables()
+        upgrades = pending_upgrades()
+        if missing:
+            print(f"schema: {len(missing)} table(s) missing: {', '.join(missing)}")
+        if upgrades:
+            print(f"schema: {len(upgrades)} upgrade(s) pending: {', '.join(upgrades)}")
+        pending = {"attempts": 0}
+        if not {"attempts", "attempt_answers"} & set(missing):
+            with SessionLocal() as db:
+                pending = backfill_attempt_answers(db, write=False)
+            if pending["attempts"]:
+                print(f"attempt_answers: backfill pending, {_answer_backfill_summary(pending)}")
+        if missing or upgrades or pending["attempts"]:
+            return 1
+        print("schema: up to date")
+        return 0
+    upgrades = pending_upgrades()
+    created = create_schema()
+    print(f"schema: {len(created)} table(s) created" + (f": {', '.join(created)}" if created else ""))
+    if upgrades:
+        print(f"schema: {len(upgrades)} upgrade(s) applied: {', '.join(upgrades)}")
+    # legacy attempts have answers only in details until this has run
+    with SessionLocal() as db:
+        report = backfill_attempt_answers(db)
+    if report["attempts"]:
+        print(f"attempt_answers: backfilled {_answer_backfill_summary(report)}")
+    return 0
+
+
+def cmd_backfill_latest_attempts(args) -> int:
+    create_schema()
+    with SessionLocal() as db:
+        inserted = backfill_latest_attempts(db)
+        db.commit()
+    print(f"latest_attempts: {inserted} row(s) backfilled")
+    return 0
+
+
+def cmd_backfill_attempt_answers(args) -> int:
+    create_schema()
+    with SessionLocal() as db:
+        report = backfill_attempt_answers(db, batch_size=args.batch_size)
+    print(f"attempt_answers: backfilled {_answer_backfill_summary(report)}")
+    return 0
+
+
+def cmd_rebuild_search_index(args) -> int:
+    create_schema()
+    with SessionLocal() as db:
+        indexed = rebuild_search_index(db)
+        db.commit()
+    print(f"quiz_search: {indexed} quiz(zes) indexed")
+    return 0
+
+
+def cmd_rebuild_stats(args) -> int:
+    create_schema()
+    with SessionLocal() as db:
+        report = rebuild_stats(db, quiz_id=args.quiz_id, verify=args.verify)
+        db.commit()
+    if args.verify:
+        mismatched = report["mismatched"]
+        print(f"quiz stats: {report['quizzes']} quiz(zes) checked, {len(mismatched)} out of date")
+        if mismatched:
+            print("  quiz ids: " + ", ".join(str(qid) for qid in mismatched))
+        return 1 if mismatched else 0
+    print(f"quiz stats: {report['quizzes']} quiz(zes), {report['questions']} question(s) rebuilt")
+    return 0
+
+
+def cmd_rebuild_leaderboards(args) -> int:
+    create_schema()
+    with SessionLocal() as db:
+        entries = rebuild_leaderboard(db, quiz_id=args.quiz_id)
+        db.commit()
+    print(f"best_attempts: {entries} row(s) rebuilt")
+    return 0
+
+
+def cmd_regrade(args) -> int:
+    create_schema()
+
+    def progress(report):
+        print(
+            f"  {report['status']:<10} answers {report['scanned']:>10}  "
+            f"changed {report['changed']:>8}  {report['rows_per_second']:>10.0f} rows/s",
+            flush=True,
+        )
+
+    with SessionLocal() as db:
+        try:
+            report = regrade_quiz(
+                db,
+                args.quiz_id,
+                chunk_size=args.chunk_size,
+                restart=args.restart,
+                on_chunk=progress,
+            )
+        except LookupError as exc:
+            print(exc)
+            return 1
+    print(
+        f"quiz {args.quiz_id} v{report['version']}: {report['status']}, "
+        f"{report['run_scanned']} answer(s) scanned this run, {report['run_changed']} changed, "
+        f"{report['rows_per_second']:.0f} rows/s"
+    )
+    return 0 if report["status"] == "done" else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="QuickQuiz maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init_db = commands.add_parser(
+        "init-db",
+        help="Create missing tables, columns and indexes and backfill answer rows (run once per deploy)",
+    )
+    init_db.add_argument(
+        "--check",
+        action="store_true",
+        help="report missing tables, pending upgrades and backfills only, exit 1 if any",
+    )
+    init_db.set_defaults(func=cmd_init_db)
+
+    backfill = commands.add_parser(
+        "backfill-latest-attempts",
+        help="Fill latest_attempts from existing attempts",
+    )
+    backfill.set_defaults(func=cmd_backfill_latest_attempts)
+
+    answers = commands.add_parser(
+        "backfill-attempt-answers",
+        help="Create attempt_answers rows from legacy Attempt.details JSON",
+    )
+    answers.add_argument("--batch-size", type=int, default=1000, help="attempts per commit")
+    answers.set_defaults(func=cmd_backfill_attempt_answers)
+
+    reindex = commands.add_parser(
+        "rebuild-search-index",
+        help="Rebuild the quiz full-text search index",
+    )
+    reindex.set_defaults(func=cmd_rebuild_search_index)
+
+    stats = commands.add_parser(
+        "rebuild-stats",
+        help="Recompute quiz/question stats from attempts",
+    )
+    stats.add_argument("--quiz-id", type=int, default=None, help="only this quiz")
+    stats.add_argument("--verify", action="store_true", help="compare only, exit 1 on drift")
+    stats.set_defaults(func=cmd_rebuild_stats)
+
+    leaderboards = commands.add_parser(
+        "rebuild-leaderboards",
+        help="Recompute best attempts per user and quiz from attempts",
+    )
+    leaderboards.add_argument("--quiz-id", type=int, default=None, help="only this quiz")
+    leaderboards.set_defaults(func=cmd_rebuild_leaderboards)
+
+    regrade = commands.add_parser(
+        "regrade",
+        help="Regrade stored attempts of a quiz against its current answer key",
+    )
+    regrade.add_argument("quiz_id", type=int)
+    regrade.add_argument("--chunk-size", type=int, default=None, help="answers per chunk/commit")
+    regrade.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    regrade.set_defaults(func=cmd_regrade)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
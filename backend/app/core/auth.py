@@ -1,46 +1,80 @@
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
-import os, json, firebase_admin
-from firebase_admin import auth as firebase_auth, credentials
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+import os, json, threading
 
-from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.database import SessionLocal, dialect_insert, get_async_sessionmaker
+from app.core.metrics import timed_auth
+from app.core.startup import timings as startup_timings
+from app.core.token_cache import IdentityCache, TokenCache
 from app.models.models import User
 
 
 # ---------------------------------------------------------------------------
 #  Firebase Admin Initialization (LOCAL + PRODUCTION)
 # ---------------------------------------------------------------------------
+# Done once, on the first token that needs verifying, rather than at import:
+# importing firebase_admin and parsing the service account is the slowest
+# part of booting a worker, and tests and the CLI never need it.
 
-if not firebase_admin._apps:
+_firebase_lock = threading.Lock()
+
+
+def firebase_configured() -> bool:
+    """Whether credentials are set up, without loading them."""
     service_key_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-    firebase_creds_json = os.getenv("FIREBASE_CREDENTIALS")
+    return bool(service_key_path and os.path.exists(service_key_path)) or bool(
+        os.getenv("FIREBASE_CREDENTIALS")
+    )
 
-    try:
-        if service_key_path and os.path.exists(service_key_path):
-            # load from local file path
-            cred = credentials.Certificate(service_key_path)
-            firebase_admin.initialize_app(cred)
-            print("Firebase initialized using GOOGLE_APPLICATION_CREDENTIALS file")
-
-        elif firebase_creds_json:
-            # load from env string
-            cred_dict = json.loads(firebase_creds_json)
-            cred = credentials.Certificate(cred_dict)
-            firebase_admin.initialize_app(cred)
-            print("Firebase initialized using FIREBASE_CREDENTIALS json")
-
-        else:
-            raise Exception(
-                "No Firebase service credential found. "
-                "Set GOOGLE_APPLICATION_CREDENTIALS to a JSON file path, "
-                "or FIREBASE_CREDENTIALS to the JSON string."
-            )
 
-    except Exception as e:
-        print("🔥 Firebase initialization error:", e)
-        # DO NOT fallback to ApplicationDefault for local dev
-        raise e
+def init_firebase():
+    """Initialize Firebase Admin if needed; returns the firebase_admin.auth module."""
+    import firebase_admin
+    from firebase_admin import auth as firebase_auth, credentials
+
+    if firebase_admin._apps:
+        return firebase_auth
+
+    with _firebase_lock, startup_timings.phase("first_use:firebase"):
+        if firebase_admin._apps:
+            return firebase_auth
+
+        service_key_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+        firebase_creds_json = os.getenv("FIREBASE_CREDENTIALS")
+
+        try:
+            if service_key_path and os.path.exists(service_key_path):
+                # load from local file path
+                cred = credentials.Certificate(service_key_path)
+                firebase_admin.initialize_app(cred)
+                print("Firebase initialized using GOOGLE_APPLICATION_CREDENTIALS file")
+
+            elif firebase_creds_json:
+                # load from env string
+                cred_dict = json.loads(firebase_creds_json)
+                cred = credentials.Certificate(cred_dict)
+                firebase_admin.initialize_app(cred)
+                print("Firebase initialized using FIREBASE_CREDENTIALS json")
+
+            else:
+                raise Exception(
+                    "No Firebase service credential found. "
+                    "Set GOOGLE_APPLICATION_CREDENTIALS to a JSON file path, "
+                    "or FIREBASE_CREDENTIALS to the JSON string."
+                )
+
+        except Exception as e:
+            print("🔥 Firebase initialization error:", e)
+            # DO NOT fallback to ApplicationDefault for local dev
+            raise e
+
+    return firebase_auth
 
 
 # ---------------------------------------------------------------------------
@@ -62,22 +96,177 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+# ---------------------------------------------------------------------------
+# Token verification (+ verified-token cache)
+# ---------------------------------------------------------------------------
+
+token_cache = TokenCache(
+    max_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    max_ttl=settings.AUTH_TOKEN_CACHE_TTL,
+)
+user_cache = IdentityCache(max_size=settings.AUTH_USER_CACHE_SIZE)
+
+def _verify_with_firebase(token: str) -> dict:
+    return init_firebase().verify_id_token(token)
+
+
+_token_verifier = _verify_with_firebase
+
+
+def set_token_verifier(verifier) -> None:
+    """Swap the ID-token verifier (e.g. a static-key verifier in tests)."""
+    global _token_verifier
+    _token_verifier = verifier
+    token_cache.clear()
+    user_cache.clear()
+
+
+def _user_snapshot(user: User) -> dict:
+    return {
+        "id": user.id,
+        "firebase_uid": user.firebase_uid,
+        "email": user.email,
+        "display_name": user.display_name,
+        "picture": user.picture,
+    }
+
+
+def _detached_user(snapshot: dict) -> User:
+    # Rebuild the User from the cached snapshot without touching the DB.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
 # ---------------------------------------------------------------------------
 # helpers
 # ---------------------------------------------------------------------------
 
-def _get_or_create_user(db: Session, uid: str, email: str = None, name: str = "", picture: str = None) -> User:
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        user = User(
-            firebase_uid=uid,
-            email=email or f"{uid}@unknown.local",
-            display_name=name,
-            picture=picture,
+_USER_COLUMNS = (User.id, User.firebase_uid, User.email, User.display_name, User.picture)
+
+
+def _upsert_user(db: Session, uid: str, email: str, name: str, picture) -> dict:
+    """
+    Create or refresh the user for `uid` in one INSERT ... ON CONFLICT
+    (firebase_uid) DO UPDATE ... RETURNING, so concurrent first requests
+    of a new user can't race each other into a unique violation.
+    """
+    stmt = dialect_insert(db, User).values(
+        firebase_uid=uid, email=email, display_name=name, picture=picture
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.firebase_uid],
+        set_={
+            "email": stmt.excluded.email,
+            "display_name": stmt.excluded.display_name,
+            "picture": stmt.excluded.picture,
+        },
+    ).returning(*_USER_COLUMNS)
+    try:
+        row = db.execute(stmt).one()
+    except IntegrityError:
+        # the email belongs to another row (nothing else is written
+        # before auth, so the whole transaction can go)
+        db.rollback()
+        row = _relink_user(db, uid, email, name, picture)
+    db.commit()
+    return dict(row._mapping)
+
+
+def _relink_user(db: Session, uid: str, email: str, name: str, picture):
+    profile = {"display_name": name, "picture": picture}
+    # uid known, but its new email is taken: keep the old one
+    row = db.execute(
+        update(User).where(User.firebase_uid == uid).values(**profile).returning(*_USER_COLUMNS)
+    ).first()
+    if row is None:
+        # a new uid for an existing email (e.g. the Firebase account was
+        # recreated): the account follows the email, as it always has
+        row = db.execute(
+            update(User)
+            .where(User.email == email)
+            .values(firebase_uid=uid, **profile)
+            .returning(*_USER_COLUMNS)
+        ).one()
+    return row
+
+
+def _user_from_claims(db: Session, token: str, decoded: dict):
+    """
+    The User for verified `decoded` claims, as a detached instance.
+
+    Costs no statement when `user_cache` has the uid with the same profile
+    claims, and a single upsert otherwise.
+    """
+    uid = decoded.get("uid")
+    if not uid:
+        return None
+
+    email = decoded.get("email") or f"{uid}@unknown.local"
+    name = decoded.get("name", "")
+    picture = decoded.get("picture")
+    profile = (email, name, picture)
+
+    snapshot = user_cache.get(uid, profile)
+    if snapshot is None:
+        snapshot = _upsert_user(db, uid, email, name, picture)
+        user_cache.put(uid, profile, snapshot)
+    token_cache.put(token, decoded, snapshot)
+    return _detached_user(dict(snapshot))
+
+
+def _resolve_user(db: Session, token: str):
+    """
+    Verify `token` and return its User, or None if the token has no uid.
+
+    Repeat tokens are served from `token_cache` with no signature check
+    and no user statement. Verification errors propagate to the caller.
+    """
+    with timed_auth():
+        cached = token_cache.get(token)
+        if cached is not None:
+            return _detached_user(cached.user)
+
+        return _user_from_claims(db, token, _token_verifier(token))
+
+
+async def _resolve_user_async(db: AsyncSession, token: str):
+    """Async twin of `_resolve_user`; verification runs off the event loop."""
+    with timed_auth():
+        cached = token_cache.get(token)
+        if cached is not None:
+            return _detached_user(cached.user)
+
+        decoded = await run_in_threadpool(_token_verifier, token)
+        return await db.run_sync(_user_from_claims, token, decoded)
+
+
+def _missing_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Missing authorization token",
+    )
+
+
+def _invalid_token(e: Exception) -> HTTPException:
+    print("Auth error:", e)
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired token",
+    )
+
+
+def _require_user(user):
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid Firebase token",
         )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
     return user
 
 
@@ -90,33 +279,29 @@ def get_current_user(
     db: Session = Depends(get_db),
 ):
     if credentials is None or not credentials.credentials:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization token",
-        )
+        raise _missing_token()
 
-    token = credentials.credentials
     try:
-        decoded_token = firebase_auth.verify_id_token(token)
-        uid = decoded_token.get("uid")
-        email = decoded_token.get("email")
-        name = decoded_token.get("name", "")
-        picture = decoded_token.get("picture")
+        user = _resolve_user(db, credentials.credentials)
+    except Exception as e:
+        raise _invalid_token(e)
 
-        if not uid:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid Firebase token",
-            )
+    return _require_user(user)
 
-        return _get_or_create_user(db, uid, email, name, picture)
 
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if credentials is None or not credentials.credentials:
+        raise _missing_token()
+
+    try:
+        user = await _resolve_user_async(db, credentials.credentials)
     except Exception as e:
-        print("Auth error:", e)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-        )
+        raise _invalid_token(e)
+
+    return _require_user(user)
 
 
 # ---------------------------------------------------------------------------
@@ -131,16 +316,19 @@ def get_optional_user(
         return None
 
     try:
-        decoded = firebase_auth.verify_id_token(creds.credentials)
-        uid = decoded.get("uid")
-        email = decoded.get("email")
-        name = decoded.get("name", "")
-        picture = decoded.get("picture")
+        return _resolve_user(db, creds.credentials)
+    except Exception:
+        return None
 
-        if not uid:
-            return None
 
-        return _get_or_create_user(db, uid, email, name, picture)
+async def get_optional_user_async(
+    creds: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if creds is None or not creds.credentials:
+        return None
 
+    try:
+        return await _resolve_user_async(db, creds.credentials)
     except Exception:
         return None
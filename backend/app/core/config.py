@@ -3,8 +3,85 @@ import os
 
 load_dotenv()
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./quickquiz.db")
     FIREBASE_PROJECT_ID: str = os.getenv("FIREBASE_PROJECT_ID", "")
 
+    # create missing tables when a worker starts (handy for a single local
+    # server); otherwise run `python -m app.cli init-db` once per deploy
+    SCHEMA_CREATE_ON_STARTUP: bool = _env_bool("SCHEMA_CREATE_ON_STARTUP", False)
+
+    # serve routes on the asyncio engine (aiosqlite / asyncpg) instead of
+    # the threadpool + sync engine
+    ASYNC_DB: bool = _env_bool("ASYNC_DB", False)
+
+    # connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = _env_bool("DB_POOL_PRE_PING", True)
+    # Postgres statement_timeout in ms (0 = server default)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+    # SQLite connection pragmas
+    SQLITE_WAL: bool = _env_bool("SQLITE_WAL", True)
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+    # verified Firebase ID tokens kept in-process (0 disables the cache)
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    AUTH_TOKEN_CACHE_TTL: int = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+
+    # firebase_uid -> user rows kept in-process (0 disables the cache)
+    AUTH_USER_CACHE_SIZE: int = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+
+    # also write the legacy Attempt.details JSON copy of each result
+    STORE_ATTEMPT_DETAILS: bool = _env_bool("STORE_ATTEMPT_DETAILS", True)
+
+    # compiled answer keys kept in-process per worker (0 disables the cache)
+    ANSWER_KEY_CACHE_SIZE: int = int(os.getenv("ANSWER_KEY_CACHE_SIZE", "1024"))
+
+    # leaderboards: rows kept per quiz in the in-process top-K cache, how
+    # many quizzes it holds (0 disables it) and for how many seconds
+    LEADERBOARD_SIZE: int = int(os.getenv("LEADERBOARD_SIZE", "100"))
+    LEADERBOARD_CACHE_SIZE: int = int(os.getenv("LEADERBOARD_CACHE_SIZE", "1024"))
+    LEADERBOARD_CACHE_TTL: float = float(os.getenv("LEADERBOARD_CACHE_TTL", "5"))
+
+    # regrade existing attempts in the background when an edit changes the
+    # answer key (otherwise run `python -m app.cli regrade <quiz_id>`)
+    REGRADE_ON_UPDATE: bool = _env_bool("REGRADE_ON_UPDATE", False)
+    REGRADE_CHUNK_SIZE: int = int(os.getenv("REGRADE_CHUNK_SIZE", "5000"))
+
+    # bulk import: quizzes per transaction, and the largest accepted upload
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    IMPORT_MAX_BYTES: int = int(os.getenv("IMPORT_MAX_BYTES", str(64 * 1024 * 1024)))
+
+    # per-request SQL / auth / serialization timings: Server-Timing response
+    # header and per-route histograms at GET /metrics
+    METRICS_ENABLED: bool = _env_bool("METRICS_ENABLED", True)
+    SERVER_TIMING_HEADER: bool = _env_bool("SERVER_TIMING_HEADER", True)
+
+    # hot routes return orjson-encoded bodies they have already shaped to
+    # their response_model, skipping FastAPI's re-validation (app.core.responses)
+    FAST_RESPONSES: bool = _env_bool("FAST_RESPONSES", False)
+
+    # max-age (seconds) for publicly cacheable GET responses
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "30"))
+
+    # shared response cache for read endpoints: none | memory | sqlite
+    # (use sqlite to share one cache between all workers on a host)
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "none")
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+    RESPONSE_CACHE_PATH: str = os.getenv("RESPONSE_CACHE_PATH", "./.cache/responses.db")
+
 settings = Settings()
@@ -1,10 +1,404 @@
-import os
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import create_engine, event, exc, inspect
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+from app.core.config import settings
+from app.core.startup import timings as startup_timings
+
+DATABASE_URL = settings.DATABASE_URL
+
+
+# ---------------------------------------------------------------------------
+# Pool statistics
+# ---------------------------------------------------------------------------
+
+class PoolStats:
+    """Checkout counters and wait times for one engine's connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.pool = None
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds,
+                "wait_seconds_max": self.max_wait_seconds,
+            }
+        if self.pool is not None and hasattr(self.pool, "checkedout"):
+            data.update(
+                pool_size=self.pool.size(),
+                checked_out=self.pool.checkedout(),
+                overflow=self.pool.overflow(),
+            )
+        return data
+
+
+def _instrumented_pool(base, stats: PoolStats):
+    class InstrumentedPool(base):
+        # recreate() rebuilds pools via self.__class__, so stats carry over
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            stats.pool = self
+
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                conn = super().connect()
+            except exc.TimeoutError:
+                stats.record(time.perf_counter() - start, timed_out=True)
+                raise
+            stats.record(time.perf_counter() - start)
+            return conn
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+# ---------------------------------------------------------------------------
+# Engine factory
+# ---------------------------------------------------------------------------
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        if settings.SQLITE_MMAP_SIZE:
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def engine_options(url: str, is_async: bool = False, stats: PoolStats = None) -> dict:
+    """create_engine/create_async_engine kwargs for `url`, driven by settings."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = parsed.get_driver_name()
+    options: dict = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    connect_args: dict = {}
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./quickquiz.db")
+    if backend == "sqlite":
+        if not is_async:
+            connect_args["check_same_thread"] = False
+        connect_args["timeout"] = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+    elif backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(int(settings.DB_STATEMENT_TIMEOUT_MS))
+        if driver == "asyncpg":
+            connect_args["server_settings"] = {"statement_timeout": timeout}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    if not _is_memory_sqlite(parsed):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+        if stats is not None:
+            base = AsyncAdaptedQueuePool if is_async else QueuePool
+            options["poolclass"] = _instrumented_pool(base, stats)
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def build_engine(url: str = None, stats: PoolStats = None):
+    url = url or DATABASE_URL
+    new_engine = create_engine(url, **engine_options(url, stats=stats))
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine, "connect", _apply_sqlite_pragmas)
+    return new_engine
+
+
+# ---------------------------------------------------------------------------
+# Lazily built engine
+# ---------------------------------------------------------------------------
+# Nothing connects, or even imports the DB driver, until the first session
+# is opened: importing the app (tests, the CLI, every worker boot) stays
+# free of database work. `database.engine` still works and builds it.
+
+pool_stats = PoolStats()
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """The app's Engine for DATABASE_URL, built once on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                with startup_timings.phase("first_use:engine"):
+                    _engine = build_engine(DATABASE_URL, stats=pool_stats)
+    return _engine
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to get_engine() when the first session is made."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+def __getattr__(name):
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+# There is no migration tool: `python -m app.cli init-db` compares the
+# database with the models (tables, columns, indexes) and creates what is
+# missing. New columns on existing tables are added with ALTER TABLE, so
+# they must be nullable or have a server_default.
+
+def _schema_tables():
+    from app.models import models  # noqa: F401 -- registers the tables on Base
+
+    return Base.metadata.sorted_tables
+
+
+def missing_tables(bind=None) -> list[str]:
+    """Tables of the model that don't exist in the database yet."""
+    existing = set(inspect(bind or get_engine()).get_table_names())
+    return [table.name for table in _schema_tables() if table.name not in existing]
+
+
+def missing_columns(bind=None) -> list[str]:
+    """Model columns ("table.column") missing from tables that already exist."""
+    inspector = inspect(bind or get_engine())
+    existing = set(inspector.get_table_names())
+    missing = []
+    for table in _schema_tables():
+        if table.name not in existing:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing.extend(f"{table.name}.{column.name}" for column in table.columns if column.name not in columns)
+    return missing
+
+
+def _sorted_indexes(table) -> list:
+    return sorted(table.indexes, key=lambda index: index.name)
+
+
+def missing_indexes(bind=None) -> list[str]:
+    """Model indexes missing from tables that already exist."""
+    inspector = inspect(bind or get_engine())
+    existing = set(inspector.get_table_names())
+    missing = []
+    for table in _schema_tables():
+        if table.name not in existing:
+            continue
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing.extend(index.name for index in _sorted_indexes(table) if index.name not in indexes)
+    return missing
+
+
+def _tables_without_autoincrement(conn) -> list:
+    """SQLite tables the model declares with sqlite_autoincrement but were created without it."""
+    if conn.dialect.name != "sqlite":
+        return []
+    tables = []
+    for table in _schema_tables():
+        if not table.dialect_options["sqlite"]["autoincrement"]:
+            continue
+        ddl = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table.name,)
+        ).scalar()
+        if ddl is not None and "AUTOINCREMENT" not in ddl.upper():
+            tables.append(table)
+    return tables
+
+
+# Deleted quizzes' ids live on in attempts; a rebuilt quizzes table must not
+# hand them out again, or (id, version) would name two different quizzes.
+_ID_FLOORS = {
+    "quizzes": "SELECT max(id) FROM (SELECT max(id) AS id FROM quizzes UNION ALL SELECT max(quiz_id) FROM attempts)",
+}
+
+
+def _rebuild_sqlite_table(conn, table) -> None:
+    """
+    Recreate `table` from the model, keeping its rows and ids: SQLite can't
+    ALTER a table into AUTOINCREMENT. The counter starts above every id the
+    table still has or (_ID_FLOORS) that other tables still reference.
+    """
+    preparer = conn.dialect.identifier_preparer
+    name = preparer.format_table(table)
+    temp = preparer.quote(f"{table.name}__rebuild")
+    columns = ", ".join(preparer.format_column(column) for column in table.columns)
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect)).replace(f"TABLE {name} ", f"TABLE {temp} ", 1)
+
+    conn.exec_driver_sql(ddl)
+    conn.exec_driver_sql(f"INSERT INTO {temp} ({columns}) SELECT {columns} FROM {name}")
+    conn.exec_driver_sql(f"DROP TABLE {name}")
+    conn.exec_driver_sql(f"ALTER TABLE {temp} RENAME TO {name}")
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+
+    floor = conn.exec_driver_sql(_ID_FLOORS[table.name]).scalar() if table.name in _ID_FLOORS else None
+    if floor:
+        conn.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = ?", (table.name,))
+        conn.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table.name, floor))
+
+
+def pending_upgrades(bind=None) -> list[str]:
+    """
+    What upgrade_tables would change: missing columns, SQLite tables to
+    rebuild, then missing indexes.
+    """
+    bind = bind or get_engine()
+    with bind.connect() as conn:
+        rebuilds = [f"{table.name} (AUTOINCREMENT)" for table in _tables_without_autoincrement(conn)]
+    return missing_columns(bind) + rebuilds + [f"index {name}" for name in missing_indexes(bind)]
+
+
+def upgrade_tables(bind=None) -> list[str]:
+    """
+    Bring existing tables up to the model: add missing columns, on SQLite
+    rebuild tables that should use AUTOINCREMENT, and create missing
+    indexes. Returns what was changed, as pending_upgrades lists it.
+    """
+    bind = bind or get_engine()
+    by_name = {table.name: table for table in _schema_tables()}
+    columns = missing_columns(bind)
+    indexes = set(missing_indexes(bind))
+    changed = list(columns)
+    with bind.begin() as conn:
+        preparer = conn.dialect.identifier_preparer
+        for qualified in columns:
+            table_name, column_name = qualified.split(".", 1)
+            column = by_name[table_name].c[column_name]
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(f"{qualified} is NOT NULL without a server_default, so it can't be added")
+            spec = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {preparer.format_table(column.table)} ADD COLUMN {spec}")
+        for table in _tables_without_autoincrement(conn):
+            _rebuild_sqlite_table(conn, table)
+            changed.append(f"{table.name} (AUTOINCREMENT)")
+        for table in _schema_tables():
+            for index in _sorted_indexes(table):
+                if index.name in indexes:
+                    index.create(conn, checkfirst=True)
+                    changed.append(f"index {index.name}")
+    return changed
+
+
+def create_schema(bind=None) -> list[str]:
+    """
+    Create missing tables and indexes and upgrade existing tables (see
+    upgrade_tables); returns the names of the tables created. Run by
+    `python -m app.cli init-db`, not on import or worker startup.
+    """
+    bind = bind or get_engine()
+    missing = missing_tables(bind)
+    Base.metadata.create_all(bind=bind)
+    upgrade_tables(bind)
+    return missing
+
+
+def dialect_insert(session, model):
+    """
+    INSERT for `model` from the session's dialect, so callers can use
+    ON CONFLICT upserts on both SQLite and Postgres.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+# ---------------------------------------------------------------------------
+# Async engine (ASYNC_DB=true)
+# ---------------------------------------------------------------------------
+# Same database, reached through an asyncio driver: aiosqlite for SQLite,
+# asyncpg for Postgres. Built on first use so the sync stack never needs the
+# async drivers installed.
+
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+}
+
+async_pool_stats = PoolStats()
+_async_sessionmaker = None
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.drivername.split("+", 1)[0]
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {parsed.drivername!r}")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def build_async_engine(url: str = None, stats: PoolStats = None):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_url = to_async_url(url or DATABASE_URL)
+    async_engine = create_async_engine(
+        async_url, **engine_options(async_url, is_async=True, stats=stats)
+    )
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return async_engine
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of whichever engines were built (on shutdown)."""
+    if _async_sessionmaker is not None:
+        await _async_sessionmaker.kw["bind"].dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+def get_async_sessionmaker():
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        with startup_timings.phase("first_use:async_engine"):
+            _async_sessionmaker = async_sessionmaker(
+                build_async_engine(DATABASE_URL, stats=async_pool_stats),
+                autoflush=False,
+            )
+    return _async_sessionmaker
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+# ---------------------------------------------------------------------------
+# ETags / conditional GET
+# ---------------------------------------------------------------------------
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the given parts (ids, versions, view flags ...)."""
+    raw = "|".join(str(p) for p in parts).encode()
+    return '"' + hashlib.sha1(raw).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return etag in candidates
+
+
+def cache_headers(etag: str, shared: bool) -> dict:
+    """
+    Headers for a cacheable GET.
+
+    `shared` responses are identical for every viewer and may sit in a CDN;
+    anything else (e.g. a creator's view with answers) is private to the
+    browser and must be revalidated on each use.
+    """
+    if shared:
+        cache_control = f"public, max-age={settings.HTTP_CACHE_MAX_AGE}"
+    else:
+        cache_control = "private, no-cache"
+    return {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Authorization",
+    }
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
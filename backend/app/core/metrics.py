@@ -0,0 +1,371 @@
+import asyncio
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# ---------------------------------------------------------------------------
+# Per-request timings
+# ---------------------------------------------------------------------------
+# TimingMiddleware puts a RequestTimings in a context variable for the
+# duration of each HTTP request. Everything that runs on behalf of the
+# request sees the same object: the threadpool copies the context into
+# sync handlers, and AsyncSession.run_sync stays on the same context.
+# Engine-wide cursor hooks count statements and DB time into it, the auth
+# dependency adds its verification time, and TimedRoute marks when the
+# endpoint returned so the remainder up to the response headers can be
+# reported as serialization.
+#
+# Phases overlap: auth includes the user lookup, which is also DB time.
+# The Server-Timing header covers work done before the response headers.
+# The /metrics histograms cover the whole request, including streamed
+# bodies and background tasks.
+
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    __slots__ = (
+        "started",
+        "db_statements",
+        "db_seconds",
+        "auth_seconds",
+        "endpoint_seconds",
+        "endpoint_done",
+        "serialize_seconds",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_statements = 0
+        self.db_seconds = 0.0
+        self.auth_seconds = 0.0
+        self.endpoint_seconds = 0.0
+        self.endpoint_done = None
+        self.serialize_seconds = 0.0
+
+    def server_timing(self, now: float) -> str:
+        if self.endpoint_done is not None:
+            self.serialize_seconds = now - self.endpoint_done
+        return ", ".join(
+            (
+                f'db;desc="{self.db_statements} queries";dur={self.db_seconds * 1000:.2f}',
+                f"auth;dur={self.auth_seconds * 1000:.2f}",
+                f"app;dur={self.endpoint_seconds * 1000:.2f}",
+                f"serialize;dur={self.serialize_seconds * 1000:.2f}",
+                f"total;dur={(now - self.started) * 1000:.2f}",
+            )
+        )
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def timed_auth():
+    """Add the enclosed time to the current request's auth phase."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.auth_seconds += time.perf_counter() - start
+
+
+# ---------------------------------------------------------------------------
+# SQL statement hooks
+# ---------------------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._timing_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    started = getattr(context, "_timing_started", None)
+    if timings is not None and started is not None:
+        timings.db_statements += 1
+        timings.db_seconds += time.perf_counter() - started
+
+
+def install_engine_hooks() -> None:
+    """Count statements on every Engine (sync, async and test engines alike)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ---------------------------------------------------------------------------
+# Endpoint timing
+# ---------------------------------------------------------------------------
+
+def _timed_endpoint(endpoint):
+    if getattr(endpoint, "_timed", False):
+        return endpoint  # include_router may rebuild routes from wrapped endpoints
+
+    def done(timings, start):
+        timings.endpoint_done = time.perf_counter()
+        timings.endpoint_seconds += timings.endpoint_done - start
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                done(timings, start)
+    else:
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return endpoint(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                done(timings, start)
+    timed._timed = True
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that records how long the endpoint function itself ran."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Aggregation + Prometheus exposition
+# ---------------------------------------------------------------------------
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+# (metric name, help text, buckets), in MetricsRegistry.observe value order
+HISTOGRAMS = (
+    ("request_duration_seconds", "Request duration, including streamed bodies", SECONDS_BUCKETS),
+    ("db_statements", "SQL statements executed per request", STATEMENT_BUCKETS),
+    ("db_seconds", "Time spent executing SQL per request", SECONDS_BUCKETS),
+    ("auth_seconds", "Time spent authenticating per request", SECONDS_BUCKETS),
+    ("serialize_seconds", "Time from endpoint return to response headers", SECONDS_BUCKETS),
+)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * (size + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Per-(method, route) histograms, cheap to update on every request."""
+
+    def __init__(self, prefix: str = "quickquiz"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], list[_Histogram]] = {}
+        self._requests: dict[tuple[str, str, int], int] = {}
+
+    def observe(self, method: str, route: str, status: int, timings: RequestTimings, duration: float) -> None:
+        values = (
+            duration,
+            timings.db_statements,
+            timings.db_seconds,
+            timings.auth_seconds,
+            timings.serialize_seconds,
+        )
+        with self._lock:
+            histograms = self._routes.get((method, route))
+            if histograms is None:
+                histograms = self._routes[(method, route)] = [
+                    _Histogram(len(buckets)) for _, _, buckets in HISTOGRAMS
+                ]
+            for histogram, (_, _, buckets), value in zip(histograms, HISTOGRAMS, values):
+                histogram.counts[bisect.bisect_left(buckets, value)] += 1
+                histogram.total += value
+                histogram.count += 1
+            key = (method, route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._requests.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            routes = {k: [(h.counts[:], h.total, h.count) for h in v] for k, v in self._routes.items()}
+            requests = dict(self._requests)
+
+        name = f"{self.prefix}_requests_total"
+        lines = [f"# HELP {name} Requests by route and status", f"# TYPE {name} counter"]
+        for (method, route, status), count in sorted(requests.items()):
+            lines.append(f'{name}{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+        for index, (metric, help_text, buckets) in enumerate(HISTOGRAMS):
+            name = f"{self.prefix}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), histograms in sorted(routes.items()):
+                counts, total, count = histograms[index]
+                labels = f'method="{method}",route="{_escape(route)}"'
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {total}")
+                lines.append(f"{name}_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class StatsCollector:
+    """
+    Caches and pools keep their own counters behind a stats() dict. Sources
+    registered here are read on every /metrics scrape: each numeric value
+    becomes `<prefix>_<name>_<key>`, a counter if `key` is in `counters`,
+    otherwise a gauge. Other values (backend names) are skipped.
+    """
+
+    def __init__(self, prefix: str = "quickquiz"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._sources: list[tuple[str, str, Callable[[], dict], frozenset, dict]] = []
+
+    def register(
+        self,
+        name: str,
+        stats: Callable[[], dict],
+        help_text: str,
+        counters: tuple = (),
+        labels: Optional[dict] = None,
+    ) -> None:
+        with self._lock:
+            self._sources.append((name, help_text, stats, frozenset(counters), dict(labels or {})))
+
+    def render(self) -> str:
+        with self._lock:
+            sources = list(self._sources)
+
+        metrics: dict[str, tuple[str, str, list]] = {}
+        for name, help_text, stats, counters, labels in sources:
+            for key, value in stats().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = f"{self.prefix}_{name}_{key}"
+                if key in counters and not metric.endswith("_total"):
+                    metric += "_total"
+                kind = "counter" if key in counters else "gauge"
+                _, _, samples = metrics.setdefault(metric, (kind, f"{help_text}: {key.replace('_', ' ')}", []))
+                samples.append((labels, value))
+
+        lines = []
+        for metric, (kind, help_text, samples) in metrics.items():
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+                lines.append(f"{metric}{{{label_text}}} {value}" if label_text else f"{metric} {value}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def route_template(scope) -> str:
+    """
+    The matched route's full path template, e.g. "/api/quizzes/{quiz_id}",
+    or "unmatched". Routes of an included router may carry only their own
+    part of the path, so the include prefix is recovered from the request
+    path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return "unmatched"
+    try:
+        suffix = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope["path"]
+    if suffix and not path.endswith(suffix):
+        return template
+    return path[: len(path) - len(suffix)] + template
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+collector = StatsCollector()
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware buffering, so streamed
+    responses stay streamed). Adds Server-Timing to the response headers
+    and records the request in `registry` once the body has been sent.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = registry, server_timing: bool = True):
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = timings.server_timing(time.perf_counter())
+                if self.server_timing:
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"server-timing", header.encode())],
+                    }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self.registry.observe(
+                scope["method"],
+                route_template(scope),
+                status,
+                timings,
+                time.perf_counter() - timings.started,
+            )
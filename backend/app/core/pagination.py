@@ -0,0 +1,45 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+# ---------------------------------------------------------------------------
+# Opaque keyset cursors
+# ---------------------------------------------------------------------------
+# A cursor is the sort key of the last row on a page, JSON-encoded and
+# base64url'd so clients treat it as an opaque token and just echo it back.
+
+def encode_cursor(*values) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def decode_time_id_cursor(cursor: str) -> tuple[datetime, int]:
+    created_at, row_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    (row_id,) = decode_cursor(cursor, 1)
+    try:
+        return int(row_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
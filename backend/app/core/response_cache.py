@@ -0,0 +1,241 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+# A backend only has to store bytes with a TTL and keep integer counters.
+# Invalidation is done with generation counters: keys embed the current
+# generation of what they depend on, and bumping a generation makes every
+# older key unreachable (they then age out by TTL or LRU).
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    def counter(self, name: str) -> int: ...
+
+    @abstractmethod
+    def incr(self, name: str) -> int: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU with expiry. Fast, but not shared between workers."""
+
+    def __init__(self, max_entries: int = 10000, clock=time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def counter(self, name):
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def incr(self, name):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+            return self._counters[name]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Cache in a local SQLite file (WAL), shared by every worker on the host.
+
+    Expired rows are skipped on read and purged opportunistically on write.
+    """
+
+    def __init__(self, path: str, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS counters ("
+            " name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?",
+            (key, self._clock()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        now = self._clock()
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO entries (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, value, now + ttl),
+        )
+        self._writes += 1
+        if self._writes % 500 == 0:
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+
+    def counter(self, name):
+        row = self._conn().execute(
+            "SELECT value FROM counters WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def incr(self, name):
+        return self._conn().execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1 RETURNING value",
+            (name,),
+        ).fetchone()[0]
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM counters")
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+class ResponseCache:
+    """
+    JSON payload cache for read endpoints, with hit/miss metrics.
+
+    `cost` passed to `set` is the time it took to build the payload; every
+    later hit adds it to `seconds_saved`.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float = 30.0):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.seconds_saved = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def generation(self, name: str) -> int:
+        return self.backend.counter(f"gen:{name}") if self.enabled else 0
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        raw = self.backend.get(key)
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            entry = json.loads(raw)
+            self.hits += 1
+            self.seconds_saved += entry["cost"]
+        return entry["value"]
+
+    def set(self, key: str, value: Any, cost: float = 0.0, ttl: float = None) -> None:
+        if not self.enabled:
+            return
+        raw = json.dumps({"cost": cost, "value": value}, separators=(",", ":"))
+        self.backend.set(key, raw.encode(), self.ttl if ttl is None else ttl)
+
+    def invalidate(self, *names: str) -> None:
+        """Bump the generation of each name, orphaning keys built from it."""
+        if not self.enabled:
+            return
+        for name in names:
+            self.backend.incr(f"gen:{name}")
+        with self._lock:
+            self.invalidations += len(names)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+            self.seconds_saved = 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__ if self.backend else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "seconds_saved": self.seconds_saved,
+            }
+
+
+def build_backend(name: str) -> Optional[CacheBackend]:
+    name = (name or "none").lower()
+    if name == "memory":
+        return MemoryBackend(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+    if name == "sqlite":
+        return SQLiteBackend(settings.RESPONSE_CACHE_PATH)
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND {name!r}")
+
+
+response_cache = ResponseCache(
+    build_backend(settings.RESPONSE_CACHE_BACKEND),
+    ttl=settings.RESPONSE_CACHE_TTL,
+)
@@ -0,0 +1,61 @@
+import json
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # FAST_RESPONSES then still skips re-validation
+    orjson = None
+
+
+# ---------------------------------------------------------------------------
+# Fast responses (FAST_RESPONSES)
+# ---------------------------------------------------------------------------
+# By default a route's return value is validated against its response_model
+# and then encoded by FastAPI; for sync routes the validation also costs a
+# hop through the threadpool. The hot routes already build their bodies as
+# plain dicts with exactly the model's fields, so with FAST_RESPONSES on
+# they hand them to fast_json, which wraps them in a FastJSONResponse:
+# FastAPI passes Response objects through untouched, and orjson encodes
+# them. The response_model stays on the route, so OpenAPI is unchanged;
+# tests/test_fast_responses.py checks both modes produce the same JSON.
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def json_text(value: Any) -> str:
+    """Compact JSON text for hand-streamed bodies (my-results pages, NDJSON exports)."""
+    if settings.FAST_RESPONSES and orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"))
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json(body: Any, response: Optional[Response] = None, status_code: int = 200) -> Any:
+    """
+    Return `body`, which must already match the route's response_model
+    field for field, from a route.
+
+    With FAST_RESPONSES off this is `body` itself. With it on, `body` is
+    wrapped in a FastJSONResponse carrying the headers set on the route's
+    injected `response` (FastAPI only merges those into responses it
+    builds itself).
+    """
+    if not settings.FAST_RESPONSES:
+        return body
+    fast = FastJSONResponse(body, status_code=status_code)
+    if response is not None:
+        fast.headers.update(response.headers)
+    return fast
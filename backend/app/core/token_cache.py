@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+# ---------------------------------------------------------------------------
+# Verified-token cache
+# ---------------------------------------------------------------------------
+# Firebase ID tokens are re-sent on every request of a browser session, so we
+# remember each verified token (by SHA-256, never the raw token) together with
+# its decoded claims and the resolved user. Entries die at the token's `exp`
+# or after `max_ttl` seconds, whichever comes first, and the oldest entry is
+# evicted once `max_size` is reached.
+
+class TokenCacheEntry:
+    __slots__ = ("claims", "user", "expires_at")
+
+    def __init__(self, claims: dict, user: dict, expires_at: float):
+        self.claims = claims
+        self.user = user
+        self.expires_at = expires_at
+
+
+class TokenCache:
+    def __init__(self, max_size: int = 10000, max_ttl: float = 300.0, clock=time.time):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, TokenCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[TokenCacheEntry]:
+        key = self.key_for(token)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= now:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, claims: dict, user: dict) -> None:
+        if self.max_size <= 0:
+            return
+        now = self._clock()
+        expires_at = now + self.max_ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+
+        key = self.key_for(token)
+        with self._lock:
+            self._entries[key] = TokenCacheEntry(claims, user, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Identity cache
+# ---------------------------------------------------------------------------
+# firebase_uid -> the user row it resolved to, with the profile claims
+# (email, name, picture) that row was last written from. A token the token
+# cache hasn't seen (Firebase rotates ID tokens hourly, and every worker
+# has its own cache) then needs no statement at all unless the profile
+# changed. Users are never deleted, so entries only leave by LRU eviction.
+
+class IdentityCache:
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[tuple, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, uid: str, profile: tuple) -> Optional[dict]:
+        """The cached user for `uid`, if it was written from the same `profile`."""
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is None or entry[0] != profile:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(uid)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, uid: str, profile: tuple, user: dict) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[uid] = (profile, user)
+            self._entries.move_to_end(uid)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -1,14 +1,46 @@
+# imported first so the startup clock covers every import below
+from app.core.startup import timings as startup_timings
+
 from dotenv import load_dotenv
 load_dotenv()
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.database import Base, engine
-from app.routers import quizzes 
+from fastapi.responses import PlainTextResponse
+startup_timings.mark("import:framework")
+
+from app.core import metrics
+from app.core.auth import firebase_configured, token_cache, user_cache
+from app.core.config import settings
+from app.core.database import async_pool_stats, create_schema, dispose_engines, pool_stats
+from app.core.response_cache import response_cache
+startup_timings.mark("import:core")
+
+from app.routers import quizzes, quizzes_async
+from app.services.answer_keys import answer_key_cache
+from app.services.leaderboard import leaderboard_cache
+startup_timings.mark("import:routers")
+
 
-Base.metadata.create_all(bind=engine)
+# Nothing above touches the database or Firebase: the engine is built on
+# the first session and Firebase on the first token to verify. Create the
+# schema with `python -m app.cli init-db` (or SCHEMA_CREATE_ON_STARTUP).
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.SCHEMA_CREATE_ON_STARTUP:
+        with startup_timings.phase("startup:schema"):
+            await run_in_threadpool(create_schema)
+    if not firebase_configured():
+        print("⚠️ No Firebase credentials configured; authenticated requests will be rejected")
+    print("QuickQuiz startup:", startup_timings.summary())
+    yield
+    await dispose_engines()
 
-app = FastAPI(title="QuickQuiz API") 
+
+app = FastAPI(title="QuickQuiz API", lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",  
@@ -24,4 +56,53 @@ app.add_middleware(
 )
 
 
-app.include_router(quizzes.router, prefix="/api/quizzes", tags=["quizzes"])
+if settings.METRICS_ENABLED:
+    metrics.install_engine_hooks()
+    # added last so it wraps CORS and sees the final response headers
+    app.add_middleware(metrics.TimingMiddleware, server_timing=settings.SERVER_TIMING_HEADER)
+
+    # in-process caches and pools, read on each scrape
+    metrics.collector.register(
+        "token_cache", token_cache.stats, "Verified ID token cache", counters=("hits", "misses", "evictions")
+    )
+    metrics.collector.register(
+        "user_cache", user_cache.stats, "firebase_uid -> user cache", counters=("hits", "misses")
+    )
+    for engine_name, stats in (("sync", pool_stats), ("async", async_pool_stats)):
+        metrics.collector.register(
+            "db_pool",
+            stats.snapshot,
+            "Connection pool",
+            counters=("checkouts", "timeouts", "wait_seconds_total"),
+            labels={"engine": engine_name},
+        )
+    metrics.collector.register(
+        "response_cache",
+        response_cache.stats,
+        "Shared response cache",
+        counters=("hits", "misses", "invalidations", "seconds_saved"),
+    )
+    metrics.collector.register(
+        "answer_key_cache",
+        answer_key_cache.stats,
+        "Compiled answer-key cache",
+        counters=("hits", "misses", "evictions", "invalidations"),
+    )
+    metrics.collector.register(
+        "leaderboard_cache",
+        leaderboard_cache.stats,
+        "Leaderboard top-entries cache",
+        counters=("hits", "misses", "invalidations"),
+    )
+
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        return PlainTextResponse(
+            metrics.registry.render() + startup_timings.render() + metrics.collector.render(),
+            media_type="text/plain; version=0.0.4",
+        )
+
+
+quiz_router = quizzes_async.router if settings.ASYNC_DB else quizzes.router
+app.include_router(quiz_router, prefix="/api/quizzes", tags=["quizzes"])
+startup_timings.mark("import:app")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, Boolean, JSON
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, Boolean, JSON, Index, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -25,11 +25,20 @@ class Quiz(Base):
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     is_public = Column(Boolean, default=True)
+    # bumped on every content edit; keys the answer-key cache across workers
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     creator = relationship("User", back_populates="quizzes")
     questions = relationship("Question", cascade="all, delete-orphan", back_populates="quiz")
     attempts = relationship("Attempt", back_populates="quiz")
 
+    __table_args__ = (
+        # keyset pagination for the public listing: (created_at, id) DESC
+        Index("ix_quizzes_public_created_id", is_public, created_at.desc(), id.desc()),
+        # never reuse a deleted quiz's id, so (id, version) stays unique
+        {"sqlite_autoincrement": True},
+    )
+
 
 class Question(Base):
     __tablename__ = "questions"
@@ -39,6 +48,9 @@ class Question(Base):
     order = Column(Integer, nullable=False)
     text = Column(Text, nullable=False)
     correct_answer = Column(Text, nullable=False)
+    # grading strategy, see app.services.matching
+    match_mode = Column(String, nullable=False, default="text", server_default="text")
+    match_options = Column(JSON, nullable=True)
 
     quiz = relationship("Quiz", back_populates="questions")
 
@@ -64,6 +76,66 @@ class Attempt(Base):
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        # "my results": WHERE user_id = ? ORDER BY id DESC, keyset on id
+        Index("ix_attempts_user_id_desc", user_id, id.desc()),
+        # latest attempt per (user, quiz), and the latest_attempts backfill
+        Index("ix_attempts_user_quiz_created", user_id, quiz_id, created_at.desc()),
+        # creator's attempt export: WHERE quiz_id = ? ORDER BY id
+        Index("ix_attempts_quiz_id", quiz_id, id),
+    )
+
+
+class LatestAttempt(Base):
+    """
+    Materialized summary of each user's most recent attempt at each quiz.
+
+    Written by submit_quiz alongside the attempt itself, so the quiz-card
+    lookups are a primary-key read instead of a sort over attempts.
+    """
+    __tablename__ = "latest_attempts"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), primary_key=True)
+    attempt_id = Column(Integer, ForeignKey("attempts.id"), nullable=False)
+    score = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime, nullable=True)
+
+
+# ---------------------------------------------------------------------------
+# Leaderboards (maintained by app.services.leaderboard)
+# ---------------------------------------------------------------------------
+
+class BestAttempt(Base):
+    """
+    Each user's best attempt at each quiz; on equal scores the earlier one
+    stays. Written by submit_quiz, so a leaderboard is a range scan of
+    ix_best_attempts_rank instead of a sort over attempts.
+    """
+    __tablename__ = "best_attempts"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    attempt_id = Column(Integer, ForeignKey("attempts.id"), nullable=False)
+    score = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # leaderboard order: best score first, then whoever got there first
+        Index("ix_best_attempts_rank", quiz_id, score.desc(), created_at, attempt_id),
+    )
+
+
+class LeaderboardScore(Base):
+    """How many users' best attempt at a quiz has each score."""
+    __tablename__ = "leaderboard_scores"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Integer, primary_key=True)
+    users = Column(Integer, nullable=False, default=0)
+
 
 class AttemptAnswer(Base):
     __tablename__ = "attempt_answers"
@@ -73,7 +145,6 @@ class AttemptAnswer(Base):
         Integer,
         ForeignKey("attempts.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     question_id = Column(
         Integer,
@@ -85,3 +156,94 @@ class AttemptAnswer(Base):
 
     attempt = relationship("Attempt", back_populates="answers")
     question = relationship("Question")
+
+    __table_args__ = (
+        # attempt detail / export / regrade: WHERE attempt_id = ?, joined to
+        # questions on question_id (also serves plain attempt_id lookups)
+        Index("ix_attempt_answers_attempt_question", attempt_id, question_id),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Per-quiz statistics (maintained by app.services.stats)
+# ---------------------------------------------------------------------------
+# Running counters updated by submit_quiz in the attempt's transaction, so
+# reading a quiz's stats never touches attempts or attempt_answers.
+
+class QuizStats(Base):
+    __tablename__ = "quiz_stats"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    attempt_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    total_sum = Column(Integer, nullable=False, default=0)
+
+
+class QuizScoreBucket(Base):
+    """Score histogram: bucket b counts attempts scoring [10b%, 10(b+1)%), b=10 is 100%."""
+    __tablename__ = "quiz_score_buckets"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class QuestionStats(Base):
+    __tablename__ = "question_stats"
+
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False, index=True)
+    answered = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+
+
+class RegradeJob(Base):
+    """Checkpoint of the last regrade of a quiz, so an interrupted run resumes."""
+    __tablename__ = "regrade_jobs"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    # Quiz.version whose answer key this job grades against
+    version = Column(Integer, nullable=False)
+    # keyset position: every AttemptAnswer with id <= this has been regraded
+    last_answer_id = Column(Integer, nullable=False, default=0)
+    scanned = Column(Integer, nullable=False, default=0)
+    changed = Column(Integer, nullable=False, default=0)
+    status = Column(String, nullable=False, default="running")  # running | done | superseded
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+# ---------------------------------------------------------------------------
+# Full-text search index (maintained by app.services.search)
+# ---------------------------------------------------------------------------
+# Not a mapped table: SQLite gets an FTS5 virtual table keyed by quiz id
+# (rowid), Postgres a tsvector column with a GIN index. Created and dropped
+# alongside the rest of the schema.
+
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS quiz_search USING fts5("
+        "title, description, questions, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    ).execute_if(dialect="sqlite"),
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS quiz_search ("
+        "quiz_id INTEGER PRIMARY KEY REFERENCES quizzes(id) ON DELETE CASCADE, "
+        "document TSVECTOR NOT NULL)"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_quiz_search_document "
+        "ON quiz_search USING GIN (document)"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(Base.metadata, "before_drop", DDL("DROP TABLE IF EXISTS quiz_search"))
@@ -1,39 +1,148 @@
-import json
-from typing import List
+import time
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.orm import Session
 
 from app.core.auth import get_db, get_current_user, get_optional_user
-from app.models.models import Quiz, Question, Attempt, User, AttemptAnswer
+from app.core.config import settings
+from app.core.metrics import TimedRoute
+from app.core.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.core.pagination import encode_cursor, decode_time_id_cursor
+from app.core.response_cache import response_cache
+from app.core.responses import fast_json
+from app.models.models import Attempt, LatestAttempt, Question, Quiz, User
+from app.services.questions import QuestionInput, clean_quiz_input, insert_questions, sync_questions
+from app.services.answer_keys import answer_key_cache, get_answer_key
+from app.services.attempts import (
+    attempt_detail,
+    latest_attempt_summary,
+    latest_attempts,
+    my_results_query,
+    record_latest_attempt,
+    write_attempt_page,
+)
+from app.services.leaderboard import (
+    leaderboard_cache,
+    record_best_attempt,
+    remove_leaderboard,
+    top_entries,
+    user_rank,
+)
+from app.services.export import EXPORT_BATCH_SIZE, ExportWriter, attempt_export_query
+from app.services import quiz_import
+from app.services.regrade import answer_key_changed, regrade_in_background
+from app.services.scoring import save_attempt, score_answers
+from app.services.search import index_quiz, remove_quiz, search_quizzes
+from app.services.stats import get_quiz_stats, record_attempt_stats, remove_quiz_stats
 from app.schemas.quizzes import (
     QuizCreate,
     QuizSummary,
+    QuizPage,
     QuizDetail,
     SubmitAnswers,
     SubmitResult,
     AttemptDetail,
+    QuizStatsOut,
+    AttemptListPage,
+    ImportReport,
+    Leaderboard,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
-def normalize(s: str) -> str:
-    return (s or "").strip().lower()
+def _clean_quiz_input(quiz_in: QuizCreate) -> tuple[str, str, list[QuestionInput]]:
+    try:
+        return clean_quiz_input(quiz_in)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 # -----------------------------
 # PUBLIC QUIZZES
 # -----------------------------
-@router.get("", response_model=List[QuizSummary])
-def list_public_quizzes(db: Session = Depends(get_db)):
-    quizzes = (
-        db.query(Quiz)
+@router.get("", response_model=QuizPage)
+def list_public_quizzes(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    cache_key = f"list:g{response_cache.generation('catalog')}:{cursor}:{limit}"
+    page = response_cache.get(cache_key)
+    if page is None:
+        start = time.perf_counter()
+        page = _public_quiz_page(db, cursor, limit)
+        response_cache.set(cache_key, page, cost=time.perf_counter() - start)
+
+    headers = cache_headers(page["etag"], shared=True)
+    if etag_matches(request, page["etag"]):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return fast_json(page["body"], response)
+
+
+def _public_quiz_page(db: Session, cursor: Optional[str], limit: int) -> dict:
+    # keyset pagination on (created_at, id) DESC, served by
+    # ix_quizzes_public_created_id; only the QuizSummary columns are loaded
+    query = (
+        db.query(Quiz.id, Quiz.title, Quiz.description, Quiz.created_at, Quiz.version)
         .filter(Quiz.is_public == True)
-        .order_by(Quiz.created_at.desc())
+    )
+    if cursor:
+        created_at, last_id = decode_time_id_cursor(cursor)
+        query = query.filter(
+            or_(
+                Quiz.created_at < created_at,
+                and_(Quiz.created_at == created_at, Quiz.id < last_id),
+            )
+        )
+
+    rows = (
+        query.order_by(Quiz.created_at.desc(), Quiz.id.desc())
+        .limit(limit + 1)
         .all()
     )
-    return quizzes
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return {
+        "etag": make_etag("page", next_cursor, *(f"{r.id}.{r.version}" for r in rows)),
+        "body": {
+            "items": [
+                {"id": r.id, "title": r.title, "description": r.description}
+                for r in rows
+            ],
+            "next_cursor": next_cursor,
+        },
+    }
+
+
+# -----------------------------
+# SEARCH
+# -----------------------------
+@router.get("/search", response_model=QuizPage)
+def search_public_quizzes(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    cache_key = f"search:g{response_cache.generation('catalog')}:{q}:{cursor}:{limit}"
+    page = response_cache.get(cache_key)
+    if page is None:
+        start = time.perf_counter()
+        page = search_quizzes(db, q, cursor, limit)
+        response_cache.set(cache_key, page, cost=time.perf_counter() - start)
+    return fast_json(page)
 
 
 # -----------------------------
@@ -62,41 +171,47 @@ def create_quiz(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    title = (quiz_in.title or "").strip()
-    if not title:
-        raise HTTPException(status_code=400, detail="Title is required")
-    if len(quiz_in.questions) < 1:
-        raise HTTPException(status_code=400, detail="At least one question is required")
+    title, description, questions = _clean_quiz_input(quiz_in)
 
     quiz = Quiz(
         title=title,
-        description=(quiz_in.description or "").strip(),
+        description=description,
         creator_id=current_user.id,
         is_public=True,
     )
     db.add(quiz)
     db.flush()
+    insert_questions(db, quiz.id, questions)
+    index_quiz(db, quiz.id, title, description, (q.text for q in questions))
 
-    for idx, q in enumerate(quiz_in.questions):
-        qt = (q.text or "").strip()
-        ca = (q.correct_answer or "").strip()
-        if not qt or not ca:
-            raise HTTPException(
-                status_code=400,
-                detail="Each question and answer must be non-empty",
-            )
-        db.add(
-            Question(
-                quiz_id=quiz.id,
-                order=idx,
-                text=qt,
-                correct_answer=ca,
-            )
+    summary = {"id": quiz.id, "title": quiz.title, "description": quiz.description}
+    db.commit()
+    response_cache.invalidate("catalog")
+    return summary
+
+
+# -----------------------------
+# BULK IMPORT
+# -----------------------------
+@router.post("/import", response_model=ImportReport)
+async def import_quizzes(
+    request: Request,
+    format: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    fmt = quiz_import.import_format(request.headers.get("content-type"), format)
+    with await quiz_import.spool_upload(request) as upload:
+        return await run_in_threadpool(
+            run_import, db=db, upload=upload, fmt=fmt, current_user=current_user
         )
 
-    db.commit()
-    db.refresh(quiz)
-    return quiz
+
+def run_import(db: Session, upload, fmt: str, current_user: User) -> dict:
+    try:
+        return quiz_import.import_quizzes(db, upload, fmt, current_user.id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 # -----------------------------
@@ -106,6 +221,7 @@ def create_quiz(
 def update_quiz(
     quiz_id: int,
     quiz_in: QuizCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -118,64 +234,91 @@ def update_quiz(
             detail="You are not allowed to edit this quiz.",
         )
 
-    title = (quiz_in.title or "").strip()
-    if not title:
-        raise HTTPException(status_code=400, detail="Title is required")
-    if len(quiz_in.questions) < 1:
-        raise HTTPException(status_code=400, detail="At least one question is required")
+    title, description, questions = _clean_quiz_input(quiz_in)
+
+    regrade = settings.REGRADE_ON_UPDATE and answer_key_changed(
+        get_answer_key(db, quiz.id, quiz.version), questions
+    )
 
+    changed = (quiz.title, quiz.description) != (title, description)
     quiz.title = title
-    quiz.description = (quiz_in.description or "").strip()
-
-    db.query(Question).filter(Question.quiz_id == quiz.id).delete()
-    for idx, q in enumerate(quiz_in.questions):
-        qt = (q.text or "").strip()
-        ca = (q.correct_answer or "").strip()
-        if not qt or not ca:
-            raise HTTPException(
-                status_code=400,
-                detail="Each question and answer must be non-empty",
-            )
-        db.add(
-            Question(
-                quiz_id=quiz.id,
-                order=idx,
-                text=qt,
-                correct_answer=ca,
-            )
-        )
+    quiz.description = description
+    changed = sync_questions(db, quiz.id, questions) or changed
+    if changed:
+        quiz.version = Quiz.version + 1
+        index_quiz(db, quiz.id, title, description, (q.text for q in questions))
 
+    summary = {"id": quiz.id, "title": title, "description": description}
     db.commit()
-    db.refresh(quiz)
-    return quiz
+    if changed:
+        answer_key_cache.invalidate(quiz_id)
+        response_cache.invalidate("catalog", f"quiz:{quiz_id}")
+    if regrade:
+        background_tasks.add_task(regrade_in_background, quiz_id)
+    return summary
 
 
 # -----------------------------
 # MY RESULTS (list)
 # -----------------------------
-@router.get("/my-results")
+@router.get("/my-results", response_model=AttemptListPage)
 def get_my_results(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    attempts = (
-        db.query(Attempt)
-        .join(Quiz, Quiz.id == Attempt.quiz_id)
-        .filter(Attempt.user_id == current_user.id)
-        .order_by(Attempt.id.desc())
-        .all()
+    cache_key = my_results_cache_key(current_user.id, cursor, limit)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    start = time.perf_counter()
+    body = write_attempt_page(db.execute(my_results_query(current_user.id, cursor, limit)), limit)
+    response_cache.set(cache_key, body, cost=time.perf_counter() - start)
+    return Response(content=body, media_type="application/json")
+
+
+def my_results_cache_key(user_id: int, cursor: Optional[str], limit: int) -> str:
+    # private to the user; titles come from quizzes, so edits elsewhere
+    # (the catalog generation) invalidate it too
+    return (
+        f"my-results:{user_id}"
+        f":g{response_cache.generation(f'user:{user_id}')}"
+        f":c{response_cache.generation('catalog')}"
+        f":{cursor}:{limit}"
     )
-    return [
-        {
-            "id": a.id,
-            "quiz_id": a.quiz_id,
-            "quiz_title": a.quiz.title if a.quiz else "",
-            "score": a.score,
-            "total": a.total,
-            "created_at": a.created_at.isoformat() if a.created_at else None,
-        }
-        for a in attempts
-    ]
+
+
+# -----------------------------
+# LAST ATTEMPTS (batch, for the quiz card grid)
+# -----------------------------
+MAX_LATEST_ATTEMPT_IDS = 100
+
+
+@router.get("/my-latest-attempts")
+def get_my_latest_attempts(
+    ids: str = Query(..., description="Comma-separated quiz ids"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    quiz_ids = _parse_quiz_ids(ids)
+    summaries = latest_attempts(db, current_user.id, quiz_ids)
+    return fast_json({str(quiz_id): summary for quiz_id, summary in summaries.items()})
+
+
+def _parse_quiz_ids(ids: str) -> list[int]:
+    try:
+        quiz_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+
+    if len(quiz_ids) > MAX_LATEST_ATTEMPT_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_LATEST_ATTEMPT_IDS} quiz ids per request",
+        )
+    return quiz_ids
 
 
 # -----------------------------
@@ -184,35 +327,104 @@ def get_my_results(
 @router.get("/{quiz_id}", response_model=QuizDetail)
 def get_quiz(
     quiz_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_optional_user),
 ):
-    quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
+    # Cache keys carry the viewer's visibility: the public view is shared by
+    # everyone but the creator, the creator's view (with answers) is keyed
+    # by their user id.
+    generation = response_cache.generation(f"quiz:{quiz_id}")
+    public_key = f"quiz:{quiz_id}:g{generation}:public"
+    owner_key = f"quiz:{quiz_id}:g{generation}:owner:{current_user.id}" if current_user else None
+
+    view = response_cache.get(owner_key) if owner_key else None
+    if view is None:
+        view = response_cache.get(public_key)
+        if view is not None and current_user and view["creator_id"] == current_user.id:
+            view = None
+
+    if view is None:
+        start = time.perf_counter()
+        view = _quiz_view(db, quiz_id, current_user, request)
+        if view["body"] is not None:
+            response_cache.set(
+                owner_key if view["owner"] else public_key,
+                view,
+                cost=time.perf_counter() - start,
+            )
+
+    headers = cache_headers(view["etag"], shared=view["shared"])
+    if view["body"] is None or etag_matches(request, view["etag"]):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return fast_json(view["body"], response)
+
+
+def _quiz_view(db: Session, quiz_id: int, current_user, request: Request) -> dict:
+    """
+    Build the quiz detail as seen by `current_user`.
+
+    `body` is None when the request's If-None-Match already matches, in
+    which case the questions are never loaded.
+    """
+    quiz = db.execute(
+        select(
+            Quiz.id,
+            Quiz.title,
+            Quiz.description,
+            Quiz.is_public,
+            Quiz.creator_id,
+            Quiz.version,
+        ).where(Quiz.id == quiz_id)
+    ).first()
     if not quiz or (not quiz.is_public and (not current_user or quiz.creator_id != current_user.id)):
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    questions = (
-        db.query(Question)
-        .filter(Question.quiz_id == quiz_id)
-        .order_by(Question.order.asc())
-        .all()
-    )
-    include_answers = current_user and quiz.creator_id == current_user.id
-    questions_payload = [
-        {
-            "id": q.id,
-            "order": q.order,
-            "text": q.text,
-            "correct_answer": q.correct_answer if include_answers else None,
-        }
-        for q in questions
-    ]
+    # creators see answers, so their view gets its own ETag and is never
+    # stored in a shared cache; the same goes for private quizzes
+    include_answers = bool(current_user and quiz.creator_id == current_user.id)
+    view = {
+        "etag": make_etag("quiz", quiz.id, quiz.version, "creator" if include_answers else "public"),
+        "shared": bool(quiz.is_public and not include_answers),
+        "owner": include_answers,
+        "creator_id": quiz.creator_id,
+        "body": None,
+    }
+    if etag_matches(request, view["etag"]):
+        return view
 
-    return {
+    key = get_answer_key(db, quiz.id, quiz.version)
+    view["body"] = {
         "id": quiz.id,
         "title": quiz.title,
         "description": quiz.description,
-        "questions": questions_payload,
+        "questions": [
+            {
+                "id": q.question_id,
+                "order": q.order,
+                "text": q.text,
+                "correct_answer": q.correct_answer if include_answers else None,
+                "match_mode": q.match_mode,
+                # alternatives would give the answer away
+                "match_options": _match_options_out(q.match_options) if include_answers else None,
+            }
+            for q in key.entries
+        ],
+    }
+    return view
+
+
+def _match_options_out(options: Optional[dict]) -> Optional[dict]:
+    # stored without the unset keys; MatchOptions always has all three
+    if not options:
+        return None
+    tolerance = options.get("tolerance")
+    return {
+        "tolerance": float(tolerance) if tolerance is not None else None,
+        "alternatives": options.get("alternatives"),
+        "max_distance": options.get("max_distance"),
     }
 
 
@@ -235,8 +447,19 @@ def delete_quiz(
             detail="You are not allowed to delete this quiz.",
         )
 
-    db.delete(quiz)
+    db.execute(delete(LatestAttempt).where(LatestAttempt.quiz_id == quiz_id))
+    remove_quiz(db, quiz_id)
+    remove_quiz_stats(db, quiz_id)
+    remove_leaderboard(db, quiz_id)
+    # Set-based rather than the ORM cascade, which loads every attempt of the
+    # quiz just to null its quiz_id. Attempts are kept, as before.
+    db.execute(update(Attempt).where(Attempt.quiz_id == quiz_id).values(quiz_id=None))
+    db.execute(delete(Question).where(Question.quiz_id == quiz_id))
+    db.execute(delete(Quiz).where(Quiz.id == quiz_id))
     db.commit()
+    answer_key_cache.invalidate(quiz_id)
+    leaderboard_cache.invalidate(quiz_id)
+    response_cache.invalidate("catalog", f"quiz:{quiz_id}")
     return None
 
 
@@ -250,74 +473,147 @@ def submit_quiz(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
+    quiz = db.execute(
+        select(Quiz.id, Quiz.version).where(Quiz.id == quiz_id)
+    ).first()
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    questions = (
-        db.query(Question)
-        .filter(Question.quiz_id == quiz.id)
-        .order_by(Question.order.asc())
-        .all()
+    key = get_answer_key(db, quiz.id, quiz.version)
+
+    answers = {a.question_id: a.answer for a in submission.answers}
+    score, results = score_answers(key, answers)
+
+    attempt = save_attempt(
+        db,
+        current_user.id,
+        key,
+        score,
+        results,
+        store_details=settings.STORE_ATTEMPT_DETAILS,
     )
+    record_latest_attempt(db, current_user.id, key.quiz_id, attempt, score, key.total)
+    record_attempt_stats(db, key.quiz_id, score, key.total, results)
+    new_best = record_best_attempt(db, current_user.id, key.quiz_id, attempt, score, key.total)
+    db.commit()
+    response_cache.invalidate(f"user:{current_user.id}")
+    if new_best:
+        leaderboard_cache.offer(key.quiz_id, current_user.id, score)
 
-    answer_lookup = {
-        a.question_id: (a.answer or "").strip()
-        for a in submission.answers
-    }
+    return fast_json(
+        {
+            "attempt_id": attempt.id,
+            "quiz_id": key.quiz_id,
+            "quiz_title": key.quiz_title,
+            "score": score,
+            "total": key.total,
+            "results": [
+                {
+                    "question": r["question"],
+                    "user_answer": r["user_answer"],
+                    "correct_answer": r["correct_answer"],
+                    "is_correct": r["is_correct"],
+                }
+                for r in results
+            ],
+        }
+    )
 
-    results: list[dict] = []
-    score = 0
 
-    for q in questions:
-        user_answer = answer_lookup.get(q.id, "")
-        is_correct = normalize(user_answer) == normalize(q.correct_answer)
-        if is_correct:
-            score += 1
-        results.append(
-            {
-                "question_id": q.id,
-                "question": q.text,
-                "user_answer": user_answer,
-                "correct_answer": q.correct_answer,
-                "is_correct": is_correct,
-            }
-        )
+# -----------------------------
+# QUIZ STATS (creator only)
+# -----------------------------
+@router.get("/{quiz_id}/stats", response_model=QuizStatsOut)
+def get_stats(
+    quiz_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    _require_creator(db, quiz_id, current_user, "Only the quiz creator can view its stats.")
+    return get_quiz_stats(db, quiz_id)
+
+
+# -----------------------------
+# LEADERBOARD
+# -----------------------------
+@router.get("/{quiz_id}/leaderboard", response_model=Leaderboard)
+def get_leaderboard(
+    quiz_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_optional_user),
+):
+    quiz = db.execute(select(Quiz.is_public, Quiz.creator_id).where(Quiz.id == quiz_id)).first()
+    if not quiz or (not quiz.is_public and (not current_user or quiz.creator_id != current_user.id)):
+        raise HTTPException(status_code=404, detail="Quiz not found")
 
-    # save attempt
-    attempt = Attempt(
-        user_id=current_user.id,
-        quiz_id=quiz.id,
-        score=score,
-        total=len(questions),
-        details=results,  # backup JSON payload
+    board = top_entries(db, quiz_id)
+    return fast_json(
+        {
+            "quiz_id": quiz_id,
+            "participants": board["participants"],
+            "entries": [
+                {
+                    "rank": e["rank"],
+                    "display_name": e["display_name"],
+                    "score": e["score"],
+                    "total": e["total"],
+                    "completed_at": e["completed_at"],
+                }
+                for e in board["entries"][:limit]
+            ],
+            "me": user_rank(db, quiz_id, current_user.id) if current_user else None,
+        }
     )
-    db.add(attempt)
-    db.flush()
 
-    # save per-question answers
-    for res in results:
-        db.add(
-            AttemptAnswer(
-                attempt_id=attempt.id,
-                question_id=res["question_id"],
-                user_answer=res["user_answer"],
-                is_correct=res["is_correct"],
-            )
-        )
 
-    db.commit()
-    db.refresh(attempt)
+def _require_creator(db: Session, quiz_id: int, current_user: User, detail: str) -> None:
+    creator_id = db.execute(select(Quiz.creator_id).where(Quiz.id == quiz_id)).scalar()
+    if creator_id is None:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    if creator_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
 
-    return {
-        "attempt_id": attempt.id,
-        "quiz_id": attempt.quiz_id,
-        "quiz_title": attempt.quiz.title,
-        "score": score,
-        "total": len(questions),
-        "results": results,
-        "created_at": attempt.created_at.isoformat() if attempt.created_at else None,
-    }
+
+# -----------------------------
+# ATTEMPT EXPORT (creator only, streamed)
+# -----------------------------
+@router.get("/{quiz_id}/attempts/export")
+def export_attempts(
+    quiz_id: int,
+    format: str = Query("csv"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    writer = _export_writer(db, quiz_id, format, current_user)
+    stmt = attempt_export_query(quiz_id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    def stream():
+        yield writer.header()
+        for rows in db.execute(stmt).partitions():
+            yield writer.rows(rows)
+
+    return _export_response(stream(), writer, quiz_id)
+
+
+def _export_writer(db: Session, quiz_id: int, format: str, current_user: User) -> ExportWriter:
+    try:
+        writer = ExportWriter(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _require_creator(db, quiz_id, current_user, "Only the quiz creator can export its attempts.")
+    return writer
+
+
+def _export_response(body, writer: ExportWriter, quiz_id: int) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=writer.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{writer.filename(quiz_id)}"',
+            "Cache-Control": "no-store",
+        },
+    )
 
 
 # -----------------------------
@@ -329,91 +625,22 @@ def get_attempt(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    attempt = (
-        db.query(Attempt)
-        .filter(Attempt.id == attempt_id)
-        .options(
-            joinedload(Attempt.quiz),
-            joinedload(Attempt.answers).joinedload(AttemptAnswer.question),
-        )
-        .first()
-    )
+    detail = attempt_detail(db, attempt_id)
 
-    if not attempt:
+    if detail is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Attempt not found",
         )
 
-    if attempt.user_id != current_user.id:
+    if detail.pop("user_id") != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to view this attempt",
         )
 
-    results: list[dict] = []
+    return fast_json(detail)
 
-    # 1️⃣ Prefer AttemptAnswer rows
-    if attempt.answers:
-        for aa in attempt.answers:
-            q = aa.question
-            results.append(
-                {
-                    "question_id": aa.question_id,
-                    "question": q.text if q else "",
-                    "user_answer": aa.user_answer,
-                    "correct_answer": q.correct_answer if q else "",
-                    "is_correct": aa.is_correct,
-                }
-            )
-
-    # 2️⃣ Fallback to `details` JSON (for old attempts)
-    elif attempt.details:
-        details = attempt.details
-        if isinstance(details, str):
-            try:
-                details = json.loads(details)
-            except Exception:
-                details = []
-        for r in details or []:
-            results.append(
-                {
-                    "question_id": r.get("question_id"),
-                    "question": r.get("question", ""),
-                    "user_answer": r.get("user_answer", ""),
-                    "correct_answer": r.get("correct_answer", ""),
-                    "is_correct": r.get("is_correct", False),
-                }
-            )
-
-    # 3️⃣ Final fallback: at least return the questions
-    if not results:
-        questions = (
-            db.query(Question)
-            .filter(Question.quiz_id == attempt.quiz_id)
-            .order_by(Question.order.asc())
-            .all()
-        )
-        for q in questions:
-            results.append(
-                {
-                    "question_id": q.id,
-                    "question": q.text,
-                    "user_answer": "",
-                    "correct_answer": q.correct_answer,
-                    "is_correct": False,
-                }
-            )
-
-    return {
-        "attempt_id": attempt.id,
-        "quiz_id": attempt.quiz_id,
-        "quiz_title": attempt.quiz.title if attempt.quiz else "",
-        "score": attempt.score,
-        "total": attempt.total,
-        "results": results,
-        "created_at": attempt.created_at.isoformat() if attempt.created_at else None,
-    }
 
 # -----------------------------
 # LAST ATTEMPT
@@ -424,20 +651,5 @@ def get_my_latest_attempt(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    attempt = (
-        db.query(Attempt)
-        .filter(Attempt.quiz_id == quiz_id, Attempt.user_id == current_user.id)
-        .order_by(Attempt.created_at.desc())
-        .first()
-    )
-
-    if not attempt:
-        return {"attempted": False}
-
-    return {
-        "attempted": True,
-        "attempt_id": attempt.id,
-        "score": attempt.score,
-        "total": attempt.total,
-        "completed_at": attempt.created_at.isoformat() if attempt.created_at else None,
-    }
+    latest = db.get(LatestAttempt, (current_user.id, quiz_id))
+    return fast_json(latest_attempt_summary(latest))
@@ -0,0 +1,309 @@
+# ---------------------------------------------------------------------------
+# Async twin of app.routers.quizzes, mounted instead of it when ASYNC_DB is on.
+#
+# Every route awaits the matching sync handler through AsyncSession.run_sync,
+# so query and business logic live in one place while database I/O goes
+# through the asyncio driver and never ties up a threadpool thread. Work
+# that needs no database (parsing an import upload) goes to the threadpool
+# instead, so run_sync never blocks the event loop on it.
+# ---------------------------------------------------------------------------
+import time
+from typing import List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import get_async_db, get_current_user_async, get_optional_user_async
+from app.core.metrics import TimedRoute
+from app.core.response_cache import response_cache
+from app.models.models import User
+from app.routers import quizzes
+from app.services.attempts import my_results_query, write_attempt_page
+from app.services.export import EXPORT_BATCH_SIZE, attempt_export_query
+from app.services import quiz_import
+from app.schemas.quizzes import (
+    QuizCreate,
+    QuizSummary,
+    QuizPage,
+    QuizDetail,
+    SubmitAnswers,
+    SubmitResult,
+    AttemptDetail,
+    QuizStatsOut,
+    AttemptListPage,
+    ImportReport,
+    Leaderboard,
+)
+
+router = APIRouter(route_class=TimedRoute)
+
+
+async def _run(db: AsyncSession, handler, **kwargs):
+    return await db.run_sync(lambda session: handler(db=session, **kwargs))
+
+
+# -----------------------------
+# PUBLIC QUIZZES
+# -----------------------------
+@router.get("", response_model=QuizPage)
+async def list_public_quizzes(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _run(
+        db,
+        quizzes.list_public_quizzes,
+        request=request,
+        response=response,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+# -----------------------------
+# SEARCH
+# -----------------------------
+@router.get("/search", response_model=QuizPage)
+async def search_public_quizzes(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _run(db, quizzes.search_public_quizzes, q=q, cursor=cursor, limit=limit)
+
+
+# -----------------------------
+# USER'S QUIZZES
+# -----------------------------
+@router.get("/my", response_model=List[QuizSummary])
+async def list_my_quizzes(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _run(db, quizzes.list_my_quizzes, current_user=current_user)
+
+
+# -----------------------------
+# CREATE QUIZ
+# -----------------------------
+@router.post("", response_model=QuizSummary, status_code=status.HTTP_201_CREATED)
+async def create_quiz(
+    quiz_in: QuizCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _run(db, quizzes.create_quiz, quiz_in=quiz_in, current_user=current_user)
+
+
+# -----------------------------
+# BULK IMPORT
+# -----------------------------
+@router.post("/import", response_model=ImportReport)
+async def import_quizzes(
+    request: Request,
+    format: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    fmt = quiz_import.import_format(request.headers.get("content-type"), format)
+    report = quiz_import.new_report()
+    with await quiz_import.spool_upload(request) as upload:
+        # parse + validate in the threadpool, hand only the inserts to the session
+        batches = quiz_import.read_batches(upload, fmt, report)
+        try:
+            while True:
+                try:
+                    batch = await run_in_threadpool(next, batches, None)
+                except ValueError as exc:
+                    raise HTTPException(status_code=400, detail=str(exc))
+                if batch is None:
+                    break
+                await db.run_sync(quiz_import.write_batch, current_user.id, batch)
+                report["imported"] += len(batch)
+        finally:
+            batches.close()
+    return report
+
+
+# -----------------------------
+# UPDATE QUIZ
+# -----------------------------
+@router.put("/{quiz_id}", response_model=QuizSummary)
+async def update_quiz(
+    quiz_id: int,
+    quiz_in: QuizCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _run(
+        db,
+        quizzes.update_quiz,
+        quiz_id=quiz_id,
+        quiz_in=quiz_in,
+        background_tasks=background_tasks,
+        current_user=current_user,
+    )
+
+
+# -----------------------------
+# MY RESULTS (list)
+# -----------------------------
+@router.get("/my-results", response_model=AttemptListPage)
+async def get_my_results(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    cache_key = quizzes.my_results_cache_key(current_user.id, cursor, limit)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    start = time.perf_counter()
+    result = await db.execute(my_results_query(current_user.id, cursor, limit))
+    body = write_attempt_page(result, limit)
+    response_cache.set(cache_key, body, cost=time.perf_counter() - start)
+    return Response(content=body, media_type="application/json")
+
+
+# -----------------------------
+# LAST ATTEMPTS (batch, for the quiz card grid)
+# -----------------------------
+@router.get("/my-latest-attempts")
+async def get_my_latest_attempts(
+    ids: str = Query(..., description="Comma-separated quiz ids"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _run(db, quizzes.get_my_latest_attempts, ids=ids, current_user=current_user)
+
+
+# -----------------------------
+# QUIZ DETAIL
+# -----------------------------
+@router.get("/{quiz_id}", response_model=QuizDetail)
+async def get_quiz(
+    quiz_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User | None = Depends(get_optional_user_async),
+):
+    return await _run(
+        db,
+        quizzes.get_quiz,
+        quiz_id=quiz_id,
+        request=request,
+        response=response,
+        current_user=current_user,
+    )
+
+
+# -----------------------------
+# DELETE QUIZ
+# -----------------------------
+@router.delete("/{quiz_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_quiz(
+    quiz_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _run(db, quizzes.delete_quiz, quiz_id=quiz_id, current_user=current_user)
+
+
+# -----------------------------
+# SUBMIT QUIZ ANSWERS
+# -----------------------------
+@router.post("/{quiz_id}/submit", response_model=SubmitResult)
+async def submit_quiz(
+    quiz_id: int,
+    submission: SubmitAnswers,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _run(
+        db, quizzes.submit_quiz, quiz_id=quiz_id, submission=submission, current_user=current_user
+    )
+
+
+# -----------------------------
+# QUIZ STATS (creator only)
+# -----------------------------
+@router.get("/{quiz_id}/stats", response_model=QuizStatsOut)
+async def get_stats(
+    quiz_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _run(db, quizzes.get_stats, quiz_id=quiz_id, current_user=current_user)
+
+
+# -----------------------------
+# LEADERBOARD
+# -----------------------------
+@router.get("/{quiz_id}/leaderboard", response_model=Leaderboard)
+async def get_leaderboard(
+    quiz_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User | None = Depends(get_optional_user_async),
+):
+    return await _run(db, quizzes.get_leaderboard, quiz_id=quiz_id, limit=limit, current_user=current_user)
+
+
+# -----------------------------
+# ATTEMPT EXPORT (creator only, streamed)
+# -----------------------------
+@router.get("/{quiz_id}/attempts/export")
+async def export_attempts(
+    quiz_id: int,
+    format: str = Query("csv"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    writer = await _run(
+        db, quizzes._export_writer, quiz_id=quiz_id, format=format, current_user=current_user
+    )
+    stmt = attempt_export_query(quiz_id)
+
+    async def stream():
+        yield writer.header()
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield writer.rows(rows)
+        await result.close()
+
+    return quizzes._export_response(stream(), writer, quiz_id)
+
+
+# -----------------------------
+# ATTEMPT DETAIL (for viewing past results)
+# -----------------------------
+@router.get("/attempts/{attempt_id}", response_model=AttemptDetail)
+async def get_attempt(
+    attempt_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _run(db, quizzes.get_attempt, attempt_id=attempt_id, current_user=current_user)
+
+
+# -----------------------------
+# LAST ATTEMPT
+# -----------------------------
+@router.get("/{quiz_id}/my-latest-attempt")
+async def get_my_latest_attempt(
+    quiz_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    return await _run(
+        db, quizzes.get_my_latest_attempt, quiz_id=quiz_id, current_user=current_user
+    )
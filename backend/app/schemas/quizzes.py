@@ -6,9 +6,17 @@ class SubmittedAnswer(BaseModel):
     question_id: int
     answer: str = ""
 
+class MatchOptions(BaseModel):
+    tolerance: Optional[float] = None          # numeric
+    alternatives: Optional[List[str]] = None   # any_of
+    max_distance: Optional[int] = None         # fuzzy
+
 class QuestionCreate(BaseModel):
     text: str
     correct_answer: str
+    # text | exact | folded | numeric | any_of | fuzzy (see app.services.matching)
+    match_mode: str = "text"
+    match_options: Optional[MatchOptions] = None
 
 class QuizCreate(BaseModel):
     title: str
@@ -23,11 +31,17 @@ class QuizSummary(BaseModel):
     class Config:
         from_attributes = True
 
+class QuizPage(BaseModel):
+    items: List[QuizSummary]
+    next_cursor: Optional[str] = None
+
 class QuestionOut(BaseModel):
     id: int
     order: int
     text: str
     correct_answer: Optional[str] = None
+    match_mode: str = "text"
+    match_options: Optional[MatchOptions] = None
 
     class Config:
         from_attributes = True
@@ -67,6 +81,10 @@ class AttemptListItem(BaseModel):
     total: int
     created_at: Optional[str] = None
 
+class AttemptListPage(BaseModel):
+    items: List[AttemptListItem]
+    next_cursor: Optional[str] = None
+
 class AttemptAnswerOut(BaseModel):
     question_id: int
     question: str
@@ -82,3 +100,57 @@ class AttemptDetail(BaseModel):
     total: int
     created_at: Optional[str] = None
     results: List[AttemptAnswerOut]
+
+class ScoreBucketOut(BaseModel):
+    from_percent: int
+    to_percent: int
+    count: int
+
+class QuestionStatsOut(BaseModel):
+    question_id: int
+    order: int
+    text: str
+    answered: int
+    correct: int
+    correct_rate: Optional[float] = None
+
+class QuizStatsOut(BaseModel):
+    quiz_id: int
+    attempt_count: int
+    mean_score: Optional[float] = None
+    mean_percent: Optional[float] = None
+    median_percent: Optional[int] = None
+    histogram: List[ScoreBucketOut]
+    questions: List[QuestionStatsOut]
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    display_name: Optional[str] = None
+    score: int
+    total: int
+    completed_at: Optional[str] = None
+
+class LeaderboardRank(BaseModel):
+    rank: int
+    score: int
+    total: int
+    completed_at: Optional[str] = None
+
+class Leaderboard(BaseModel):
+    quiz_id: int
+    participants: int
+    entries: List[LeaderboardEntry]
+    me: Optional[LeaderboardRank] = None
+
+
+class ImportErrorOut(BaseModel):
+    line: int
+    title: Optional[str] = None
+    error: str
+
+class ImportReport(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ImportErrorOut]
+    errors_truncated: bool = False
@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Question, Quiz
+from app.services.scoring import AnswerKey, compile_answer_key
+
+
+# ---------------------------------------------------------------------------
+# Compiled answer-key cache
+# ---------------------------------------------------------------------------
+# One compiled AnswerKey per quiz, tagged with the Quiz.version it was built
+# from. Callers always read the current version from the database first and
+# only accept a cached key with that exact version, so a key cached by this
+# worker can never grade a submission after another worker edited the quiz.
+
+class AnswerKeyCache:
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, AnswerKey]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, quiz_id: int, version: int) -> Optional[AnswerKey]:
+        with self._lock:
+            key = self._entries.get(quiz_id)
+            if key is None or key.version != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(quiz_id)
+            self.hits += 1
+            return key
+
+    def put(self, key: AnswerKey) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            current = self._entries.get(key.quiz_id)
+            if current is not None and current.version > key.version:
+                return
+            self._entries[key.quiz_id] = key
+            self._entries.move_to_end(key.quiz_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, quiz_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(quiz_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+answer_key_cache = AnswerKeyCache(max_size=settings.ANSWER_KEY_CACHE_SIZE)
+
+
+def load_answer_key(db: Session, quiz_id: int) -> AnswerKey:
+    """Compile a quiz's answer key from one consistent read of quiz + questions."""
+    rows = db.execute(
+        select(
+            Quiz.title,
+            Quiz.version,
+            Question.id,
+            Question.order,
+            Question.text,
+            Question.correct_answer,
+            Question.match_mode,
+            Question.match_options,
+        )
+        .join(Question, Question.quiz_id == Quiz.id)
+        .where(Quiz.id == quiz_id)
+        .order_by(Question.order.asc())
+    ).all()
+    if not rows:
+        return compile_answer_key(quiz_id, "", [], version=0)
+    return compile_answer_key(quiz_id, rows[0].title, rows, version=rows[0].version)
+
+
+def get_answer_key(db: Session, quiz_id: int, version: int) -> AnswerKey:
+    """
+    Return the answer key for `quiz_id` at `version`, compiling it on a miss.
+
+    `version` must come from the caller's own read of Quiz.version.
+    """
+    key = answer_key_cache.get(quiz_id, version)
+    if key is not None:
+        return key
+
+    key = load_answer_key(db, quiz_id)
+    if key.version == version:
+        answer_key_cache.put(key)
+    return key
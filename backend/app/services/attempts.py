@@ -0,0 +1,305 @@
+import json
+from typing import Optional
+
+from sqlalchemy import Select, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.database import dialect_insert
+from app.core.pagination import decode_id_cursor, encode_cursor
+from app.core.responses import json_text
+from app.models.models import Attempt, AttemptAnswer, LatestAttempt, Question, Quiz
+
+
+# ---------------------------------------------------------------------------
+# "My results" listing
+# ---------------------------------------------------------------------------
+
+def my_results_query(user_id: int, cursor: Optional[str], limit: int) -> Select:
+    """
+    One projected join over attempts + quiz title, newest first.
+
+    Keyset-paginated on Attempt.id (served by ix_attempts_user_id_desc);
+    fetches one extra row to know whether there is a next page.
+    """
+    stmt = (
+        select(
+            Attempt.id,
+            Attempt.quiz_id,
+            Quiz.title.label("quiz_title"),
+            Attempt.score,
+            Attempt.total,
+            Attempt.created_at,
+        )
+        .join(Quiz, Quiz.id == Attempt.quiz_id)
+        .where(Attempt.user_id == user_id)
+    )
+    if cursor:
+        stmt = stmt.where(Attempt.id < decode_id_cursor(cursor))
+    return stmt.order_by(Attempt.id.desc()).limit(limit + 1)
+
+
+class AttemptPageWriter:
+    """
+    Serializes a my_results_query page to JSON one row at a time, so a page
+    is never materialized as a list of dicts.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.count = 0
+        self.last_id = None
+        self.next_cursor = None
+        self.chunks: list[str] = ['{"items":[']
+
+    def row(self, row) -> bool:
+        """Encode one row; returns False once the page is full."""
+        if self.count == self.limit:
+            self.next_cursor = encode_cursor(self.last_id)
+            return False
+        item = json_text(
+            {
+                "id": row.id,
+                "quiz_id": row.quiz_id,
+                "quiz_title": row.quiz_title or "",
+                "score": row.score,
+                "total": row.total,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+            }
+        )
+        self.chunks.append(("," if self.count else "") + item)
+        self.count += 1
+        self.last_id = row.id
+        return True
+
+    def body(self) -> str:
+        return "".join(self.chunks) + '],"next_cursor":' + json.dumps(self.next_cursor) + "}"
+
+
+def write_attempt_page(rows, limit: int) -> str:
+    """The JSON body of a my_results_query page, from its (up to limit + 1) rows."""
+    writer = AttemptPageWriter(limit)
+    for row in rows:
+        if not writer.row(row):
+            break
+    return writer.body()
+
+
+# ---------------------------------------------------------------------------
+# Attempt detail
+# ---------------------------------------------------------------------------
+
+def attempt_detail(db: Session, attempt_id: int) -> Optional[dict]:
+    """
+    An attempt with its answers in question order, or None if it does not
+    exist. One round trip: the attempt columns repeat on each answer row,
+    and an attempt without answer rows comes back as a single row with
+    NULL answer columns.
+    """
+    rows = db.execute(
+        select(
+            Attempt.id,
+            Attempt.user_id,
+            Attempt.quiz_id,
+            Quiz.title.label("quiz_title"),
+            Attempt.score,
+            Attempt.total,
+            Attempt.created_at,
+            AttemptAnswer.id.label("answer_id"),
+            AttemptAnswer.question_id,
+            AttemptAnswer.user_answer,
+            AttemptAnswer.is_correct,
+            Question.text.label("question"),
+            Question.correct_answer,
+        )
+        .outerjoin(Quiz, Quiz.id == Attempt.quiz_id)
+        .outerjoin(AttemptAnswer, AttemptAnswer.attempt_id == Attempt.id)
+        .outerjoin(Question, Question.id == AttemptAnswer.question_id)
+        .where(Attempt.id == attempt_id)
+        .order_by(Question.order.asc().nulls_last(), AttemptAnswer.id)
+    ).all()
+    if not rows:
+        return None
+
+    first = rows[0]
+    return {
+        "attempt_id": first.id,
+        "user_id": first.user_id,
+        "quiz_id": first.quiz_id,
+        "quiz_title": first.quiz_title or "",
+        "score": first.score,
+        "total": first.total,
+        "created_at": first.created_at.isoformat() if first.created_at else None,
+        "results": [
+            {
+                "question_id": row.question_id,
+                "question": row.question or "",
+                "user_answer": row.user_answer,
+                "correct_answer": row.correct_answer or "",
+                "is_correct": bool(row.is_correct),
+            }
+            for row in rows
+            if row.answer_id is not None
+        ],
+    }
+
+
+def _legacy_answer_rows(attempt_id: int, details) -> list[dict]:
+    if isinstance(details, str):
+        try:
+            details = json.loads(details)
+        except ValueError:
+            return []
+    if not isinstance(details, list):
+        return []
+    return [
+        {
+            "attempt_id": attempt_id,
+            "question_id": r["question_id"],
+            "user_answer": r.get("user_answer") or "",
+            "is_correct": bool(r.get("is_correct")),
+        }
+        for r in details
+        if isinstance(r, dict) and isinstance(r.get("question_id"), int)
+    ]
+
+
+def backfill_attempt_answers(db: Session, batch_size: int = 1000, write: bool = True) -> dict:
+    """
+    Create AttemptAnswer rows from the legacy Attempt.details JSON for
+    attempts that have none. Walks attempts in id order, committing every
+    `batch_size` attempts, so it can be interrupted and re-run. Answers to
+    questions that no longer exist are skipped (they stay in `details`).
+    With `write=False` only counts what it would create.
+    """
+    has_answers = select(AttemptAnswer.id).where(AttemptAnswer.attempt_id == Attempt.id).exists()
+    last_id = 0
+    report = {"attempts": 0, "answers": 0, "skipped": 0}
+    while True:
+        batch = db.execute(
+            select(Attempt.id, Attempt.details)
+            .where(Attempt.id > last_id, Attempt.details.is_not(None), ~has_answers)
+            .order_by(Attempt.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            return report
+        last_id = batch[-1].id
+
+        rows = [row for attempt in batch for row in _legacy_answer_rows(attempt.id, attempt.details)]
+        wanted = {row["question_id"] for row in rows}
+        existing = set()
+        if wanted:
+            existing = set(db.execute(select(Question.id).where(Question.id.in_(wanted))).scalars())
+        kept = [row for row in rows if row["question_id"] in existing]
+        if kept and write:
+            db.execute(insert(AttemptAnswer), kept)
+            db.commit()
+
+        report["attempts"] += len({row["attempt_id"] for row in kept})
+        report["answers"] += len(kept)
+        report["skipped"] += len(rows) - len(kept)
+
+
+# ---------------------------------------------------------------------------
+# Latest attempt per (user, quiz)
+# ---------------------------------------------------------------------------
+
+def record_latest_attempt(db: Session, user_id: int, quiz_id: int, attempt, score: int, total: int) -> None:
+    """
+    Upsert the latest_attempts row for (user, quiz) in the caller's
+    transaction. The row only moves forward: an older attempt id never
+    overwrites a newer one.
+    """
+    stmt = dialect_insert(db, LatestAttempt).values(
+        user_id=user_id,
+        quiz_id=quiz_id,
+        attempt_id=attempt.id,
+        score=score,
+        total=total,
+        completed_at=attempt.created_at,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[LatestAttempt.user_id, LatestAttempt.quiz_id],
+            set_={
+                "attempt_id": stmt.excluded.attempt_id,
+                "score": stmt.excluded.score,
+                "total": stmt.excluded.total,
+                "completed_at": stmt.excluded.completed_at,
+            },
+            where=LatestAttempt.attempt_id < stmt.excluded.attempt_id,
+        )
+    )
+
+
+def latest_attempt_summary(row) -> dict:
+    if row is None:
+        return {"attempted": False}
+    return {
+        "attempted": True,
+        "attempt_id": row.attempt_id,
+        "score": row.score,
+        "total": row.total,
+        "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+    }
+
+
+def latest_attempts(db: Session, user_id: int, quiz_ids: list[int]) -> dict[int, dict]:
+    """Latest-attempt summaries for many quizzes in one query."""
+    found = {}
+    if quiz_ids:
+        rows = db.execute(
+            select(LatestAttempt).where(
+                LatestAttempt.user_id == user_id,
+                LatestAttempt.quiz_id.in_(quiz_ids),
+            )
+        ).scalars()
+        found = {row.quiz_id: row for row in rows}
+    return {quiz_id: latest_attempt_summary(found.get(quiz_id)) for quiz_id in quiz_ids}
+
+
+def backfill_latest_attempts(db: Session) -> int:
+    """
+    Fill latest_attempts from the attempts table for (user, quiz) pairs
+    that have no summary row yet, e.g. attempts made before the table
+    existed. Returns the number of rows inserted.
+    """
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=(Attempt.user_id, Attempt.quiz_id),
+            order_by=(Attempt.created_at.desc(), Attempt.id.desc()),
+        )
+        .label("rank")
+    )
+    ranked = (
+        select(
+            Attempt.user_id,
+            Attempt.quiz_id,
+            Attempt.id.label("attempt_id"),
+            Attempt.score,
+            Attempt.total,
+            Attempt.created_at.label("completed_at"),
+            rank,
+        )
+        .where(Attempt.user_id.is_not(None), Attempt.quiz_id.is_not(None))
+        .subquery()
+    )
+    latest = select(
+        ranked.c.user_id,
+        ranked.c.quiz_id,
+        ranked.c.attempt_id,
+        ranked.c.score,
+        ranked.c.total,
+        ranked.c.completed_at,
+    ).where(ranked.c.rank == 1)
+
+    result = db.execute(
+        dialect_insert(db, LatestAttempt)
+        .from_select(
+            ["user_id", "quiz_id", "attempt_id", "score", "total", "completed_at"],
+            latest,
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "quiz_id"])
+    )
+    return result.rowcount
@@ -0,0 +1,137 @@
+import csv
+import io
+from typing import Iterable
+
+from sqlalchemy import Select, select
+
+from app.core.responses import json_text
+from app.models.models import Attempt, AttemptAnswer, Question, User
+
+
+# ---------------------------------------------------------------------------
+# Attempt export
+# ---------------------------------------------------------------------------
+# One flat row per stored answer of a quiz, in attempt order. The rows are
+# read through a server-side cursor (yield_per / AsyncSession.stream) and
+# encoded a partition at a time, so an export of millions of answers holds
+# one partition in memory and starts sending after the first one.
+#
+# The export goes to whoever created the quiz, so it carries no contact
+# details of the people who took it: users appear by id and display name.
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_BATCH_SIZE = 1000
+
+COLUMNS = (
+    "attempt_id",
+    "user_id",
+    "user_name",
+    "submitted_at",
+    "score",
+    "total",
+    "question_id",
+    "question_order",
+    "question",
+    "correct_answer",
+    "answer",
+    "is_correct",
+)
+
+
+def attempt_export_query(quiz_id: int) -> Select:
+    """
+    Attempts of `quiz_id` joined with their answers, questions and users.
+
+    Walks ix_attempts_quiz_id in attempt order and attempt_answers by its
+    attempt_id index. Answers to questions deleted since stay in the export
+    with empty question columns, and an attempt without answer rows (a
+    legacy one not yet backfilled) is one row with empty answer columns.
+    """
+    return (
+        select(
+            Attempt.id.label("attempt_id"),
+            Attempt.user_id,
+            User.display_name.label("user_name"),
+            Attempt.created_at.label("submitted_at"),
+            Attempt.score,
+            Attempt.total,
+            AttemptAnswer.question_id,
+            Question.order.label("question_order"),
+            Question.text.label("question"),
+            Question.correct_answer,
+            AttemptAnswer.user_answer.label("answer"),
+            AttemptAnswer.is_correct,
+        )
+        .outerjoin(AttemptAnswer, AttemptAnswer.attempt_id == Attempt.id)
+        .outerjoin(Question, Question.id == AttemptAnswer.question_id)
+        .outerjoin(User, User.id == Attempt.user_id)
+        .where(Attempt.quiz_id == quiz_id)
+        .order_by(Attempt.id, AttemptAnswer.id)
+    )
+
+
+def _values(row) -> tuple:
+    return (
+        row.attempt_id,
+        row.user_id,
+        row.user_name,
+        row.submitted_at.isoformat() if row.submitted_at else None,
+        row.score,
+        row.total,
+        row.question_id,
+        row.question_order,
+        row.question,
+        row.correct_answer,
+        row.answer,
+        None if row.is_correct is None else bool(row.is_correct),
+    )
+
+
+# Spreadsheets evaluate cells starting with these as formulas; titles,
+# names and answers are user input, so CSV cells get a leading quote.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class ExportWriter:
+    """Encodes batches of attempt_export_query rows as CSV or NDJSON text."""
+
+    def __init__(self, fmt: str):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        self.format = fmt
+        self.media_type = EXPORT_FORMATS[fmt]
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer, lineterminator="\n")
+
+    def filename(self, quiz_id: int) -> str:
+        return f"quiz-{quiz_id}-attempts.{self.format}"
+
+    def header(self) -> str:
+        if self.format != "csv":
+            return ""
+        self._csv.writerow(COLUMNS)
+        return self._drain()
+
+    def rows(self, rows: Iterable) -> str:
+        if self.format == "csv":
+            self._csv.writerows(tuple(map(_csv_cell, _values(row))) for row in rows)
+            return self._drain()
+        return "".join(
+            json_text(dict(zip(COLUMNS, _values(row)))) + "\n"
+            for row in rows
+        )
+
+    def _drain(self) -> str:
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
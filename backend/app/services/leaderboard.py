@@ -0,0 +1,287 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.models.models import Attempt, BestAttempt, LeaderboardScore, Quiz, User
+
+
+# ---------------------------------------------------------------------------
+# Per-quiz leaderboards
+# ---------------------------------------------------------------------------
+# best_attempts keeps each user's best attempt per quiz, and
+# leaderboard_scores counts how many users have each best score.
+# submit_quiz updates both in the attempt's transaction.
+#
+#   - The board is a range scan of ix_best_attempts_rank. The top
+#     LEADERBOARD_SIZE rows of recently viewed quizzes are cached in-process
+#     for LEADERBOARD_CACHE_TTL seconds.
+#   - A user's rank is 1 + the number of users with a higher best score.
+#     That is a sum over leaderboard_scores (at most one row per distinct
+#     score, so 11 with 10 questions), so it costs the same for 1st and
+#     100,000th place. Equal scores share a rank ("1, 2, 2, 4").
+#
+# rebuild_leaderboard recomputes both tables from attempts, for the
+# backfill and after a regrade.
+
+class LeaderboardCache:
+    """Top entries per quiz, each kept for `ttl` seconds, LRU-bounded by quiz count."""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 5.0, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[int, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, quiz_id: int) -> Optional[dict]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(quiz_id)
+            if entry is None or entry[0] <= now:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(quiz_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, quiz_id: int, board: dict) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[quiz_id] = (self._clock() + self.ttl, board)
+            self._entries.move_to_end(quiz_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def offer(self, quiz_id: int, user_id: int, score: int) -> None:
+        """Drop the cached board if a user's new best `score` could change it."""
+        with self._lock:
+            entry = self._entries.get(quiz_id)
+            if entry is None:
+                return
+            entries = entry[1]["entries"]
+            if (
+                len(entries) < settings.LEADERBOARD_SIZE
+                or score >= entries[-1]["score"]
+                or any(e["user_id"] == user_id for e in entries)
+            ):
+                del self._entries[quiz_id]
+                self.invalidations += 1
+
+    def invalidate(self, quiz_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(quiz_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+leaderboard_cache = LeaderboardCache(
+    max_size=settings.LEADERBOARD_CACHE_SIZE,
+    ttl=settings.LEADERBOARD_CACHE_TTL,
+)
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+def _count_score(db: Session, quiz_id: int, score: int, delta: int) -> None:
+    stmt = dialect_insert(db, LeaderboardScore).values(quiz_id=quiz_id, score=score, users=delta)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[LeaderboardScore.quiz_id, LeaderboardScore.score],
+            set_={"users": LeaderboardScore.users + stmt.excluded.users},
+        )
+    )
+
+
+def record_best_attempt(db: Session, user_id: int, quiz_id: int, attempt, score: int, total: int) -> bool:
+    """
+    Make `attempt` the user's best at the quiz if it beats their current
+    best, in the caller's transaction. Returns whether it did.
+
+    The write only applies if the best is still the one read (no row, or
+    the same score). Otherwise a concurrent submission of the same user got
+    there first, and the best is read and compared again. That way each
+    score the counts drop is the one actually replaced.
+    """
+    key = (BestAttempt.quiz_id == quiz_id, BestAttempt.user_id == user_id)
+    values = {"attempt_id": attempt.id, "score": score, "total": total, "created_at": attempt.created_at}
+    previous = db.execute(select(BestAttempt.score).where(*key)).scalar()
+    while previous is None or previous < score:
+        if previous is None:
+            written = db.execute(
+                dialect_insert(db, BestAttempt)
+                .values(quiz_id=quiz_id, user_id=user_id, **values)
+                .on_conflict_do_nothing(index_elements=[BestAttempt.quiz_id, BestAttempt.user_id])
+            ).rowcount
+        else:
+            written = db.execute(
+                update(BestAttempt).where(*key, BestAttempt.score == previous).values(**values)
+            ).rowcount
+        if written:
+            _count_score(db, quiz_id, score, 1)
+            if previous is not None:
+                _count_score(db, quiz_id, previous, -1)
+            return True
+        previous = db.execute(select(BestAttempt.score).where(*key)).scalar()
+    return False
+
+
+def remove_leaderboard(db: Session, quiz_id: int) -> None:
+    for model in (BestAttempt, LeaderboardScore):
+        db.execute(delete(model).where(model.quiz_id == quiz_id))
+
+
+def rebuild_leaderboard(db: Session, quiz_id: Optional[int] = None) -> int:
+    """
+    Recompute best_attempts and leaderboard_scores from attempts (one quiz,
+    or all of them). Returns the number of best_attempts rows written.
+    """
+    for model in (BestAttempt, LeaderboardScore):
+        stmt = delete(model)
+        if quiz_id is not None:
+            stmt = stmt.where(model.quiz_id == quiz_id)
+        db.execute(stmt)
+
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=(Attempt.quiz_id, Attempt.user_id),
+            order_by=(Attempt.score.desc(), Attempt.created_at.asc(), Attempt.id.asc()),
+        )
+        .label("rank")
+    )
+    # attempts of deleted quizzes are kept, their leaderboards are not
+    ranked = (
+        select(
+            Attempt.quiz_id,
+            Attempt.user_id,
+            Attempt.id.label("attempt_id"),
+            Attempt.score,
+            Attempt.total,
+            Attempt.created_at,
+            rank,
+        )
+        .join(Quiz, Quiz.id == Attempt.quiz_id)
+        .where(Attempt.user_id.is_not(None))
+    )
+    if quiz_id is not None:
+        ranked = ranked.where(Attempt.quiz_id == quiz_id)
+    ranked = ranked.subquery()
+
+    result = db.execute(
+        insert(BestAttempt).from_select(
+            ["quiz_id", "user_id", "attempt_id", "score", "total", "created_at"],
+            select(
+                ranked.c.quiz_id,
+                ranked.c.user_id,
+                ranked.c.attempt_id,
+                func.coalesce(ranked.c.score, 0),
+                func.coalesce(ranked.c.total, 0),
+                ranked.c.created_at,
+            ).where(ranked.c.rank == 1),
+        )
+    )
+
+    counts = select(BestAttempt.quiz_id, BestAttempt.score, func.count()).group_by(
+        BestAttempt.quiz_id, BestAttempt.score
+    )
+    if quiz_id is not None:
+        counts = counts.where(BestAttempt.quiz_id == quiz_id)
+    db.execute(insert(LeaderboardScore).from_select(["quiz_id", "score", "users"], counts))
+    return result.rowcount
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def _top_entries(db: Session, quiz_id: int) -> dict:
+    """The top LEADERBOARD_SIZE entries and the participant count, in one statement."""
+    participants = (
+        select(func.coalesce(func.sum(LeaderboardScore.users), 0))
+        .where(LeaderboardScore.quiz_id == quiz_id)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(
+            BestAttempt.user_id,
+            User.display_name,
+            BestAttempt.score,
+            BestAttempt.total,
+            BestAttempt.created_at,
+            participants.label("participants"),
+        )
+        .join(User, User.id == BestAttempt.user_id)
+        .where(BestAttempt.quiz_id == quiz_id)
+        .order_by(BestAttempt.score.desc(), BestAttempt.created_at.asc(), BestAttempt.attempt_id.asc())
+        .limit(settings.LEADERBOARD_SIZE)
+    ).all()
+
+    entries = []
+    for i, row in enumerate(rows):
+        tied = entries and entries[-1]["score"] == row.score
+        entries.append(
+            {
+                "rank": entries[-1]["rank"] if tied else i + 1,
+                "user_id": row.user_id,
+                "display_name": row.display_name,
+                "score": row.score,
+                "total": row.total,
+                "completed_at": row.created_at.isoformat() if row.created_at else None,
+            }
+        )
+    return {"participants": rows[0].participants if rows else 0, "entries": entries}
+
+
+def top_entries(db: Session, quiz_id: int) -> dict:
+    board = leaderboard_cache.get(quiz_id)
+    if board is None:
+        board = _top_entries(db, quiz_id)
+        leaderboard_cache.put(quiz_id, board)
+    return board
+
+
+def user_rank(db: Session, quiz_id: int, user_id: int) -> Optional[dict]:
+    """The user's rank and best attempt at the quiz, or None if they have none."""
+    ahead = (
+        select(func.coalesce(func.sum(LeaderboardScore.users), 0))
+        .where(LeaderboardScore.quiz_id == quiz_id, LeaderboardScore.score > BestAttempt.score)
+        .scalar_subquery()
+    )
+    row = db.execute(
+        select(BestAttempt.score, BestAttempt.total, BestAttempt.created_at, ahead.label("ahead")).where(
+            BestAttempt.quiz_id == quiz_id, BestAttempt.user_id == user_id
+        )
+    ).first()
+    if row is None:
+        return None
+    return {
+        "rank": row.ahead + 1,
+        "score": row.score,
+        "total": row.total,
+        "completed_at": row.created_at.isoformat() if row.created_at else None,
+    }
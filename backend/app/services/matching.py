@@ -0,0 +1,161 @@
+import math
+import re
+import unicodedata
+from typing import Callable, Optional
+
+
+# ---------------------------------------------------------------------------
+# Answer matchers
+# ---------------------------------------------------------------------------
+# Each question grades with one strategy (Question.match_mode, tuned by
+# Question.match_options). compile_matcher turns a question into a plain
+# `answer -> bool` callable once, with the expected side already
+# normalized/parsed, and the compiled callables live in the cached
+# AnswerKey, so grading a submission does no per-question setup.
+#
+#   text      strip + lower-case (the original behaviour, the default)
+#   exact     strip only, case-sensitive
+#   folded    Unicode NFKC + casefold, punctuation dropped, whitespace collapsed
+#   numeric   numbers within `tolerance` (absolute, default 1e-9)
+#   any_of    folded match against the answer or any of `alternatives`
+#   fuzzy     folded match within `max_distance` edits (default 1, max 3)
+
+Matcher = Callable[[str], bool]
+
+MATCH_MODES = ("text", "exact", "folded", "numeric", "any_of", "fuzzy")
+DEFAULT_MATCH_MODE = "text"
+MAX_EDIT_DISTANCE = 3
+MAX_ALTERNATIVES = 20
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+# commas only as thousands separators: "1,000,000.5", never "3,5"
+_GROUPED_NUMBER = re.compile(r"[+-]?\d{1,3}(?:,\d{3})+(?:\.\d*)?(?:[eE][+-]?\d+)?")
+
+
+def fold(s: str) -> str:
+    s = unicodedata.normalize("NFKC", s or "").casefold()
+    s = _PUNCTUATION.sub(" ", s)
+    return _WHITESPACE.sub(" ", s).strip()
+
+
+def parse_number(s: str) -> Optional[float]:
+    """
+    The number in `s`, or None. A comma is only accepted as a thousands
+    separator; a decimal comma ("3,5") is rejected rather than read as 35.
+    """
+    s = (s or "").strip().replace("_", "")
+    if "," in s:
+        if not _GROUPED_NUMBER.fullmatch(s):
+            return None
+        s = s.replace(",", "")
+    if not _NUMBER.fullmatch(s):
+        return None
+    value = float(s)
+    return value if math.isfinite(value) else None
+
+
+def within_distance(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance(a, b) <= limit, computed only inside the diagonal band."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    if a == b:
+        return True
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        current = [i] + [limit + 1] * len(b)
+        for j in range(lo, hi + 1):
+            cost = 0 if ca == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+        if min(current[lo - 1 : hi + 1]) > limit:
+            return False
+        previous = current
+    return previous[len(b)] <= limit
+
+
+def validate_match(mode: Optional[str], options: Optional[dict], correct_answer: str) -> tuple[str, Optional[dict]]:
+    """
+    Check a question's matcher settings; returns (mode, options) with only
+    the options that mode uses. Raises ValueError with a user-facing message.
+    """
+    mode = mode or DEFAULT_MATCH_MODE
+    if mode not in MATCH_MODES:
+        raise ValueError(f"match_mode must be one of: {', '.join(MATCH_MODES)}")
+    options = {k: v for k, v in (options or {}).items() if v is not None}
+
+    if mode == "numeric":
+        if parse_number(correct_answer) is None:
+            raise ValueError("Numeric questions need a numeric correct_answer")
+        tolerance = float(options.get("tolerance", 0))
+        if not math.isfinite(tolerance) or tolerance < 0:
+            raise ValueError("tolerance must be a non-negative number")
+        return mode, ({"tolerance": tolerance} if tolerance else None)
+
+    if mode == "any_of":
+        alternatives = [a.strip() for a in options.get("alternatives") or [] if a and a.strip()]
+        if len(alternatives) > MAX_ALTERNATIVES:
+            raise ValueError(f"At most {MAX_ALTERNATIVES} alternatives per question")
+        return mode, ({"alternatives": alternatives} if alternatives else None)
+
+    if mode == "fuzzy":
+        max_distance = int(options.get("max_distance", 1))
+        if not 0 <= max_distance <= MAX_EDIT_DISTANCE:
+            raise ValueError(f"max_distance must be between 0 and {MAX_EDIT_DISTANCE}")
+        return mode, {"max_distance": max_distance}
+
+    return mode, None
+
+
+def compile_matcher(mode: Optional[str], correct_answer: str, options: Optional[dict] = None) -> Matcher:
+    mode = mode or DEFAULT_MATCH_MODE
+    options = options or {}
+
+    if mode == "exact":
+        expected = (correct_answer or "").strip()
+        return lambda answer: answer.strip() == expected
+
+    if mode == "folded":
+        expected = fold(correct_answer)
+        return lambda answer: fold(answer) == expected
+
+    if mode == "numeric":
+        target = parse_number(correct_answer)
+        tolerance = float(options.get("tolerance", 0)) or 1e-9
+        if target is None:
+            return lambda answer: False
+
+        def numeric(answer: str) -> bool:
+            value = parse_number(answer)
+            return value is not None and abs(value - target) <= tolerance
+
+        return numeric
+
+    if mode == "any_of":
+        accepted = frozenset(fold(a) for a in [correct_answer, *options.get("alternatives", [])])
+        return lambda answer: fold(answer) in accepted
+
+    if mode == "fuzzy":
+        expected = fold(correct_answer)
+        limit = int(options.get("max_distance", 1))
+        return lambda answer: within_distance(fold(answer), expected, limit)
+
+    expected = (correct_answer or "").strip().lower()
+    return lambda answer: answer.strip().lower() == expected
+
+
+def matcher_signature(mode: Optional[str], correct_answer: str, options: Optional[dict] = None) -> tuple:
+    """Equal signatures grade every answer the same way."""
+    mode = mode or DEFAULT_MATCH_MODE
+    if mode == "text":
+        answer = (correct_answer or "").strip().lower()
+    elif mode in ("folded", "any_of", "fuzzy"):
+        answer = fold(correct_answer)
+    elif mode == "numeric":
+        answer = parse_number(correct_answer)
+    else:
+        answer = (correct_answer or "").strip()
+    return mode, answer, repr(sorted((options or {}).items()))
@@ -0,0 +1,133 @@
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.models import Question
+from app.services.matching import validate_match
+
+
+# ---------------------------------------------------------------------------
+# Question write path
+# ---------------------------------------------------------------------------
+# `questions` below is always a list of QuestionInput (or plain
+# (text, correct_answer) tuples) that have already been stripped and
+# validated; list position is the order.
+
+class QuestionInput(NamedTuple):
+    text: str
+    correct_answer: str
+    match_mode: str = "text"
+    match_options: Optional[dict] = None
+
+
+def clean_quiz_input(quiz_in) -> tuple[str, str, list[QuestionInput]]:
+    """
+    Strip and validate a QuizCreate; returns (title, description, questions).
+    Raises ValueError with a user-facing message.
+    """
+    title = (quiz_in.title or "").strip()
+    if not title:
+        raise ValueError("Title is required")
+    if len(quiz_in.questions) < 1:
+        raise ValueError("At least one question is required")
+
+    questions = []
+    for q in quiz_in.questions:
+        qt = (q.text or "").strip()
+        ca = (q.correct_answer or "").strip()
+        if not qt or not ca:
+            raise ValueError("Each question and answer must be non-empty")
+        options = q.match_options.model_dump(exclude_none=True) if q.match_options else None
+        mode, options = validate_match(q.match_mode, options, ca)
+        questions.append(QuestionInput(qt, ca, mode, options))
+
+    return title, (quiz_in.description or "").strip(), questions
+
+
+def _rows(quiz_id: int, questions) -> list[dict]:
+    rows = []
+    for idx, q in enumerate(questions):
+        q = QuestionInput(*q)
+        rows.append(
+            {
+                "quiz_id": quiz_id,
+                "order": idx,
+                "text": q.text,
+                "correct_answer": q.correct_answer,
+                "match_mode": q.match_mode,
+                "match_options": q.match_options,
+            }
+        )
+    return rows
+
+
+def insert_questions(db: Session, quiz_id: int, questions: list[QuestionInput]) -> None:
+    """Insert all questions of a quiz in a single executemany round-trip."""
+    if not questions:
+        return
+    db.execute(insert(Question), _rows(quiz_id, questions))
+
+
+def insert_questions_for_quizzes(db: Session, quizzes: Iterable[tuple[int, list[QuestionInput]]]) -> None:
+    """Insert the questions of many quizzes, given as (quiz_id, questions), in one executemany."""
+    rows = [row for quiz_id, questions in quizzes for row in _rows(quiz_id, questions)]
+    if rows:
+        db.execute(insert(Question), rows)
+
+
+def sync_questions(db: Session, quiz_id: int, questions: list[QuestionInput]) -> bool:
+    """
+    Bring a quiz's questions in line with `questions`, matching by order.
+
+    Unchanged rows are left alone, so question ids stay stable and past
+    AttemptAnswer.question_id references keep pointing at the same question.
+    Only changed rows are UPDATEd, new positions INSERTed and dropped
+    positions DELETEd, each as at most one statement.
+
+    Returns True if anything was written.
+    """
+    existing = db.execute(
+        select(
+            Question.id,
+            Question.order,
+            Question.text,
+            Question.correct_answer,
+            Question.match_mode,
+            Question.match_options,
+        )
+        .where(Question.quiz_id == quiz_id)
+        .order_by(Question.order.asc())
+    ).all()
+
+    updates = []
+    inserts = []
+    for idx, wanted in enumerate(_rows(quiz_id, questions)):
+        if idx < len(existing):
+            row = existing[idx]
+            current = (row.order, row.text, row.correct_answer, row.match_mode, row.match_options)
+            if current != (
+                idx,
+                wanted["text"],
+                wanted["correct_answer"],
+                wanted["match_mode"],
+                wanted["match_options"],
+            ):
+                del wanted["quiz_id"]
+                updates.append({"id": row.id, **wanted})
+        else:
+            inserts.append(wanted)
+    stale_ids = [row.id for row in existing[len(questions):]]
+
+    if stale_ids:
+        db.execute(
+            delete(Question)
+            .where(Question.id.in_(stale_ids))
+            .execution_options(synchronize_session=False)
+        )
+    if updates:
+        db.execute(update(Question), updates)
+    if inserts:
+        db.execute(insert(Question), inserts)
+
+    return bool(stale_ids or updates or inserts)
@@ -0,0 +1,258 @@
+import csv
+import io
+import json
+import tempfile
+from typing import IO, Iterator, Optional
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.models.models import Quiz
+from app.schemas.quizzes import QuizCreate
+from app.services.questions import clean_quiz_input, insert_questions_for_quizzes
+from app.services.search import index_quizzes
+
+
+# ---------------------------------------------------------------------------
+# Bulk quiz import
+# ---------------------------------------------------------------------------
+# The upload is spooled (in memory up to SPOOL_MEMORY_BYTES, then to a temp
+# file) and read back one line / CSV row at a time. Each record is checked
+# with the same rules as POST /api/quizzes; valid ones are buffered and
+# written IMPORT_BATCH_SIZE quizzes per transaction as three executemany
+# statements (quizzes, questions, search index). Memory is bounded by the
+# batch size; the report lists the records that were rejected.
+#
+# Reading and validating (read_batches) needs no session, so the async
+# router runs it in the threadpool and only hands each write_batch to the
+# async session's run_sync.
+#
+#   ndjson  one QuizCreate JSON object per line
+#   csv     one question per row; consecutive rows with the same `quiz`
+#           (or, without that column, the same `title`) form one quiz
+
+IMPORT_CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+IMPORT_FORMATS = ("ndjson", "csv")
+CSV_REQUIRED_COLUMNS = ("title", "question", "correct_answer")
+MAX_REPORTED_ERRORS = 1000
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
+
+def import_format(content_type: Optional[str], fmt: Optional[str]) -> str:
+    """Pick the upload format from ?format= or, failing that, the Content-Type."""
+    if fmt is None:
+        fmt = IMPORT_CONTENT_TYPES.get((content_type or "").split(";")[0].strip().lower())
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail="Send the upload as application/x-ndjson or text/csv, or pass ?format=ndjson|csv",
+        )
+    return fmt
+
+
+async def spool_upload(request: Request) -> IO[bytes]:
+    """Copy the request body into a spooled temp file, enforcing IMPORT_MAX_BYTES."""
+    upload = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > settings.IMPORT_MAX_BYTES:
+            upload.close()
+            raise HTTPException(
+                status_code=413,
+                detail=f"Uploads are limited to {settings.IMPORT_MAX_BYTES} bytes",
+            )
+        upload.write(chunk)
+    upload.seek(0)
+    return upload
+
+
+def _ndjson_records(text: IO[str]) -> Iterator[tuple[int, object]]:
+    for line_no, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as exc:
+            yield line_no, ValueError(f"Invalid JSON: {exc}")
+
+
+def _csv_question(row: dict) -> dict:
+    options = {
+        "tolerance": row.get("tolerance") or None,
+        "alternatives": [a for a in (row.get("alternatives") or "").split("|") if a.strip()] or None,
+        "max_distance": row.get("max_distance") or None,
+    }
+    return {
+        "text": row.get("question") or "",
+        "correct_answer": row.get("correct_answer") or "",
+        "match_mode": row.get("match_mode") or "text",
+        "match_options": options if any(v is not None for v in options.values()) else None,
+    }
+
+
+def _csv_rows(reader: csv.DictReader) -> Iterator[dict]:
+    """The rows of `reader`, with a malformed CSV raised as a ValueError."""
+    rows = iter(reader)
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            # line_num counts the lines of the rows read before the bad one
+            raise ValueError(f"Invalid CSV at line {reader.line_num + 1}: {exc}") from exc
+        yield row
+
+
+def _csv_records(text: IO[str]) -> Iterator[tuple[int, object]]:
+    reader = csv.DictReader(text)
+    try:
+        fieldnames = reader.fieldnames or []
+    except csv.Error as exc:
+        raise ValueError(f"Invalid CSV header: {exc}") from exc
+    missing = [c for c in CSV_REQUIRED_COLUMNS if c not in fieldnames]
+    if missing:
+        raise ValueError(f"CSV header is missing column(s): {', '.join(missing)}")
+    key_column = "quiz" if "quiz" in fieldnames else "title"
+
+    current_key, start_line, payload = None, 0, None
+    line_no = reader.line_num
+    for row in _csv_rows(reader):
+        key = row.get(key_column) or ""
+        if payload is None or key != current_key:
+            if payload is not None:
+                yield start_line, payload
+            current_key, start_line = key, line_no + 1
+            payload = {
+                "title": row.get("title") or "",
+                "description": row.get("description"),
+                "questions": [],
+            }
+        payload["questions"].append(_csv_question(row))
+        line_no = reader.line_num
+    if payload is not None:
+        yield start_line, payload
+
+
+def _validate(record: object) -> tuple[str, str, list]:
+    if isinstance(record, ValueError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError("Each record must be a JSON object")
+    try:
+        quiz_in = QuizCreate.model_validate(record)
+    except ValidationError as exc:
+        raise ValueError(
+            "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()[:3]
+            )
+        )
+    return clean_quiz_input(quiz_in)
+
+
+def _insert_quizzes(db: Session, rows: list[dict]) -> list[int]:
+    """INSERT ... RETURNING for many quizzes; ids come back in `rows` order."""
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite can only honour sort_by_parameter_order one row per
+        # statement. Rowids are handed out in VALUES order under the single
+        # writer lock, so sorting the returned ids restores the order.
+        return sorted(db.execute(insert(Quiz).returning(Quiz.id), rows).scalars())
+    return db.execute(insert(Quiz).returning(Quiz.id, sort_by_parameter_order=True), rows).scalars().all()
+
+
+def write_batch(db: Session, creator_id: int, batch: list[tuple[str, str, list]]) -> None:
+    """Insert one batch of validated quizzes for `creator_id` and commit it."""
+    quiz_ids = _insert_quizzes(
+        db,
+        [
+            {"title": title, "description": description, "creator_id": creator_id, "is_public": True}
+            for title, description, _ in batch
+        ],
+    )
+    insert_questions_for_quizzes(db, zip(quiz_ids, (questions for _, _, questions in batch)))
+    index_quizzes(
+        db,
+        [
+            (quiz_id, title, description, (q.text for q in questions))
+            for quiz_id, (title, description, questions) in zip(quiz_ids, batch)
+        ],
+    )
+    db.commit()
+    response_cache.invalidate("catalog")
+
+
+def new_report() -> dict:
+    return {"imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+
+def read_batches(
+    upload: IO[bytes],
+    fmt: str,
+    report: dict,
+    batch_size: Optional[int] = None,
+) -> Iterator[list[tuple[str, str, list]]]:
+    """
+    Parse and validate `upload`, yielding batches of up to `batch_size`
+    valid quizzes; rejected records are counted in `report`. No database
+    access. Raises ValueError for an unreadable upload (e.g. a CSV without
+    the required columns, or a malformed one).
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", errors="replace", newline="")
+    records = _csv_records(text) if fmt == "csv" else _ndjson_records(text)
+    errors = report["errors"]
+
+    batch: list[tuple[str, str, list]] = []
+    try:
+        for line_no, record in records:
+            try:
+                batch.append(_validate(record))
+            except ValueError as exc:
+                report["failed"] += 1
+                report["errors_truncated"] = len(errors) >= MAX_REPORTED_ERRORS
+                if not report["errors_truncated"]:
+                    title = record.get("title") if isinstance(record, dict) else None
+                    errors.append(
+                        {
+                            "line": line_no,
+                            "title": title if isinstance(title, str) else None,
+                            "error": str(exc),
+                        }
+                    )
+                continue
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        text.detach()
+
+
+def import_quizzes(
+    db: Session,
+    upload: IO[bytes],
+    fmt: str,
+    creator_id: int,
+    batch_size: Optional[int] = None,
+) -> dict:
+    """
+    Import every valid quiz in `upload` for `creator_id`; returns the report.
+
+    Batches commit independently, so quizzes from batches written before a
+    failure stay imported. Raises ValueError for an unreadable upload.
+    """
+    report = new_report()
+    for batch in read_batches(upload, fmt, report, batch_size):
+        write_batch(db, creator_id, batch)
+        report["imported"] += len(batch)
+    return report
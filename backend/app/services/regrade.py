@@ -0,0 +1,238 @@
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.response_cache import response_cache
+from app.models.models import Attempt, AttemptAnswer, LatestAttempt, Quiz, RegradeJob
+from app.services.answer_keys import load_answer_key
+from app.services.matching import Matcher, matcher_signature
+from app.services.questions import QuestionInput
+from app.services.scoring import AnswerKey
+from app.services.leaderboard import leaderboard_cache, rebuild_leaderboard
+from app.services.stats import rebuild_stats
+
+logger = logging.getLogger(__name__)
+
+# sessions for background regrades; the test suite points this at its own database
+session_factory = SessionLocal
+
+
+# ---------------------------------------------------------------------------
+# Regrading existing attempts
+# ---------------------------------------------------------------------------
+# When an edit changes a quiz's answer key, stored AttemptAnswer.is_correct
+# and Attempt.score go stale. regrade_quiz walks the quiz's answer rows in
+# keyset chunks (memory is bounded by the chunk size), grades each chunk
+# column-wise against the new key and writes back only the rows that flip,
+# plus one score delta per affected attempt, as a handful of set-based
+# UPDATEs. Each chunk commits together with its checkpoint in regrade_jobs,
+# so an interrupted run picks up after the last committed chunk and a
+# re-run of a committed chunk finds nothing left to change.
+
+
+def answer_key_changed(key: AnswerKey, questions: list[QuestionInput]) -> bool:
+    """True if `questions` would grade any existing question differently."""
+    for entry, q in zip(key.entries, questions):
+        q = QuestionInput(*q)
+        before = matcher_signature(entry.match_mode, entry.correct_answer, entry.match_options)
+        after = matcher_signature(q.match_mode, q.correct_answer, q.match_options)
+        if before != after:
+            return True
+    return False
+
+
+def grade_chunk(
+    matchers: dict[int, Matcher],
+    question_ids: tuple,
+    user_answers: tuple,
+    current: tuple,
+) -> list[bool]:
+    """
+    Grade one chunk given as parallel columns. Answers to questions that are
+    no longer in the key keep their current grade.
+    """
+    return [
+        matchers[qid](answer or "") if qid in matchers else bool(was)
+        for qid, answer, was in zip(question_ids, user_answers, current)
+    ]
+
+
+def _apply_chunk(db: Session, ids, attempt_ids, current, graded) -> int:
+    to_correct, to_wrong = [], []
+    deltas: dict[int, int] = {}
+    for answer_id, attempt_id, was, now in zip(ids, attempt_ids, current, graded):
+        if bool(was) == now:
+            continue
+        (to_correct if now else to_wrong).append(answer_id)
+        deltas[attempt_id] = deltas.get(attempt_id, 0) + (1 if now else -1)
+
+    for flipped, value in ((to_correct, True), (to_wrong, False)):
+        if flipped:
+            db.execute(
+                update(AttemptAnswer)
+                .where(AttemptAnswer.id.in_(flipped))
+                .values(is_correct=value)
+                .execution_options(synchronize_session=False)
+            )
+
+    # one UPDATE per distinct delta (at most 2 x questions-per-quiz of them)
+    by_delta: dict[int, list[int]] = {}
+    for attempt_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(attempt_id)
+    for delta, attempt_ids_for_delta in by_delta.items():
+        db.execute(
+            update(Attempt)
+            .where(Attempt.id.in_(attempt_ids_for_delta))
+            .values(score=Attempt.score + delta)
+            .execution_options(synchronize_session=False)
+        )
+    return len(to_correct) + len(to_wrong)
+
+
+def _start_job(db: Session, quiz_id: int, version: int, restart: bool) -> RegradeJob:
+    job = db.get(RegradeJob, quiz_id)
+    if job is None:
+        job = RegradeJob(quiz_id=quiz_id, version=version)
+        db.add(job)
+    elif job.version == version and job.status != "superseded" and not restart:
+        return job  # resume (or no-op if already done)
+
+    job.version = version
+    job.last_answer_id = 0
+    job.scanned = 0
+    job.changed = 0
+    job.status = "running"
+    job.started_at = job.updated_at = datetime.utcnow()
+    db.commit()
+    return job
+
+
+def _finish(db: Session, quiz_id: int) -> None:
+    # derived copies of the scores
+    db.execute(
+        update(LatestAttempt)
+        .where(LatestAttempt.quiz_id == quiz_id)
+        .values(
+            score=select(Attempt.score)
+            .where(Attempt.id == LatestAttempt.attempt_id)
+            .scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rebuild_stats(db, quiz_id=quiz_id)
+    rebuild_leaderboard(db, quiz_id=quiz_id)
+
+
+def regrade_quiz(
+    db: Session,
+    quiz_id: int,
+    chunk_size: Optional[int] = None,
+    restart: bool = False,
+    on_chunk: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Regrade every stored answer of `quiz_id` against its current key.
+
+    Resumes an unfinished job for the same quiz version unless `restart`.
+    Stops (status "superseded") if the quiz is edited again mid-run; the
+    newer edit's regrade takes over. Returns a progress report including
+    rows per second for this run.
+    """
+    chunk_size = chunk_size or settings.REGRADE_CHUNK_SIZE
+    key = load_answer_key(db, quiz_id)
+    if not key.version:
+        raise LookupError(f"Quiz {quiz_id} not found or has no questions")
+    matchers = {entry.question_id: entry.matches for entry in key.entries}
+
+    job = _start_job(db, quiz_id, key.version, restart)
+    start = time.perf_counter()
+    scanned = changed = 0
+    finished = False
+
+    def report() -> dict:
+        elapsed = time.perf_counter() - start
+        return {
+            "quiz_id": quiz_id,
+            "version": job.version,
+            "status": job.status,
+            "last_answer_id": job.last_answer_id,
+            "scanned": job.scanned,
+            "changed": job.changed,
+            "run_scanned": scanned,
+            "run_changed": changed,
+            "seconds": elapsed,
+            "rows_per_second": scanned / elapsed if elapsed > 0 else 0.0,
+        }
+
+    while job.status == "running":
+        current_version = db.execute(select(Quiz.version).where(Quiz.id == quiz_id)).scalar()
+        if current_version != key.version:
+            job.status = "superseded"
+            db.commit()
+            break
+
+        rows = db.execute(
+            select(
+                AttemptAnswer.id,
+                AttemptAnswer.attempt_id,
+                AttemptAnswer.question_id,
+                AttemptAnswer.user_answer,
+                AttemptAnswer.is_correct,
+            )
+            .join(Attempt, Attempt.id == AttemptAnswer.attempt_id)
+            .where(Attempt.quiz_id == quiz_id, AttemptAnswer.id > job.last_answer_id)
+            .order_by(AttemptAnswer.id)
+            .limit(chunk_size)
+        ).all()
+
+        if not rows:
+            _finish(db, quiz_id)
+            job.status = "done"
+            finished = True
+        else:
+            ids, attempt_ids, question_ids, answers, current = zip(*rows)
+            graded = grade_chunk(matchers, question_ids, answers, current)
+            flipped = _apply_chunk(db, ids, attempt_ids, current, graded)
+            job.last_answer_id = ids[-1]
+            job.scanned += len(ids)
+            job.changed += flipped
+            scanned += len(ids)
+            changed += flipped
+        job.updated_at = datetime.utcnow()
+        db.commit()
+
+        if on_chunk is not None:
+            on_chunk(report())
+
+    if finished:
+        # flips of an earlier, interrupted or superseded run are only now
+        # visible in latest_attempts and the leaderboard; titles are
+        # unchanged, but my-results pages embed scores
+        response_cache.invalidate("catalog")
+        leaderboard_cache.invalidate(quiz_id)
+    return report()
+
+
+def regrade_in_background(quiz_id: int) -> None:
+    """BackgroundTasks entry point: regrade on a session of its own."""
+    with session_factory() as db:
+        try:
+            result = regrade_quiz(db, quiz_id)
+        except Exception:
+            logger.exception("regrade of quiz %s failed", quiz_id)
+            return
+    logger.info(
+        "regrade of quiz %s %s: %s rows, %s changed, %.0f rows/s",
+        quiz_id,
+        result["status"],
+        result["run_scanned"],
+        result["run_changed"],
+        result["rows_per_second"],
+    )
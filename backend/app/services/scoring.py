@@ -0,0 +1,132 @@
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.models import Attempt, AttemptAnswer
+from app.services.matching import Matcher, compile_matcher
+
+
+# ---------------------------------------------------------------------------
+# Answer keys
+# ---------------------------------------------------------------------------
+
+class KeyEntry(NamedTuple):
+    question_id: int
+    order: int
+    text: str
+    correct_answer: str
+    match_mode: str
+    match_options: Optional[dict]
+    matches: Matcher  # compiled once per key, see app.services.matching
+
+
+class AnswerKey(NamedTuple):
+    quiz_id: int
+    quiz_title: str
+    entries: tuple[KeyEntry, ...]
+    version: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.entries)
+
+
+def compile_answer_key(
+    quiz_id: int,
+    quiz_title: str,
+    questions: Iterable,
+    version: int = 0,
+) -> AnswerKey:
+    """
+    Build an AnswerKey from rows with id/order/text/correct_answer (and
+    optionally match_mode/match_options), in order.
+    """
+    entries = []
+    for q in questions:
+        mode = getattr(q, "match_mode", None) or "text"
+        options = getattr(q, "match_options", None)
+        entries.append(
+            KeyEntry(
+                q.id,
+                q.order,
+                q.text,
+                q.correct_answer,
+                mode,
+                options,
+                compile_matcher(mode, q.correct_answer, options),
+            )
+        )
+    return AnswerKey(quiz_id=quiz_id, quiz_title=quiz_title, entries=tuple(entries), version=version)
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def score_answers(key: AnswerKey, answers: dict[int, str]) -> tuple[int, list[dict]]:
+    """
+    Grade `answers` ({question_id: raw answer}) against `key` in one pass.
+
+    Missing answers count as "". Returns (score, per-question results).
+    """
+    score = 0
+    results = []
+    for entry in key.entries:
+        user_answer = (answers.get(entry.question_id) or "").strip()
+        is_correct = entry.matches(user_answer)
+        score += is_correct
+        results.append(
+            {
+                "question_id": entry.question_id,
+                "question": entry.text,
+                "user_answer": user_answer,
+                "correct_answer": entry.correct_answer,
+                "is_correct": is_correct,
+            }
+        )
+    return score, results
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+def save_attempt(
+    db: Session,
+    user_id: int,
+    key: AnswerKey,
+    score: int,
+    results: list[dict],
+    store_details: bool = True,
+):
+    """
+    Persist an attempt as one INSERT ... RETURNING plus one bulk insert of
+    its answer rows. Returns the (id, created_at) row of the new attempt.
+    """
+    attempt = db.execute(
+        insert(Attempt)
+        .values(
+            user_id=user_id,
+            quiz_id=key.quiz_id,
+            score=score,
+            total=key.total,
+            details=results if store_details else None,
+        )
+        .returning(Attempt.id, Attempt.created_at)
+    ).one()
+
+    if results:
+        db.execute(
+            insert(AttemptAnswer),
+            [
+                {
+                    "attempt_id": attempt.id,
+                    "question_id": r["question_id"],
+                    "user_answer": r["user_answer"],
+                    "is_correct": r["is_correct"],
+                }
+                for r in results
+            ],
+        )
+    return attempt
@@ -0,0 +1,189 @@
+import re
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.models import Question, Quiz
+
+
+# ---------------------------------------------------------------------------
+# Quiz search index
+# ---------------------------------------------------------------------------
+# One document per quiz: title, description and all question texts. On
+# SQLite it lives in the FTS5 table quiz_search (rowid = quiz id), on
+# Postgres in quiz_search.document (tsvector, GIN-indexed). Writes go
+# through index_quiz/remove_quiz in the caller's transaction, so the index
+# is never ahead of or behind the quizzes table.
+
+MAX_TERMS = 8
+# Only the newest MAX_CANDIDATES matches are ranked. Scoring is linear in
+# the number of matching quizzes, so a very common term would otherwise
+# make a single page cost a pass over most of the catalog.
+MAX_CANDIDATES = 2000
+
+# title matches outrank description matches, which outrank question text
+_FTS5_SCORE = "-bm25(quiz_search, 10.0, 4.0, 1.0)"
+
+_PG_DOCUMENT = (
+    "setweight(to_tsvector('simple', :title), 'A') || "
+    "setweight(to_tsvector('simple', :description), 'B') || "
+    "setweight(to_tsvector('simple', :questions), 'C')"
+)
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def search_terms(q: str) -> list[str]:
+    """Lower-cased word tokens of a user query, capped at MAX_TERMS."""
+    return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+
+def _match_query(dialect: str, terms: list[str]) -> str:
+    # every term must match; the last one also as a prefix (search-as-you-
+    # type) once it has 2+ characters. Prefixing every term would expand
+    # each into all of its completions and make latency depend on the
+    # vocabulary rather than the page size.
+    prefix = len(terms[-1]) > 1
+    if dialect == "postgresql":
+        parts = list(terms)
+        if prefix:
+            parts[-1] += ":*"
+        return " & ".join(parts)
+    parts = [f'"{t}"' for t in terms]
+    if prefix:
+        parts[-1] += "*"
+    return " ".join(parts)
+
+
+def index_quiz(
+    db: Session,
+    quiz_id: int,
+    title: str,
+    description: Optional[str],
+    question_texts: Iterable[str],
+) -> None:
+    index_quizzes(db, [(quiz_id, title, description, question_texts)])
+
+
+def index_quizzes(db: Session, docs: list[tuple]) -> None:
+    """Index (quiz_id, title, description, question_texts) documents in one executemany."""
+    params = [
+        {
+            "quiz_id": quiz_id,
+            "title": title,
+            "description": description or "",
+            "questions": "\n".join(question_texts),
+        }
+        for quiz_id, title, description, question_texts in docs
+    ]
+    if not params:
+        return
+    if _dialect(db) == "postgresql":
+        db.execute(
+            text(
+                f"INSERT INTO quiz_search (quiz_id, document) VALUES (:quiz_id, {_PG_DOCUMENT}) "
+                "ON CONFLICT (quiz_id) DO UPDATE SET document = excluded.document"
+            ),
+            params,
+        )
+    else:
+        db.execute(text("DELETE FROM quiz_search WHERE rowid = :quiz_id"), params)
+        db.execute(
+            text(
+                "INSERT INTO quiz_search (rowid, title, description, questions) "
+                "VALUES (:quiz_id, :title, :description, :questions)"
+            ),
+            params,
+        )
+
+
+def remove_quiz(db: Session, quiz_id: int) -> None:
+    column = "quiz_id" if _dialect(db) == "postgresql" else "rowid"
+    db.execute(text(f"DELETE FROM quiz_search WHERE {column} = :quiz_id"), {"quiz_id": quiz_id})
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Re-index every quiz from scratch. Returns the number indexed."""
+    db.execute(text("DELETE FROM quiz_search"))
+    quizzes = db.execute(select(Quiz.id, Quiz.title, Quiz.description)).all()
+    texts: dict[int, list[str]] = {}
+    for quiz_id, question_text in db.execute(
+        select(Question.quiz_id, Question.text).order_by(Question.quiz_id, Question.order)
+    ):
+        texts.setdefault(quiz_id, []).append(question_text)
+
+    index_quizzes(db, [(q.id, q.title, q.description, texts.get(q.id, [])) for q in quizzes])
+    return len(quizzes)
+
+
+def search_quizzes(db: Session, q: str, cursor: Optional[str], limit: int) -> dict:
+    """
+    One page of public quizzes matching every term of `q`, best first.
+
+    Keyset-paginated on (score DESC, id ASC); the score is deterministic
+    for a given index state, so cursors stay stable between pages.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return {"items": [], "next_cursor": None}
+
+    dialect = _dialect(db)
+    params = {"query": _match_query(dialect, terms), "limit": limit + 1, "candidates": MAX_CANDIDATES}
+    if dialect == "postgresql":
+        score = "ts_rank_cd(s.document, to_tsquery('simple', :query))::float8"
+        source = "quiz_search s JOIN quizzes q ON q.id = s.quiz_id"
+        match = (
+            "s.document @@ to_tsquery('simple', :query) AND s.quiz_id >= ("
+            "SELECT coalesce(min(quiz_id), 0) FROM (SELECT quiz_id FROM quiz_search "
+            "WHERE document @@ to_tsquery('simple', :query) "
+            "ORDER BY quiz_id DESC LIMIT :candidates) AS newest)"
+        )
+    else:
+        score = _FTS5_SCORE
+        source = "quiz_search JOIN quizzes q ON q.id = quiz_search.rowid"
+        match = (
+            "quiz_search MATCH :query AND quiz_search.rowid >= ("
+            "SELECT coalesce(min(rowid), 0) FROM (SELECT rowid FROM quiz_search "
+            "WHERE quiz_search MATCH :query ORDER BY rowid DESC LIMIT :candidates))"
+        )
+
+    keyset = ""
+    if cursor:
+        last_score, last_id = decode_cursor(cursor, 2)
+        try:
+            params["last_score"], params["last_id"] = float(last_score), int(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        keyset = (
+            f" AND ({score} < :last_score"
+            f" OR ({score} = :last_score AND q.id > :last_id))"
+        )
+
+    rows = db.execute(
+        text(
+            f"SELECT q.id, q.title, q.description, {score} AS score "
+            f"FROM {source} "
+            f"WHERE {match} AND q.is_public{keyset} "
+            "ORDER BY score DESC, q.id "
+            "LIMIT :limit"
+        ),
+        params,
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].score, rows[-1].id)
+
+    return {
+        "items": [
+            {"id": r.id, "title": r.title, "description": r.description}
+            for r in rows
+        ],
+        "next_cursor": next_cursor,
+    }
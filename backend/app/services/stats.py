@@ -0,0 +1,242 @@
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.database import dialect_insert
+from app.models.models import (
+    Attempt,
+    AttemptAnswer,
+    Question,
+    QuestionStats,
+    Quiz,
+    QuizScoreBucket,
+    QuizStats,
+)
+
+
+# ---------------------------------------------------------------------------
+# Per-quiz statistics
+# ---------------------------------------------------------------------------
+# quiz_stats / quiz_score_buckets / question_stats are running counters.
+# record_attempt_stats adds one attempt with three upserts in the caller's
+# transaction; rebuild_stats recomputes them from attempts in one streaming
+# pass, for backfill or to verify the counters.
+
+HISTOGRAM_BUCKETS = 11  # 0-9%, 10-19%, ..., 90-99%, 100%
+
+
+def score_bucket(score: int, total: int) -> int:
+    if total <= 0:
+        return 0
+    return max(0, min(HISTOGRAM_BUCKETS - 1, score * 10 // total))
+
+
+def record_attempt_stats(db: Session, quiz_id: int, score: int, total: int, results: list[dict]) -> None:
+    quiz_row = dialect_insert(db, QuizStats).values(
+        quiz_id=quiz_id, attempt_count=1, score_sum=score, total_sum=total
+    )
+    db.execute(
+        quiz_row.on_conflict_do_update(
+            index_elements=[QuizStats.quiz_id],
+            set_={
+                "attempt_count": QuizStats.attempt_count + 1,
+                "score_sum": QuizStats.score_sum + quiz_row.excluded.score_sum,
+                "total_sum": QuizStats.total_sum + quiz_row.excluded.total_sum,
+            },
+        )
+    )
+
+    bucket_row = dialect_insert(db, QuizScoreBucket).values(
+        quiz_id=quiz_id, bucket=score_bucket(score, total), count=1
+    )
+    db.execute(
+        bucket_row.on_conflict_do_update(
+            index_elements=[QuizScoreBucket.quiz_id, QuizScoreBucket.bucket],
+            set_={"count": QuizScoreBucket.count + 1},
+        )
+    )
+
+    if results:
+        question_rows = dialect_insert(db, QuestionStats)
+        db.execute(
+            question_rows.on_conflict_do_update(
+                index_elements=[QuestionStats.question_id],
+                set_={
+                    "answered": QuestionStats.answered + 1,
+                    "correct": QuestionStats.correct + question_rows.excluded.correct,
+                },
+            ),
+            [
+                {
+                    "question_id": r["question_id"],
+                    "quiz_id": quiz_id,
+                    "answered": 1,
+                    "correct": int(bool(r["is_correct"])),
+                }
+                for r in results
+            ],
+        )
+
+
+def remove_quiz_stats(db: Session, quiz_id: int) -> None:
+    for model in (QuizStats, QuizScoreBucket, QuestionStats):
+        db.execute(delete(model).where(model.quiz_id == quiz_id))
+
+
+def _median_bucket(histogram: list[int]) -> Optional[int]:
+    count = sum(histogram)
+    if not count:
+        return None
+    middle = (count + 1) // 2
+    seen = 0
+    for bucket, n in enumerate(histogram):
+        seen += n
+        if seen >= middle:
+            return bucket
+    return None
+
+
+def get_quiz_stats(db: Session, quiz_id: int) -> dict:
+    """Stats for one quiz from the aggregate tables; cost is bounded by the question count."""
+    stats = db.get(QuizStats, quiz_id)
+    histogram = [0] * HISTOGRAM_BUCKETS
+    for bucket, count in db.execute(
+        select(QuizScoreBucket.bucket, QuizScoreBucket.count).where(QuizScoreBucket.quiz_id == quiz_id)
+    ):
+        histogram[bucket] = count
+
+    questions = db.execute(
+        select(Question.id, Question.order, Question.text, QuestionStats.answered, QuestionStats.correct)
+        .outerjoin(QuestionStats, QuestionStats.question_id == Question.id)
+        .where(Question.quiz_id == quiz_id)
+        .order_by(Question.order.asc())
+    ).all()
+
+    attempts = stats.attempt_count if stats else 0
+    median = _median_bucket(histogram)
+    return {
+        "quiz_id": quiz_id,
+        "attempt_count": attempts,
+        "mean_score": stats.score_sum / attempts if attempts else None,
+        "mean_percent": 100 * stats.score_sum / stats.total_sum if attempts and stats.total_sum else None,
+        # lower bound of the median's 10% bucket
+        "median_percent": median * 10 if median is not None else None,
+        "histogram": [
+            {"from_percent": b * 10, "to_percent": min(100, b * 10 + 9), "count": n}
+            for b, n in enumerate(histogram)
+        ],
+        "questions": [
+            {
+                "question_id": q.id,
+                "order": q.order,
+                "text": q.text,
+                "answered": q.answered or 0,
+                "correct": q.correct or 0,
+                "correct_rate": q.correct / q.answered if q.answered else None,
+            }
+            for q in questions
+        ],
+    }
+
+
+def rebuild_stats(db: Session, quiz_id: Optional[int] = None, verify: bool = False) -> dict:
+    """
+    Recompute the aggregates from attempts and attempt_answers.
+
+    Raw rows are streamed, only the per-quiz / per-question totals are held
+    in memory. With `verify=True` nothing is written and the quiz ids whose
+    stored counters differ are reported instead.
+    """
+    quizzes: dict[int, list[int]] = {}
+    buckets: dict[tuple[int, int], int] = {}
+    # attempts of deleted quizzes are kept, their stats are not
+    attempts = select(Attempt.quiz_id, Attempt.score, Attempt.total).join(
+        Quiz, Quiz.id == Attempt.quiz_id
+    )
+    if quiz_id is not None:
+        attempts = attempts.where(Attempt.quiz_id == quiz_id)
+    for row in db.execute(attempts.execution_options(yield_per=1000)):
+        agg = quizzes.setdefault(row.quiz_id, [0, 0, 0])
+        agg[0] += 1
+        agg[1] += row.score or 0
+        agg[2] += row.total or 0
+        key = (row.quiz_id, score_bucket(row.score or 0, row.total or 0))
+        buckets[key] = buckets.get(key, 0) + 1
+
+    questions: dict[int, list[int]] = {}
+    answers = select(AttemptAnswer.question_id, Question.quiz_id, AttemptAnswer.is_correct).join(
+        Question, Question.id == AttemptAnswer.question_id
+    )
+    if quiz_id is not None:
+        answers = answers.where(Question.quiz_id == quiz_id)
+    for row in db.execute(answers.execution_options(yield_per=5000)):
+        agg = questions.setdefault(row.question_id, [row.quiz_id, 0, 0])
+        agg[1] += 1
+        agg[2] += int(bool(row.is_correct))
+
+    if verify:
+        mismatched = _stored_quiz_ids_differing(db, quiz_id, quizzes, buckets, questions)
+        return {"quizzes": len(quizzes), "questions": len(questions), "mismatched": mismatched}
+
+    for model in (QuizStats, QuizScoreBucket, QuestionStats):
+        stmt = delete(model)
+        if quiz_id is not None:
+            stmt = stmt.where(model.quiz_id == quiz_id)
+        db.execute(stmt)
+
+    if quizzes:
+        db.execute(
+            insert(QuizStats),
+            [
+                {"quiz_id": qid, "attempt_count": c, "score_sum": s, "total_sum": t}
+                for qid, (c, s, t) in quizzes.items()
+            ],
+        )
+        db.execute(
+            insert(QuizScoreBucket),
+            [{"quiz_id": qid, "bucket": b, "count": n} for (qid, b), n in buckets.items()],
+        )
+    if questions:
+        db.execute(
+            insert(QuestionStats),
+            [
+                {"question_id": question_id, "quiz_id": qid, "answered": a, "correct": c}
+                for question_id, (qid, a, c) in questions.items()
+            ],
+        )
+    return {"quizzes": len(quizzes), "questions": len(questions), "mismatched": []}
+
+
+def _stored_quiz_ids_differing(db, quiz_id, quizzes, buckets, questions) -> list[int]:
+    def scoped(stmt, model):
+        return stmt.where(model.quiz_id == quiz_id) if quiz_id is not None else stmt
+
+    stored_quizzes = {
+        r.quiz_id: [r.attempt_count, r.score_sum, r.total_sum]
+        for r in db.execute(scoped(select(QuizStats), QuizStats)).scalars()
+    }
+    stored_buckets = {
+        (r.quiz_id, r.bucket): r.count
+        for r in db.execute(scoped(select(QuizScoreBucket), QuizScoreBucket)).scalars()
+        if r.count
+    }
+    # counters of since-deleted questions are unreachable, not wrong
+    live_questions = select(QuestionStats).join(Question, Question.id == QuestionStats.question_id)
+    stored_questions = {
+        r.question_id: [r.quiz_id, r.answered, r.correct]
+        for r in db.execute(scoped(live_questions, QuestionStats)).scalars()
+    }
+
+    differing = set()
+    for qid in stored_quizzes.keys() | quizzes.keys():
+        if stored_quizzes.get(qid) != quizzes.get(qid):
+            differing.add(qid)
+    for key in stored_buckets.keys() | buckets.keys():
+        if stored_buckets.get(key) != buckets.get(key):
+            differing.add(key[0])
+    for question_id in stored_questions.keys() | questions.keys():
+        expected, stored = questions.get(question_id), stored_questions.get(question_id)
+        if expected != stored:
+            differing.add((expected or stored)[0])
+    return sorted(differing)
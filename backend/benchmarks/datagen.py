@@ -0,0 +1,237 @@
+"""
+Synthetic QuickQuiz data at a configurable scale.
+
+Creates users, public quizzes with questions, and attempts with their
+per-question answers, then derives latest_attempts, the quiz stats, the
+leaderboards and the search index with the same functions the maintenance CLI uses. The
+target database is dropped and recreated first.
+
+    python -m benchmarks.datagen [--scale small|medium|large] [--users N]
+        [--quizzes N] [--questions-per-quiz N] [--attempts N] [--seed N]
+        [--database-url URL]
+
+Seeded users authenticate in load runs with the token "bench-<n>" (see
+bench_claims); question <k> of every quiz has the answer "answer <k>".
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Attempt, AttemptAnswer, Base, LatestAttempt, Question, Quiz, User
+from app.services.attempts import backfill_latest_attempts
+from app.services.leaderboard import rebuild_leaderboard
+from app.services.search import rebuild_search_index
+from app.services.stats import rebuild_stats
+
+BATCH = 10000
+HISTORY_DAYS = 90
+TOPICS = (
+    "algebra", "anatomy", "astronomy", "biology", "chemistry", "chess", "cinema", "climate",
+    "cooking", "economics", "football", "geography", "geology", "grammar", "history", "jazz",
+    "literature", "mythology", "music", "nutrition", "opera", "painting", "philosophy",
+    "physics", "poetry", "politics", "python", "rivers", "space", "statistics", "tennis", "wine",
+)
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    quizzes: int
+    questions_per_quiz: int
+    attempts: int
+
+
+PRESETS = {
+    "small": Scale(users=100, quizzes=200, questions_per_quiz=10, attempts=2_000),
+    "medium": Scale(users=1_000, quizzes=2_000, questions_per_quiz=10, attempts=50_000),
+    "large": Scale(users=10_000, quizzes=20_000, questions_per_quiz=10, attempts=1_000_000),
+}
+
+
+def bench_uid(n: int) -> str:
+    return f"bench-{n}"
+
+
+def bench_claims(token: str) -> dict:
+    """Token verifier for load runs: "bench-<n>" is seeded user n, anything else is rejected."""
+    if not token.startswith("bench-"):
+        raise ValueError("not a benchmark token")
+    return {"uid": token, "email": f"{token}@bench.local", "name": f"Bench {token[6:]}"}
+
+
+def _chunks(rows, size: int = BATCH):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(db, model, rows) -> None:
+    for batch in _chunks(rows):
+        db.execute(insert(model), batch)
+
+
+def _sync_sequences(db) -> None:
+    # Ids are assigned here, so Postgres sequences have to be moved past them.
+    for table in ("users", "quizzes", "questions", "attempts", "attempt_answers"):
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+            )
+        )
+
+
+def generate(database_url: str, scale: Scale, seed: int = 0) -> dict:
+    """Reset `database_url` and fill it; returns a summary of what was created."""
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    now = datetime.utcnow()
+    start = time.perf_counter()
+    try:
+        _insert(
+            db,
+            User,
+            (
+                {
+                    "id": n + 1,
+                    "firebase_uid": bench_uid(n),
+                    "email": f"{bench_uid(n)}@bench.local",
+                    "display_name": f"Bench {n}",
+                }
+                for n in range(scale.users)
+            ),
+        )
+        _insert(
+            db,
+            Quiz,
+            (
+                {
+                    "id": q + 1,
+                    "title": f"{rng.choice(TOPICS).title()} quiz {q}",
+                    "description": " ".join(rng.sample(TOPICS, 3)),
+                    "creator_id": rng.randrange(scale.users) + 1,
+                    "created_at": now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400)),
+                    "is_public": True,
+                }
+                for q in range(scale.quizzes)
+            ),
+        )
+        per_quiz = scale.questions_per_quiz
+        _insert(
+            db,
+            Question,
+            (
+                {
+                    "id": q * per_quiz + k + 1,
+                    "quiz_id": q + 1,
+                    "order": k,
+                    "text": f"Question {k} about {rng.choice(TOPICS)}",
+                    "correct_answer": f"answer {k}",
+                }
+                for q in range(scale.quizzes)
+                for k in range(per_quiz)
+            ),
+        )
+
+        attempts, answers = [], []
+        for a in range(scale.attempts):
+            quiz = rng.randrange(scale.quizzes)
+            results = [rng.random() < 0.7 for _ in range(per_quiz)]
+            attempts.append(
+                {
+                    "id": a + 1,
+                    "quiz_id": quiz + 1,
+                    "user_id": rng.randrange(scale.users) + 1,
+                    "score": sum(results),
+                    "total": per_quiz,
+                    "created_at": now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400)),
+                }
+            )
+            answers.extend(
+                {
+                    "id": a * per_quiz + k + 1,
+                    "attempt_id": a + 1,
+                    "question_id": quiz * per_quiz + k + 1,
+                    "user_answer": f"answer {k}" if correct else "no idea",
+                    "is_correct": correct,
+                }
+                for k, correct in enumerate(results)
+            )
+            if len(answers) >= BATCH:
+                _insert(db, Attempt, attempts)
+                _insert(db, AttemptAnswer, answers)
+                attempts, answers = [], []
+        _insert(db, Attempt, attempts)
+        _insert(db, AttemptAnswer, answers)
+
+        if engine.dialect.name == "postgresql":
+            _sync_sequences(db)
+        backfill_latest_attempts(db)
+        rebuild_stats(db)
+        rebuild_leaderboard(db)
+        rebuild_search_index(db)
+        db.commit()
+        latest = db.execute(select(func.count()).select_from(LatestAttempt)).scalar_one()
+    finally:
+        db.close()
+        engine.dispose()
+
+    return {
+        **asdict(scale),
+        "latest_attempts": latest,
+        "seed": seed,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--scale", choices=PRESETS, default="small")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--quizzes", type=int)
+    parser.add_argument("--questions-per-quiz", type=int, choices=range(1, 11), metavar="1-10")
+    parser.add_argument("--attempts", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def scale_from_args(args) -> Scale:
+    overrides = {
+        field: getattr(args, field)
+        for field in ("users", "quizzes", "questions_per_quiz", "attempts")
+        if getattr(args, field) is not None
+    }
+    return replace(PRESETS[args.scale], **overrides)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_scale_arguments(parser)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    summary = generate(database_url, scale_from_args(args), seed=args.seed)
+    print(
+        f"{summary['users']} users, {summary['quizzes']} quizzes x {summary['questions_per_quiz']} "
+        f"questions, {summary['attempts']} attempts in {summary['seconds']}s -> {database_url}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+"""
+Scripted load test of the real app, in-process and through uvicorn.
+
+Seeds a throwaway database with benchmarks.datagen, then runs each
+workload mix for `--duration` seconds with `--concurrency` virtual users:
+once against app.main:app in this process (httpx ASGI transport, no
+network) and once against a local uvicorn worker. ID tokens are checked
+by a local stub verifier (benchmarks.server), never by Firebase.
+
+For every route it reports throughput, p50/p95/p99 latency and SQL
+statements per request (from the app's /metrics histograms, so streamed
+responses are counted in full), and writes everything to a JSON file that
+a later run can be compared against:
+
+    python -m benchmarks.load [--mix browse,take_quiz,submit_burst,view_results,mixed]
+        [--target inprocess|uvicorn|both] [--duration S] [--warmup S]
+        [--concurrency C] [--async-db] [--scale small|medium|large] [--seed N]
+        [--database-url URL] [--output PATH] [--compare BASELINE.json]
+
+Every target starts from a freshly generated database and runs the mixes
+in the order given, so repeated runs with the same arguments do the same
+work. --database-url points the run at Postgres instead (it is reset).
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.datagen import TOPICS, add_scale_arguments, bench_uid, generate, scale_from_args
+from benchmarks.sync_vs_async import start_server
+
+TARGETS = ("inprocess", "uvicorn")
+HOT_QUIZZES = 3
+PAGE_SIZE = 20
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+# -----------------------------
+# virtual users + workloads
+# -----------------------------
+class Recorder:
+    """Client-side latency and error counts per route template."""
+
+    def __init__(self):
+        self.enabled = False
+        self.routes: dict[str, dict] = {}
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        if not self.enabled:
+            return
+        stats = self.routes.setdefault(route, {"latencies": [], "errors": 0})
+        stats["latencies"].append(seconds)
+        stats["errors"] += not ok
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, dataset: dict, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.dataset = dataset
+        self.rng = rng
+        self.headers = {"Authorization": f"Bearer {bench_uid(rng.randrange(dataset['users']))}"}
+
+    async def call(self, route: str, path: str, auth: bool = True, **kwargs) -> dict:
+        """Request `path`, recorded under `route` ("METHOD /template"); returns the JSON body or {}."""
+        method = route.split(" ", 1)[0]
+        start = time.perf_counter()
+        try:
+            resp = await self.client.request(method, path, headers=self.headers if auth else None, **kwargs)
+            ok = resp.status_code < 400
+            body = resp.json() if ok and resp.content else {}
+        except httpx.HTTPError:
+            ok, body = False, {}
+        self.recorder.record(route, time.perf_counter() - start, ok)
+        return body
+
+    def quiz_id(self) -> int:
+        return self.rng.randrange(self.dataset["quizzes"]) + 1
+
+    def answers(self, questions: list[dict]) -> dict:
+        # roughly the 70% hit rate of the seeded attempts
+        return {
+            "answers": [
+                {
+                    "question_id": q["id"],
+                    "answer": f"answer {q['order']}" if self.rng.random() < 0.7 else "no idea",
+                }
+                for q in questions
+            ]
+        }
+
+
+async def browse(vu: VirtualUser) -> None:
+    """Anonymous visitor: catalog page (sometimes the next one), a search, a quiz."""
+    page = await vu.call("GET /api/quizzes", "/api/quizzes", auth=False, params={"limit": PAGE_SIZE})
+    if page.get("next_cursor") and vu.rng.random() < 0.3:
+        await vu.call(
+            "GET /api/quizzes",
+            "/api/quizzes",
+            auth=False,
+            params={"limit": PAGE_SIZE, "cursor": page["next_cursor"]},
+        )
+    await vu.call("GET /api/quizzes/search", "/api/quizzes/search", auth=False, params={"q": vu.rng.choice(TOPICS)})
+    await vu.call("GET /api/quizzes/{quiz_id}", f"/api/quizzes/{vu.quiz_id()}", auth=False)
+
+
+async def take_quiz(vu: VirtualUser) -> None:
+    """Signed-in user opens a quiz, submits it and checks their latest attempt."""
+    quiz_id = vu.quiz_id()
+    quiz = await vu.call("GET /api/quizzes/{quiz_id}", f"/api/quizzes/{quiz_id}")
+    if not quiz.get("questions"):
+        return
+    await vu.call("POST /api/quizzes/{quiz_id}/submit", f"/api/quizzes/{quiz_id}/submit", json=vu.answers(quiz["questions"]))
+    await vu.call("GET /api/quizzes/{quiz_id}/my-latest-attempt", f"/api/quizzes/{quiz_id}/my-latest-attempt")
+
+
+async def submit_burst(vu: VirtualUser) -> None:
+    """Everyone submits to the same few quizzes (a class taking a quiz at once)."""
+    quiz_id = vu.rng.randrange(min(HOT_QUIZZES, vu.dataset["quizzes"])) + 1
+    per_quiz = vu.dataset["questions_per_quiz"]
+    # datagen numbers questions quiz by quiz, so ids are known without a GET
+    questions = [{"id": (quiz_id - 1) * per_quiz + k + 1, "order": k} for k in range(per_quiz)]
+    await vu.call("POST /api/quizzes/{quiz_id}/submit", f"/api/quizzes/{quiz_id}/submit", json=vu.answers(questions))
+
+
+async def view_results(vu: VirtualUser) -> None:
+    """Signed-in user pages their history, opens an attempt and the quiz cards' badges."""
+    page = await vu.call("GET /api/quizzes/my-results", "/api/quizzes/my-results", params={"limit": PAGE_SIZE})
+    items = page.get("items") or []
+    if not items:
+        return
+    attempt = vu.rng.choice(items)
+    await vu.call("GET /api/quizzes/attempts/{attempt_id}", f"/api/quizzes/attempts/{attempt['id']}")
+    ids = ",".join(dict.fromkeys(str(item["quiz_id"]) for item in items))
+    await vu.call("GET /api/quizzes/my-latest-attempts", "/api/quizzes/my-latest-attempts", params={"ids": ids})
+
+
+WORKLOADS = {
+    "browse": browse,
+    "take_quiz": take_quiz,
+    "submit_burst": submit_burst,
+    "view_results": view_results,
+}
+# workload weights per mix; "mixed" is a read-heavy day on the site
+MIXES = {
+    **{name: {name: 1} for name in WORKLOADS},
+    "mixed": {"browse": 6, "take_quiz": 2, "view_results": 2},
+}
+
+
+# -----------------------------
+# server-side query counts
+# -----------------------------
+_METRIC_LINE = re.compile(
+    r'^quickquiz_(db_statements|db_seconds)_(sum|count)\{method="([^"]+)",route="([^"]+)"\} (\S+)$'
+)
+
+
+async def metrics_snapshot(client: httpx.AsyncClient) -> dict:
+    """{"METHOD /route": {"db_statements_sum": ..., ...}} from GET /metrics, or {} if disabled."""
+    resp = await client.get("/metrics")
+    if resp.status_code != 200:
+        return {}
+    snapshot: dict[str, dict] = {}
+    for line in resp.text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if match:
+            metric, kind, method, route, value = match.groups()
+            snapshot.setdefault(f"{method} {route}", {})[f"{metric}_{kind}"] = float(value)
+    return snapshot
+
+
+def _db_per_request(before: dict, after: dict, route: str) -> dict:
+    if route not in after:
+        return {"queries_per_request": None, "db_ms_per_request": None}
+    old, new = before.get(route, {}), after[route]
+    delta = lambda key: new.get(key, 0.0) - old.get(key, 0.0)
+    count = delta("db_statements_count")
+    if not count:
+        return {"queries_per_request": None, "db_ms_per_request": None}
+    return {
+        "queries_per_request": round(delta("db_statements_sum") / count, 2),
+        "db_ms_per_request": round(1000 * delta("db_seconds_sum") / count, 3),
+    }
+
+
+# -----------------------------
+# runner
+# -----------------------------
+def percentile(values: list[float], p: float) -> float:
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+async def run_mix(client, dataset: dict, mix: str, concurrency: int, duration: float, warmup: float, seed: int) -> dict:
+    recorder = Recorder()
+    names, weights = zip(*MIXES[mix].items())
+    users = [VirtualUser(client, recorder, dataset, random.Random(f"{seed}:{mix}:{i}")) for i in range(concurrency)]
+
+    async def drive(vu: VirtualUser, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            await WORKLOADS[vu.rng.choices(names, weights)[0]](vu)
+
+    if warmup > 0:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(drive(vu, deadline) for vu in users))
+
+    before = await metrics_snapshot(client)
+    recorder.enabled = True
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(vu, start + duration) for vu in users))
+    elapsed = time.perf_counter() - start
+    recorder.enabled = False
+    after = await metrics_snapshot(client)
+
+    routes = {}
+    for route, stats in sorted(recorder.routes.items()):
+        latencies = sorted(stats["latencies"])
+        routes[route] = {
+            "requests": len(latencies),
+            "errors": stats["errors"],
+            "rps": round(len(latencies) / elapsed, 1),
+            "mean_ms": round(1000 * sum(latencies) / len(latencies), 2),
+            "p50_ms": round(1000 * percentile(latencies, 0.50), 2),
+            "p95_ms": round(1000 * percentile(latencies, 0.95), 2),
+            "p99_ms": round(1000 * percentile(latencies, 0.99), 2),
+            **_db_per_request(before, after, route),
+        }
+    requests = sum(r["requests"] for r in routes.values())
+    return {
+        "seconds": round(elapsed, 2),
+        "requests": requests,
+        "errors": sum(r["errors"] for r in routes.values()),
+        "rps": round(requests / elapsed, 1),
+        "routes": routes,
+    }
+
+
+async def run_mixes(client, dataset: dict, args) -> dict:
+    results = {}
+    for mix in args.mix:
+        results[mix] = await run_mix(client, dataset, mix, args.concurrency, args.duration, args.warmup, args.seed)
+        print_mix(args.current_target, mix, results[mix])
+    return results
+
+
+async def run_inprocess(dataset: dict, args) -> dict:
+    from benchmarks.server import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://inprocess", timeout=60) as client:
+            return await run_mixes(client, dataset, args)
+
+
+def _inprocess_worker(dataset: dict, args) -> dict:
+    return asyncio.run(run_inprocess(dataset, args))
+
+
+async def run_uvicorn(base_url: str, dataset: dict, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        return await run_mixes(client, dataset, args)
+
+
+def run_target(target: str, database_url: str, args) -> dict:
+    dataset = generate(database_url, scale_from_args(args), seed=args.seed)
+    print(
+        f"\n== {target}: {dataset['users']} users, {dataset['quizzes']} quizzes, "
+        f"{dataset['attempts']} attempts (seeded in {dataset['seconds']}s)"
+    )
+    args.current_target = target
+    if target == "inprocess":
+        # A fresh interpreter: app settings are read on import, and this one
+        # imported them (via datagen) before DATABASE_URL / ASYNC_DB were set.
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            return {"dataset": dataset, "mixes": pool.apply(_inprocess_worker, (dataset, args))}
+
+    proc, base_url = start_server(database_url, args.async_db, app="benchmarks.server:app")
+    try:
+        return {"dataset": dataset, "mixes": asyncio.run(run_uvicorn(base_url, dataset, args))}
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+# -----------------------------
+# environment + reporting
+# -----------------------------
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_mix(target: str, mix: str, result: dict) -> None:
+    print(
+        f"\n{target} / {mix}: {result['requests']} requests in {result['seconds']}s "
+        f"({result['rps']} req/s), {result['errors']} errors"
+    )
+    print(f"{'route':<48} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}")
+    for route, r in result["routes"].items():
+        queries = "-" if r["queries_per_request"] is None else f"{r['queries_per_request']:.1f}"
+        print(
+            f"{route:<48} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+            f"{r['p99_ms']:>8.1f} {queries:>8}"
+        )
+
+
+def _change(old, new) -> str:
+    if old is None or new is None:
+        return "-"
+    if not old:
+        return "new" if new else "0%"
+    return f"{100 * (new - old) / old:+.0f}%"
+
+
+def print_comparison(baseline: dict, current: dict) -> None:
+    print(f"\nchange vs baseline ({baseline['meta'].get('git_commit')} at {baseline['meta'].get('started_at')})")
+    print(f"{'target / mix / route':<72} {'req/s':>7} {'p95':>7} {'p99':>7} {'queries':>8}")
+    for target, result in current["targets"].items():
+        old_target = baseline["targets"].get(target)
+        if old_target is None:
+            continue
+        for mix, mix_result in result["mixes"].items():
+            old_mix = old_target["mixes"].get(mix)
+            if old_mix is None:
+                continue
+            for route, r in mix_result["routes"].items():
+                old = old_mix["routes"].get(route)
+                if old is None:
+                    continue
+                print(
+                    f"{f'{target} / {mix} / {route}':<72} {_change(old['rps'], r['rps']):>7} "
+                    f"{_change(old['p95_ms'], r['p95_ms']):>7} {_change(old['p99_ms'], r['p99_ms']):>7} "
+                    f"{_change(old['queries_per_request'], r['queries_per_request']):>8}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mix", default=",".join(MIXES), help=f"comma-separated, from: {', '.join(MIXES)}")
+    parser.add_argument("--target", choices=(*TARGETS, "both"), default="both")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per mix")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each mix")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--async-db", action="store_true", help="run the ASYNC_DB stack")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--output", default=None, help="results JSON (default: benchmarks/results/)")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to diff against")
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    args.mix = [m.strip() for m in args.mix.split(",") if m.strip()]
+    unknown = [m for m in args.mix if m not in MIXES]
+    if unknown:
+        parser.error(f"unknown mix(es): {', '.join(unknown)}")
+    targets = TARGETS if args.target == "both" else (args.target,)
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ.update(DATABASE_URL=database_url, ASYNC_DB="true" if args.async_db else "false")
+
+    started_at = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": database_url.split(":", 1)[0],
+            "async_db": args.async_db,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "scale": scale_from_args(args).__dict__,
+            "seed": args.seed,
+        },
+        "targets": {target: run_target(target, database_url, args) for target in targets},
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"load-{started_at:%Y%m%d-%H%M%S}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
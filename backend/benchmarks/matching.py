@@ -0,0 +1,51 @@
+"""
+Matches per second for each answer-matching strategy.
+
+Matchers are compiled once (as the answer-key cache does) and then applied
+to a fixed mix of correct, near-miss and wrong answers.
+
+    python -m benchmarks.matching [--matches N]
+"""
+import argparse
+import time
+
+from app.services.matching import compile_matcher
+
+CASES = {
+    "text": ("Paris", None, ["paris", "  Paris ", "Paris.", "London"]),
+    "exact": ("Paris", None, ["Paris", " Paris ", "paris", "London"]),
+    "folded": ("Ångström unit", None, ["ångström unit", "ÅNGSTRÖM-UNIT!", "angstrom unit", "metre"]),
+    "numeric": ("3.14159", {"tolerance": 0.001}, ["3.1416", "3.14", "1,000", "pi"]),
+    "any_of": (
+        "USA",
+        {"alternatives": ["United States", "U.S.", "United States of America"]},
+        ["usa", "united states", "U.S.", "Canada"],
+    ),
+    "fuzzy": ("Mississippi", {"max_distance": 2}, ["Missisippi", "Misisipi", "mississippi", "Missouri"]),
+}
+
+
+def run(matches: int) -> dict:
+    report = {}
+    for mode, (correct, options, answers) in CASES.items():
+        matcher = compile_matcher(mode, correct, options)
+        inputs = (answers * (matches // len(answers) + 1))[:matches]
+        start = time.perf_counter()
+        hits = sum(1 for answer in inputs if matcher(answer))
+        elapsed = time.perf_counter() - start
+        report[mode] = {"matches_per_second": matches / elapsed, "hit_ratio": hits / matches}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'strategy':<9} {'matches/s':>12} {'hit ratio':>10}")
+    for mode, r in run(args.matches).items():
+        print(f"{mode:<9} {r['matches_per_second']:>12,.0f} {r['hit_ratio']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
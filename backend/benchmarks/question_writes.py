@@ -0,0 +1,144 @@
+"""
+Round-trips and wall time for writing a 10-question quiz.
+
+Compares the old per-question `db.add` path (and delete + re-insert on
+update) with the bulk insert / diffing path in app.services.questions.
+
+    python -m benchmarks.question_writes [--iterations N] [--database-url URL]
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.models import Base, Question, Quiz, User
+from app.services.questions import insert_questions, sync_questions
+
+QUESTIONS = [(f"Question {i}", f"Answer {i}") for i in range(10)]
+EDITED = QUESTIONS[:4] + [("Question 4 (fixed)", "Answer 4")] + QUESTIONS[5:]
+
+
+# -----------------------------
+# write paths under test
+# -----------------------------
+def legacy_create(db, user_id):
+    quiz = Quiz(title="Bench", description="", creator_id=user_id, is_public=True)
+    db.add(quiz)
+    db.flush()
+    for idx, (text, answer) in enumerate(QUESTIONS):
+        db.add(Question(quiz_id=quiz.id, order=idx, text=text, correct_answer=answer))
+    db.commit()
+    return quiz.id
+
+
+def legacy_update(db, quiz_id, questions):
+    db.query(Question).filter(Question.quiz_id == quiz_id).delete()
+    for idx, (text, answer) in enumerate(questions):
+        db.add(Question(quiz_id=quiz_id, order=idx, text=text, correct_answer=answer))
+    db.commit()
+
+
+def bulk_create(db, user_id):
+    quiz = Quiz(title="Bench", description="", creator_id=user_id, is_public=True)
+    db.add(quiz)
+    db.flush()
+    insert_questions(db, quiz.id, QUESTIONS)
+    db.commit()
+    return quiz.id
+
+
+def bulk_update(db, quiz_id, questions):
+    sync_questions(db, quiz_id, questions)
+    db.commit()
+
+
+MODES = {
+    "legacy": (legacy_create, legacy_update),
+    "bulk": (bulk_create, bulk_update),
+}
+
+
+# -----------------------------
+# harness
+# -----------------------------
+class RoundTripCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def _measure(Session, counter, fn, *args):
+    db = Session()
+    try:
+        counter.count = 0
+        start = time.perf_counter()
+        result = fn(db, *args)
+        elapsed = time.perf_counter() - start
+        return result, counter.count, elapsed
+    finally:
+        db.close()
+
+
+def run(database_url: str, iterations: int) -> dict:
+    kwargs = {}
+    if database_url.startswith("sqlite"):
+        kwargs = {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+    engine = create_engine(database_url, **kwargs)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    counter = RoundTripCounter(engine)
+
+    db = Session()
+    user = User(firebase_uid="bench", email="bench@bench.local", display_name="Bench")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    report = {}
+    for mode, (create, update) in MODES.items():
+        stats = {op: {"round_trips": 0, "seconds": 0.0} for op in ("create", "update_one", "update_noop")}
+        for _ in range(iterations):
+            quiz_id, trips, secs = _measure(Session, counter, create, user_id)
+            stats["create"]["round_trips"] = trips
+            stats["create"]["seconds"] += secs
+
+            _, trips, secs = _measure(Session, counter, update, quiz_id, EDITED)
+            stats["update_one"]["round_trips"] = trips
+            stats["update_one"]["seconds"] += secs
+
+            _, trips, secs = _measure(Session, counter, update, quiz_id, EDITED)
+            stats["update_noop"]["round_trips"] = trips
+            stats["update_noop"]["seconds"] += secs
+
+        report[mode] = {
+            op: {
+                "round_trips": s["round_trips"],
+                "ms_per_op": 1000 * s["seconds"] / iterations,
+            }
+            for op, s in stats.items()
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    report = run(args.database_url, args.iterations)
+    print(f"{'mode':<8} {'operation':<12} {'round-trips':>11} {'ms/op':>8}")
+    for mode, ops in report.items():
+        for op, s in ops.items():
+            print(f"{mode:<8} {op:<12} {s['round_trips']:>11} {s['ms_per_op']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
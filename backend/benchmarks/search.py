@@ -0,0 +1,150 @@
+"""
+Quiz search latency over a synthetic corpus (1M questions by default).
+
+Compares the full-text index in app.services.search with the LIKE scan
+over titles, descriptions and question text it replaces.
+
+    python -m benchmarks.search [--questions N] [--per-quiz N] [--queries N] [--database-url URL]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, or_, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Base, Question, Quiz, User
+from app.services.search import rebuild_search_index, search_quizzes
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+BATCH = 10000
+
+
+def _vocabulary(rng: random.Random, size: int = 20000) -> list[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(LETTERS) for _ in range(rng.randint(3, 10))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+def _sentence(rng: random.Random, vocab: list[str], words: int) -> str:
+    # Zipf-ish: a few words are very common, most are rare
+    return " ".join(vocab[int(rng.paretovariate(1.1)) % len(vocab)] for _ in range(words))
+
+
+def seed(Session, questions: int, per_quiz: int, seed_value: int = 7) -> list[str]:
+    rng = random.Random(seed_value)
+    vocab = _vocabulary(rng)
+
+    with Session() as db:
+        user = User(firebase_uid="bench", email="bench@bench.local", display_name="Bench")
+        db.add(user)
+        db.flush()
+
+        quizzes = questions // per_quiz
+        for first in range(0, quizzes, BATCH):
+            ids = range(first + 1, min(first + BATCH, quizzes) + 1)
+            db.execute(
+                insert(Quiz),
+                [
+                    {
+                        "id": quiz_id,
+                        "title": _sentence(rng, vocab, 3),
+                        "description": _sentence(rng, vocab, 8),
+                        "creator_id": user.id,
+                        "is_public": True,
+                    }
+                    for quiz_id in ids
+                ],
+            )
+            db.execute(
+                insert(Question),
+                [
+                    {
+                        "quiz_id": quiz_id,
+                        "order": order,
+                        "text": _sentence(rng, vocab, 12),
+                        "correct_answer": "x",
+                    }
+                    for quiz_id in ids
+                    for order in range(per_quiz)
+                ],
+            )
+        db.commit()
+
+    # a mix of common, mid-frequency and rare terms, single and two-word
+    queries = []
+    for _ in range(200):
+        a = vocab[int(rng.paretovariate(1.1)) % len(vocab)]
+        b = vocab[rng.randrange(len(vocab))]
+        queries.append(a if rng.random() < 0.5 else f"{a} {b}")
+    return queries
+
+
+def like_search(db, q: str, limit: int) -> list:
+    """The client-side/LIKE-style scan: every term anywhere in the quiz."""
+    stmt = select(Quiz.id, Quiz.title, Quiz.description).where(Quiz.is_public == True)
+    for term in q.split():
+        pattern = f"%{term}%"
+        in_questions = Quiz.id.in_(select(Question.quiz_id).where(Question.text.like(pattern)))
+        stmt = stmt.where(or_(Quiz.title.like(pattern), Quiz.description.like(pattern), in_questions))
+    return db.execute(stmt.order_by(Quiz.id).limit(limit)).all()
+
+
+def _latencies(fn, queries: list[str]) -> dict:
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    pct = lambda p: 1000 * samples[min(len(samples) - 1, int(p * len(samples)))]
+    return {"p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99), "max_ms": 1000 * samples[-1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--questions", type=int, default=1_000_000)
+    parser.add_argument("--per-quiz", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--like-queries", type=int, default=20, help="the LIKE scan is slow; sample fewer")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'search-bench.db')}"
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    start = time.perf_counter()
+    queries = seed(Session, args.questions, args.per_quiz)
+    print(f"seeded {args.questions} questions in {time.perf_counter() - start:.1f}s")
+
+    with Session() as db:
+        start = time.perf_counter()
+        indexed = rebuild_search_index(db)
+        db.commit()
+        print(f"indexed {indexed} quizzes in {time.perf_counter() - start:.1f}s")
+
+        sample = (queries * (args.queries // len(queries) + 1))[: args.queries]
+        results = {"index": _latencies(lambda q: search_quizzes(db, q, None, 20), sample)}
+        if args.like_queries:
+            results["like"] = _latencies(lambda q: like_search(db, q, 20), sample[: args.like_queries])
+
+    print(f"{'path':<6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:<6} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+            f"{r['p99_ms']:>9.2f} {r['max_ms']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Per-route response serialization time, with FAST_RESPONSES off and on.
+
+Seeds a throwaway database with benchmarks.datagen (by default a few
+users with long attempt histories) and calls each JSON route of
+benchmarks.server:app in-process, one request at a time, alternating
+between the two modes. For every route it reports the median
+"serialize" phase of the Server-Timing header (endpoint return to
+response headers: response_model validation and encoding) and the median
+client-side time for the whole response, body included:
+
+    python -m benchmarks.serialization [--requests N] [--users N]
+        [--quizzes N] [--attempts N] [--seed N]
+
+my-results and the NDJSON export stream their bodies, so their cost shows
+up in the total rather than the serialize column.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import re
+import statistics
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine, func, select
+
+from app.models.models import Attempt, Quiz
+from benchmarks.datagen import add_scale_arguments, bench_uid, generate, scale_from_args
+
+MODES = {"standard": False, "fast": True}
+_SERIALIZE = re.compile(r"serialize;dur=([\d.]+)")
+
+
+def _fixtures(database_url: str) -> dict:
+    """Ids for the routes that need an owner: the busiest quiz, its creator, one attempt."""
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            quiz_id = conn.execute(
+                select(Attempt.quiz_id).group_by(Attempt.quiz_id).order_by(func.count().desc()).limit(1)
+            ).scalar_one()
+            creator_id = conn.execute(select(Quiz.creator_id).where(Quiz.id == quiz_id)).scalar_one()
+            attempt_id = conn.execute(
+                select(Attempt.id).where(Attempt.user_id == 1).order_by(Attempt.id.desc()).limit(1)
+            ).scalar_one()
+            quiz_ids = conn.execute(select(Quiz.id).order_by(Quiz.id).limit(100)).scalars().all()
+    finally:
+        engine.dispose()
+    return {
+        "quiz_id": quiz_id,
+        "creator": {"Authorization": f"Bearer {bench_uid(creator_id - 1)}"},
+        "user": {"Authorization": f"Bearer {bench_uid(0)}"},
+        "attempt_id": attempt_id,
+        "quiz_ids": ",".join(map(str, quiz_ids)),
+    }
+
+
+def _routes(f: dict, questions_per_quiz: int) -> dict:
+    """route label -> (method, path, request kwargs)."""
+    quiz_id = f["quiz_id"]
+    answers = {
+        "answers": [
+            {"question_id": (quiz_id - 1) * questions_per_quiz + k + 1, "answer": f"answer {k}"}
+            for k in range(questions_per_quiz)
+        ]
+    }
+    return {
+        "GET /api/quizzes?limit=100": ("GET", "/api/quizzes", {"params": {"limit": 100}}),
+        "GET /api/quizzes/search": ("GET", "/api/quizzes/search", {"params": {"q": "history"}}),
+        "GET /api/quizzes/{id}": ("GET", f"/api/quizzes/{quiz_id}", {}),
+        "GET /api/quizzes/{id} (creator)": ("GET", f"/api/quizzes/{quiz_id}", {"headers": f["creator"]}),
+        "POST /api/quizzes/{id}/submit": (
+            "POST",
+            f"/api/quizzes/{quiz_id}/submit",
+            {"headers": f["user"], "json": answers},
+        ),
+        "GET /api/quizzes/attempts/{id}": ("GET", f"/api/quizzes/attempts/{f['attempt_id']}", {"headers": f["user"]}),
+        "GET /api/quizzes/{id}/my-latest-attempt": (
+            "GET",
+            f"/api/quizzes/{quiz_id}/my-latest-attempt",
+            {"headers": f["user"]},
+        ),
+        "GET /api/quizzes/my-latest-attempts (100)": (
+            "GET",
+            "/api/quizzes/my-latest-attempts",
+            {"headers": f["user"], "params": {"ids": f["quiz_ids"]}},
+        ),
+        "GET /api/quizzes/my-results?limit=200": (
+            "GET",
+            "/api/quizzes/my-results",
+            {"headers": f["user"], "params": {"limit": 200}},
+        ),
+        "GET /api/quizzes/{id}/attempts/export (ndjson)": (
+            "GET",
+            f"/api/quizzes/{quiz_id}/attempts/export",
+            {"headers": f["creator"], "params": {"format": "ndjson"}},
+        ),
+    }
+
+
+async def _measure(routes: dict, requests: int) -> dict:
+    from app.core.config import settings
+    from benchmarks.server import app
+
+    samples = {route: {mode: {"serialize": [], "total": []} for mode in MODES} for route in routes}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://inprocess", timeout=60) as client:
+            for route, (method, path, kwargs) in routes.items():
+                for i in range(requests + 1):
+                    for mode, fast in MODES.items():
+                        settings.FAST_RESPONSES = fast
+                        start = time.perf_counter()
+                        resp = await client.request(method, path, **kwargs)
+                        total = time.perf_counter() - start
+                        if resp.status_code >= 400:
+                            raise RuntimeError(f"{route}: HTTP {resp.status_code} {resp.text[:200]}")
+                        if i == 0:
+                            continue  # warm-up: caches, lazy engine / answer keys
+                        match = _SERIALIZE.search(resp.headers.get("server-timing", ""))
+                        samples[route][mode]["serialize"].append(float(match.group(1)) if match else 0.0)
+                        samples[route][mode]["total"].append(total * 1000)
+    return {
+        route: {
+            mode: {phase: statistics.median(values) for phase, values in phases.items()}
+            for mode, phases in modes.items()
+        }
+        for route, modes in samples.items()
+    }
+
+
+def _worker(routes: dict, requests: int) -> dict:
+    return asyncio.run(_measure(routes, requests))
+
+
+def _change(old: float, new: float) -> str:
+    return f"{100 * (new - old) / old:+.0f}%" if old else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per route and mode")
+    add_scale_arguments(parser)
+    parser.set_defaults(users=20, quizzes=200, attempts=20_000)
+    args = parser.parse_args()
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    scale = scale_from_args(args)
+    dataset = generate(database_url, scale, seed=args.seed)
+    print(
+        f"{dataset['users']} users, {dataset['quizzes']} quizzes, {dataset['attempts']} attempts "
+        f"(seeded in {dataset['seconds']}s); {args.requests} requests per route and mode"
+    )
+    routes = _routes(_fixtures(database_url), scale.questions_per_quiz)
+
+    # A fresh interpreter: settings are read on import, before which the
+    # database and a cache-free, instrumented configuration must be set.
+    os.environ.update(
+        DATABASE_URL=database_url,
+        ASYNC_DB="false",
+        RESPONSE_CACHE_BACKEND="none",
+        METRICS_ENABLED="true",
+        SERVER_TIMING_HEADER="true",
+    )
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        report = pool.apply(_worker, (routes, args.requests))
+
+    print(
+        f"\n{'route (median ms)':<48} {'serialize':>9} {'fast':>7} {'change':>7}"
+        f" {'total':>8} {'fast':>8} {'change':>7}"
+    )
+    for route, r in report.items():
+        std, fast = r["standard"], r["fast"]
+        print(
+            f"{route:<48} {std['serialize']:>9.2f} {fast['serialize']:>7.2f} "
+            f"{_change(std['serialize'], fast['serialize']):>7} {std['total']:>8.2f} "
+            f"{fast['total']:>8.2f} {_change(std['total'], fast['total']):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+ASGI entry point for load runs: app.main:app with the token verifier
+swapped for benchmarks.datagen.bench_claims, so seeded users sign in with
+"bench-<n>" tokens and nothing is sent to Firebase.
+
+    uvicorn benchmarks.server:app
+"""
+from app.core.auth import set_token_verifier
+from app.main import app
+from benchmarks.datagen import bench_claims
+
+set_token_verifier(bench_claims)
+
+__all__ = ["app"]
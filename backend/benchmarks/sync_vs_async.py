@@ -0,0 +1,143 @@
+"""
+Concurrent read throughput of the sync (threadpool) vs async (ASYNC_DB) stack.
+
+Seeds a throwaway SQLite database, starts one uvicorn worker per stack and
+fires `--requests` GETs at the public listing and quiz detail routes with
+`--concurrency` requests in flight.
+
+    python -m benchmarks.sync_vs_async [--requests N] [--concurrency C]
+
+Pass --database-url to run against Postgres instead (it is reset first).
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Base, Question, Quiz, User
+
+QUIZ_COUNT = 50
+
+
+def seed(database_url: str) -> list[int]:
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        user = User(firebase_uid="bench", email="bench@bench.local", display_name="Bench")
+        db.add(user)
+        db.flush()
+        quiz_ids = []
+        for i in range(QUIZ_COUNT):
+            quiz = Quiz(title=f"Quiz {i}", description="benchmark", creator_id=user.id)
+            db.add(quiz)
+            db.flush()
+            db.execute(
+                insert(Question),
+                [
+                    {"quiz_id": quiz.id, "order": j, "text": f"Q{j}", "correct_answer": f"A{j}"}
+                    for j in range(10)
+                ],
+            )
+            quiz_ids.append(quiz.id)
+        db.commit()
+        return quiz_ids
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(database_url: str, async_db: bool, app: str = "app.main:app"):
+    port = _free_port()
+    env = dict(os.environ, DATABASE_URL=database_url, ASYNC_DB="true" if async_db else "false")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/quizzes?limit=1").status_code == 200:
+                return proc, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not come up")
+
+
+async def load(base_url: str, quiz_ids: list[int], total: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker(client):
+        nonlocal errors
+        for i in counter:
+            path = "/api/quizzes" if i % 2 else f"/api/quizzes/{quiz_ids[i % len(quiz_ids)]}"
+            start = time.perf_counter()
+            resp = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            errors += resp.status_code != 200
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pct = lambda p: 1000 * latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+    return {
+        "rps": total / elapsed,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sync vs async stack throughput")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    quiz_ids = seed(database_url)
+
+    print(f"{'stack':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, async_db in (("sync", False), ("async", True)):
+        proc, base_url = start_server(database_url, async_db)
+        try:
+            r = asyncio.run(load(base_url, quiz_ids, args.requests, args.concurrency))
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(
+            f"{name:<6} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+            f"{r['p99_ms']:>8.1f} {r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,10 @@ if [ ! -f ".env" ]; then
     echo "⚠️ No .env file found. Please create one with your Firebase credentials and DB URL."
 fi
 
+# Create missing tables, columns and indexes (the server doesn't)
+echo "🗄️ Bringing the database schema up to date..."
+python -m app.cli init-db || exit 1
+
 # Run FastAPI server
 echo "🚀 Starting FastAPI server..."
 uvicorn app.main:app --reload --host 127.0.0.1 --port 8000
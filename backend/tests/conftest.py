@@ -1,29 +1,51 @@
 # tests/conftest.py
 
+import os
+import tempfile
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
 from app.models import models as models_module
 from app.core import auth as auth_module
+from app.core.config import settings
+from app.core.database import to_async_url
+from app.core.response_cache import MemoryBackend, response_cache
+from app.services import regrade as regrade_module
+from app.services.answer_keys import answer_key_cache
+from app.services.leaderboard import leaderboard_cache
 
 # -------------------------------------------------------------------
 # Test Database: shared in-memory SQLite
 # -------------------------------------------------------------------
 # StaticPool + "sqlite://" (no /:memory:) ensures all sessions share
 # the same in-memory database, so tables persist across connections.
+#
+# With ASYNC_DB=true the app runs on aiosqlite, which can't share an
+# in-memory database with the sync engine the fixtures use, so both
+# engines point at one temporary SQLite file instead.
 # -------------------------------------------------------------------
 
-TEST_DATABASE_URL = "sqlite://"
-
-engine = create_engine(
-    TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+if settings.ASYNC_DB:
+    _tmp_dir = tempfile.mkdtemp(prefix="quickquiz-tests-")
+    TEST_DATABASE_URL = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+    )
+else:
+    TEST_DATABASE_URL = "sqlite://"
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
 
 TestingSessionLocal = sessionmaker(
     autocommit=False,
@@ -51,39 +73,74 @@ def override_get_db():
 
 
 def get_or_create_test_user(db, uid: str = "test-user", name: str = "Test User"):
-    user = db.query(models_module.User).filter(models_module.User.id == uid).first()
+    user = (
+        db.query(models_module.User)
+        .filter(models_module.User.firebase_uid == uid)
+        .first()
+    )
     if not user:
-        user = models_module.User(id=uid, name=name)
+        user = models_module.User(
+            firebase_uid=uid,
+            email=f"{uid}@test.local",
+            display_name=name,
+        )
         db.add(user)
         db.commit()
         db.refresh(user)
     return user
 
 
+# Like the verified-token cache in production, the override resolves the
+# test user once per test and then serves a detached copy without touching
+# the database, so query budgets only count the endpoint's own statements.
+_test_user_snapshot = {}
+
+
+def _cached_test_user():
+    if not _test_user_snapshot:
+        db = TestingSessionLocal()
+        try:
+            _test_user_snapshot.update(auth_module._user_snapshot(get_or_create_test_user(db)))
+        finally:
+            db.close()
+    return auth_module._detached_user(dict(_test_user_snapshot))
+
+
 def override_get_current_user():
     # Always behave as an authenticated test user
-    db = TestingSessionLocal()
-    try:
-        return get_or_create_test_user(db)
-    finally:
-        db.close()
+    return _cached_test_user()
 
 
 def override_get_optional_user():
     # For endpoints where auth is optional, still return the test user so
     # tests can easily exercise "logged in" flows.
-    db = TestingSessionLocal()
-    try:
-        return get_or_create_test_user(db)
-    finally:
-        db.close()
+    return _cached_test_user()
 
 
+# Run the suite with the response cache on, so every test also checks
+# that writes invalidate what they should.
+response_cache.backend = MemoryBackend()
+
+# Background regrades open their own sessions
+regrade_module.session_factory = TestingSessionLocal
+
 # Wire overrides into the FastAPI app
 app.dependency_overrides[auth_module.get_db] = override_get_db
 app.dependency_overrides[auth_module.get_current_user] = override_get_current_user
 app.dependency_overrides[auth_module.get_optional_user] = override_get_optional_user
 
+if settings.ASYNC_DB:
+    async_engine = create_async_engine(to_async_url(TEST_DATABASE_URL), poolclass=NullPool)
+    TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[auth_module.get_async_db] = override_get_async_db
+    app.dependency_overrides[auth_module.get_current_user_async] = override_get_current_user
+    app.dependency_overrides[auth_module.get_optional_user_async] = override_get_optional_user
+
 
 # -------------------------------------------------------------------
 # Fixtures
@@ -99,6 +156,13 @@ def reset_db():
     """
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    _test_user_snapshot.clear()
+    auth_module.token_cache.clear()
+    auth_module.user_cache.clear()
+    answer_key_cache.clear()
+    leaderboard_cache.clear()
+    response_cache.backend.clear()
+    response_cache.reset_stats()
     yield
 
 
@@ -109,3 +173,46 @@ def client():
     """
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture
+def db():
+    """
+    A session on the shared test database, for tests that call
+    dependencies or helpers directly instead of going through HTTP.
+    """
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Context manager that records the SQL statements executed against the
+    test database while it is open:
+
+        with count_queries() as queries:
+            client.get(...)
+        assert len(queries) <= 2, queries
+    """
+    engines = [engine] + ([async_engine.sync_engine] if settings.ASYNC_DB else [])
+
+    @contextmanager
+    def capture():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        for e in engines:
+            event.listen(e, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            for e in engines:
+                event.remove(e, "before_cursor_execute", record)
+
+    return capture
@@ -0,0 +1,88 @@
+from app.models.models import Question, Quiz
+from app.services.answer_keys import answer_key_cache
+
+
+def _create_quiz(client, answer="Paris"):
+    payload = {
+        "title": "Capitals",
+        "description": "cache me",
+        "questions": [{"text": "Capital of France", "correct_answer": answer}],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _submit(client, quiz_id, answer):
+    question_id = client.get(f"/api/quizzes/{quiz_id}").json()["questions"][0]["id"]
+    resp = client.post(
+        f"/api/quizzes/{quiz_id}/submit",
+        json={"answers": [{"question_id": question_id, "answer": answer}]},
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_repeat_submissions_hit_the_cache(client):
+    quiz_id = _create_quiz(client)
+
+    _submit(client, quiz_id, "paris")
+    misses = answer_key_cache.stats()["misses"]
+    assert _submit(client, quiz_id, "paris")["score"] == 1
+
+    stats = answer_key_cache.stats()
+    assert stats["misses"] == misses
+    assert stats["hits"] >= 2
+
+
+def test_cache_stats_are_exported_as_metrics(client):
+    quiz_id = _create_quiz(client)
+    _submit(client, quiz_id, "paris")
+
+    stats = answer_key_cache.stats()
+    body = client.get("/metrics").text
+    assert "# TYPE quickquiz_answer_key_cache_hits_total counter" in body
+    assert f"quickquiz_answer_key_cache_hits_total {stats['hits']}" in body
+    assert f"quickquiz_answer_key_cache_misses_total {stats['misses']}" in body
+    assert f"quickquiz_answer_key_cache_size {stats['size']}" in body
+
+
+def test_update_invalidates_cached_key(client):
+    quiz_id = _create_quiz(client, answer="Lyon")
+    assert _submit(client, quiz_id, "paris")["score"] == 0
+
+    resp = client.put(
+        f"/api/quizzes/{quiz_id}",
+        json={
+            "title": "Capitals",
+            "description": "cache me",
+            "questions": [{"text": "Capital of France", "correct_answer": "Paris"}],
+        },
+    )
+    assert resp.status_code == 200
+    assert _submit(client, quiz_id, "paris")["score"] == 1
+
+
+def test_edit_from_another_worker_is_seen_through_version(client, db):
+    quiz_id = _create_quiz(client, answer="Lyon")
+    _submit(client, quiz_id, "paris")
+    assert answer_key_cache.stats()["size"] == 1
+
+    # Another process edits the quiz: this worker's cache is untouched,
+    # only the version column in the database moves.
+    db.query(Question).filter(Question.quiz_id == quiz_id).update({"correct_answer": "Paris"})
+    db.query(Quiz).filter(Quiz.id == quiz_id).update({"version": Quiz.version + 1})
+    db.commit()
+
+    assert _submit(client, quiz_id, "paris")["score"] == 1
+
+
+def test_delete_drops_cached_key(client):
+    quiz_id = _create_quiz(client)
+    _submit(client, quiz_id, "paris")
+
+    assert client.delete(f"/api/quizzes/{quiz_id}").status_code == 204
+    assert answer_key_cache.stats()["size"] == 0
+
+    resp = client.post(f"/api/quizzes/{quiz_id}/submit", json={"answers": []})
+    assert resp.status_code == 404
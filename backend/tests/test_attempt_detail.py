@@ -0,0 +1,57 @@
+from app.models.models import Attempt, User
+from app.services.attempts import backfill_attempt_answers
+
+
+def _create_quiz(client):
+    payload = {
+        "title": "Legacy",
+        "description": "",
+        "questions": [
+            {"text": "Q1", "correct_answer": "A1"},
+            {"text": "Q2", "correct_answer": "A2"},
+            {"text": "Q3", "correct_answer": "A3"},
+        ],
+    }
+    quiz_id = client.post("/api/quizzes", json=payload).json()["id"]
+    return quiz_id, [q["id"] for q in client.get(f"/api/quizzes/{quiz_id}").json()["questions"]]
+
+
+def _legacy_attempt(db, quiz_id, details):
+    user = db.query(User).first()
+    attempt = Attempt(quiz_id=quiz_id, user_id=user.id, score=1, total=3, details=details)
+    db.add(attempt)
+    db.commit()
+    return attempt.id
+
+
+def test_backfill_moves_legacy_details_into_answer_rows(client, db):
+    quiz_id, (q1, q2, q3) = _create_quiz(client)
+    # stored out of question order, plus an answer to a since-deleted question
+    attempt_id = _legacy_attempt(
+        db,
+        quiz_id,
+        [
+            {"question_id": q3, "user_answer": "a3", "is_correct": True},
+            {"question_id": q1, "user_answer": "x", "is_correct": False},
+            {"question_id": 99999, "user_answer": "gone", "is_correct": False},
+            {"question_id": q2, "user_answer": "y", "is_correct": False},
+        ],
+    )
+    assert client.get(f"/api/quizzes/attempts/{attempt_id}").json()["results"] == []
+
+    assert backfill_attempt_answers(db, write=False) == {"attempts": 1, "answers": 3, "skipped": 1}
+    assert client.get(f"/api/quizzes/attempts/{attempt_id}").json()["results"] == []
+
+    report = backfill_attempt_answers(db, batch_size=1)
+    assert report == {"attempts": 1, "answers": 3, "skipped": 1}
+
+    detail = client.get(f"/api/quizzes/attempts/{attempt_id}").json()
+    assert [r["question"] for r in detail["results"]] == ["Q1", "Q2", "Q3"]
+    assert [r["is_correct"] for r in detail["results"]] == [False, False, True]
+    assert detail["results"][2]["correct_answer"] == "A3"
+
+    assert backfill_attempt_answers(db)["answers"] == 0
+
+
+def test_attempt_detail_not_found(client):
+    assert client.get("/api/quizzes/attempts/424242").status_code == 404
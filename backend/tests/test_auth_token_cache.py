@@ -0,0 +1,197 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core import auth as auth_module
+from app.core.token_cache import TokenCache
+from app.models.models import Base, User
+
+# -------------------------------------------------------------------
+# Local fake verifier: RS256 JWTs checked against a static key set,
+# so the real dependency code runs without ever reaching Google.
+# -------------------------------------------------------------------
+
+AUDIENCE = "quickquiz-test"
+_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+STATIC_KEYS = {"test-kid": _private_key.public_key()}
+
+
+def _sign(uid, email, exp_in=3600, name="Token User", iat_offset=0):
+    now = int(time.time())
+    claims = {
+        "sub": uid,
+        "aud": AUDIENCE,
+        "iat": now + iat_offset,
+        "exp": now + exp_in,
+        "email": email,
+        "name": name,
+    }
+    return jwt.encode(claims, _private_key, algorithm="RS256", headers={"kid": "test-kid"})
+
+
+class StaticKeyVerifier:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, token):
+        self.calls += 1
+        kid = jwt.get_unverified_header(token)["kid"]
+        decoded = jwt.decode(token, STATIC_KEYS[kid], algorithms=["RS256"], audience=AUDIENCE)
+        decoded["uid"] = decoded["sub"]
+        return decoded
+
+
+@pytest.fixture
+def verifier():
+    v = StaticKeyVerifier()
+    original = auth_module._token_verifier
+    auth_module.set_token_verifier(v)
+    yield v
+    auth_module.set_token_verifier(original)
+
+
+def _current_user(db, token):
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return auth_module.get_current_user(creds, db)
+
+
+def _statements(db, fn):
+    engine = db.get_bind()
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, statements
+
+
+def test_repeat_token_skips_verification_and_user_select(verifier, db):
+    token = _sign("uid-1", "one@example.com")
+
+    first = _current_user(db, token)
+    second, statements = _statements(db, lambda: _current_user(db, token))
+
+    assert verifier.calls == 1
+    assert statements == []
+    assert second.id == first.id
+    assert second.email == "one@example.com"
+    assert auth_module.token_cache.stats()["hits"] == 1
+
+
+def test_invalid_signature_is_rejected_and_not_cached(verifier, db):
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    forged = jwt.encode(
+        {"sub": "uid-2", "aud": AUDIENCE, "exp": int(time.time()) + 60},
+        other_key,
+        algorithm="RS256",
+        headers={"kid": "test-kid"},
+    )
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            _current_user(db, forged)
+        assert exc.value.status_code == 401
+
+    assert verifier.calls == 2
+    assert auth_module.token_cache.stats()["size"] == 0
+
+
+def test_token_cache_evicts_at_exp_and_by_size():
+    now = [1000.0]
+    cache = TokenCache(max_size=2, max_ttl=300, clock=lambda: now[0])
+
+    cache.put("a", {"exp": 1010}, {"id": 1})
+    assert cache.get("a") is not None
+    now[0] = 1010.0
+    assert cache.get("a") is None
+
+    cache.put("b", {"exp": 2000}, {"id": 2})
+    cache.put("c", {"exp": 2000}, {"id": 3})
+    cache.put("d", {"exp": 2000}, {"id": 4})
+    assert cache.get("b") is None
+    assert cache.get("d").user == {"id": 4}
+    assert cache.stats()["evictions"] == 2
+
+
+# -------------------------------------------------------------------
+# User upsert + identity cache
+# -------------------------------------------------------------------
+
+def test_new_user_costs_one_statement_and_new_tokens_none(verifier, db):
+    user, statements = _statements(db, lambda: _current_user(db, _sign("uid-new", "new@example.com")))
+
+    assert len(statements) == 1
+    assert "ON CONFLICT" in statements[0]
+    assert db.query(User).filter(User.firebase_uid == "uid-new").one().id == user.id
+
+    # a refreshed ID token for the same profile: verified, but no statement
+    refreshed = _sign("uid-new", "new@example.com", iat_offset=-1)
+    again, statements = _statements(db, lambda: _current_user(db, refreshed))
+    assert verifier.calls == 2
+    assert statements == []
+    assert again.id == user.id
+    assert auth_module.user_cache.stats()["hits"] == 1
+
+
+def test_changed_profile_claims_update_the_user(verifier, db):
+    first = _current_user(db, _sign("uid-3", "three@example.com", name="Old Name"))
+
+    renamed, statements = _statements(
+        db, lambda: _current_user(db, _sign("uid-3", "three@example.com", name="New Name"))
+    )
+
+    assert len(statements) == 1
+    assert renamed.id == first.id
+    assert renamed.display_name == "New Name"
+    db.expire_all()
+    assert db.get(User, first.id).display_name == "New Name"
+    assert db.query(User).count() == 1
+
+
+def test_new_uid_for_existing_email_keeps_the_account(verifier, db):
+    db.add(User(firebase_uid="old-uid", email="same@example.com", display_name="Same"))
+    db.commit()
+    existing_id = db.query(User.id).filter(User.email == "same@example.com").scalar()
+
+    user = _current_user(db, _sign("new-uid", "same@example.com"))
+
+    assert user.id == existing_id
+    assert user.firebase_uid == "new-uid"
+    assert db.query(User).count() == 1
+
+
+def test_concurrent_first_requests_resolve_to_one_user(verifier, tmp_path):
+    # a file database, so every thread gets its own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(bind=engine)
+    tokens = [_sign("uid-tabs", "tabs@example.com", iat_offset=-i) for i in range(8)]
+    barrier = threading.Barrier(len(tokens))
+
+    def first_request(token):
+        db = sessions()
+        try:
+            barrier.wait()
+            return _current_user(db, token).id
+        finally:
+            db.close()
+
+    try:
+        with ThreadPoolExecutor(len(tokens)) as pool:
+            ids = list(pool.map(first_request, tokens))
+        with sessions() as db:
+            assert db.query(User).count() == 1
+    finally:
+        engine.dispose()
+
+    assert len(set(ids)) == 1
@@ -0,0 +1,52 @@
+from sqlalchemy import text
+
+from app.core import database
+from app.core.config import settings
+
+
+def test_sqlite_file_engine_applies_pragmas_and_tracks_checkouts(tmp_path):
+    stats = database.PoolStats()
+    engine = database.build_engine(f"sqlite:///{tmp_path / 'pragmas.db'}", stats=stats)
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            busy = conn.execute(text("PRAGMA busy_timeout")).scalar()
+            assert busy == settings.SQLITE_BUSY_TIMEOUT_MS
+            assert stats.snapshot()["checked_out"] == 1
+
+        with engine.connect():
+            pass
+
+        snapshot = stats.snapshot()
+        assert snapshot["checkouts"] == 2
+        assert snapshot["checked_out"] == 0
+        assert snapshot["pool_size"] == settings.DB_POOL_SIZE
+    finally:
+        engine.dispose()
+
+
+def test_postgres_options_come_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 5)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 1500)
+
+    sync_opts = database.engine_options("postgresql+psycopg2://u:p@db/quickquiz")
+    assert sync_opts["pool_size"] == 20
+    assert sync_opts["max_overflow"] == 5
+    assert sync_opts["pool_pre_ping"] is settings.DB_POOL_PRE_PING
+    assert sync_opts["connect_args"] == {"options": "-c statement_timeout=1500"}
+
+    async_opts = database.engine_options("postgresql+asyncpg://u:p@db/quickquiz", is_async=True)
+    assert async_opts["connect_args"] == {"server_settings": {"statement_timeout": "1500"}}
+
+
+def test_in_memory_sqlite_skips_pool_sizing():
+    opts = database.engine_options("sqlite://")
+    assert "pool_size" not in opts
+    assert opts["connect_args"]["check_same_thread"] is False
+
+
+def test_async_url_swaps_driver():
+    assert database.to_async_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    assert database.to_async_url("postgresql+psycopg2://u:p@h/d") == "postgresql+asyncpg://u:p@h/d"
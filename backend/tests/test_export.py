@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+
+from app.models.models import Attempt, Quiz, User
+from app.services.export import COLUMNS
+
+
+def _create_quiz(client):
+    payload = {
+        "title": "Export Quiz",
+        "description": "",
+        "questions": [
+            {"text": "Q1", "correct_answer": "A1"},
+            {"text": "Q2, with a comma", "correct_answer": "A2"},
+        ],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _submit(client, quiz_id, *answers):
+    questions = client.get(f"/api/quizzes/{quiz_id}").json()["questions"]
+    resp = client.post(
+        f"/api/quizzes/{quiz_id}/submit",
+        json={
+            "answers": [
+                {"question_id": q["id"], "answer": a} for q, a in zip(questions, answers)
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    return resp.json()["attempt_id"]
+
+
+def test_export_csv_has_one_row_per_answer(client):
+    quiz_id = _create_quiz(client)
+    first = _submit(client, quiz_id, "a1", 'say "hi"')
+    second = _submit(client, quiz_id, "no", "A2")
+
+    resp = client.get(f"/api/quizzes/{quiz_id}/attempts/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert f"quiz-{quiz_id}-attempts.csv" in resp.headers["content-disposition"]
+
+    rows = list(csv.reader(io.StringIO(resp.text)))
+    assert tuple(rows[0]) == COLUMNS
+    body = [dict(zip(COLUMNS, r)) for r in rows[1:]]
+    assert [(r["attempt_id"], r["question_order"]) for r in body] == [
+        (str(first), "0"), (str(first), "1"), (str(second), "0"), (str(second), "1"),
+    ]
+    assert body[1]["question"] == "Q2, with a comma"
+    assert body[1]["answer"] == 'say "hi"'
+    assert [r["is_correct"] for r in body] == ["True", "False", "False", "True"]
+
+
+def test_export_ndjson(client):
+    quiz_id = _create_quiz(client)
+    attempt_id = _submit(client, quiz_id, "a1", "a2")
+
+    resp = client.get(f"/api/quizzes/{quiz_id}/attempts/export?format=ndjson")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["attempt_id"] == attempt_id
+    assert lines[0]["score"] == 2 and lines[0]["is_correct"] is True
+    assert lines[0]["user_name"] == "Test User"
+    assert "user_email" not in lines[0]
+
+
+def test_export_csv_neutralizes_formulas(client):
+    quiz_id = client.post(
+        "/api/quizzes",
+        json={
+            "title": "Formulas",
+            "description": "",
+            "questions": [{"text": "=HYPERLINK(\"http://x\")", "correct_answer": "@SUM(A1)"}],
+        },
+    ).json()["id"]
+    _submit(client, quiz_id, "+cmd|' /C calc'!A0")
+
+    csv_rows = list(csv.reader(io.StringIO(client.get(f"/api/quizzes/{quiz_id}/attempts/export").text)))
+    row = dict(zip(COLUMNS, csv_rows[1]))
+    assert row["question"] == "'=HYPERLINK(\"http://x\")"
+    assert row["correct_answer"] == "'@SUM(A1)"
+    assert row["answer"] == "'+cmd|' /C calc'!A0"
+
+    ndjson = client.get(f"/api/quizzes/{quiz_id}/attempts/export?format=ndjson").text
+    assert json.loads(ndjson)["answer"] == "+cmd|' /C calc'!A0"
+
+
+def test_export_keeps_attempts_without_answer_rows(client, db):
+    quiz_id = _create_quiz(client)
+    answered = _submit(client, quiz_id, "a1", "a2")
+    user = db.query(User).one()
+    legacy = Attempt(quiz_id=quiz_id, user_id=user.id, score=1, total=2, details=[{"question_id": 1}])
+    db.add(legacy)
+    db.commit()
+
+    rows = list(csv.reader(io.StringIO(client.get(f"/api/quizzes/{quiz_id}/attempts/export").text)))
+    body = [dict(zip(COLUMNS, r)) for r in rows[1:]]
+    assert [r["attempt_id"] for r in body] == [str(answered), str(answered), str(legacy.id)]
+    assert (body[2]["score"], body[2]["question_id"], body[2]["answer"], body[2]["is_correct"]) == ("1", "", "", "")
+
+
+def test_export_empty_quiz_is_just_the_header(client):
+    quiz_id = _create_quiz(client)
+    resp = client.get(f"/api/quizzes/{quiz_id}/attempts/export")
+    assert resp.text.splitlines() == [",".join(COLUMNS)]
+
+
+def test_export_is_creator_only_and_validates_format(client, db):
+    quiz_id = _create_quiz(client)
+    assert client.get(f"/api/quizzes/{quiz_id}/attempts/export?format=xml").status_code == 400
+    assert client.get("/api/quizzes/12345/attempts/export").status_code == 404
+
+    db.query(Quiz).filter(Quiz.id == quiz_id).update({"creator_id": 999})
+    db.commit()
+    assert client.get(f"/api/quizzes/{quiz_id}/attempts/export").status_code == 403
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.schemas.quizzes import AttemptDetail, QuizDetail, QuizPage, SubmitResult
+
+
+# ---------------------------------------------------------------------------
+# FAST_RESPONSES: routes that skip response_model re-validation must send
+# exactly what the validated path sends.
+# ---------------------------------------------------------------------------
+
+QUESTIONS = [
+    {"text": "Capital of France?", "correct_answer": "Paris"},
+    {
+        "text": "Pi to two decimals?",
+        "correct_answer": "3.14",
+        "match_mode": "numeric",
+        "match_options": {"tolerance": 0.01},
+    },
+    {
+        "text": "A primary colour?",
+        "correct_answer": "red",
+        "match_mode": "any_of",
+        "match_options": {"alternatives": ["blue", "yellow"]},
+    },
+]
+
+
+@pytest.fixture
+def both_modes(monkeypatch):
+    """Call `fn` with FAST_RESPONSES off, then on; returns both responses."""
+
+    def call(fn):
+        monkeypatch.setattr(settings, "FAST_RESPONSES", False)
+        standard = fn()
+        monkeypatch.setattr(settings, "FAST_RESPONSES", True)
+        fast = fn()
+        return standard, fast
+
+    return call
+
+
+def _create_quiz(client) -> int:
+    res = client.post(
+        "/api/quizzes",
+        json={"title": "Fast quiz", "description": "d", "questions": QUESTIONS},
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+def _submit(client, quiz_id: int):
+    questions = client.get(f"/api/quizzes/{quiz_id}").json()["questions"]
+    answers = ["paris", "3.141", "green"]
+    return client.post(
+        f"/api/quizzes/{quiz_id}/submit",
+        json={"answers": [{"question_id": q["id"], "answer": a} for q, a in zip(questions, answers)]},
+    )
+
+
+def _assert_same(standard, fast, model=None):
+    assert standard.status_code == fast.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == standard.json()
+    if model is not None:
+        # already in the model's exact shape: validating changes nothing
+        assert model.model_validate(fast.json()).model_dump(mode="json") == fast.json()
+
+
+def test_quiz_detail_matches_and_keeps_cache_headers(client, both_modes):
+    quiz_id = _create_quiz(client)
+
+    standard, fast = both_modes(lambda: client.get(f"/api/quizzes/{quiz_id}"))
+
+    _assert_same(standard, fast, QuizDetail)
+    assert fast.json()["questions"][1]["match_options"] == {
+        "tolerance": 0.01,
+        "alternatives": None,
+        "max_distance": None,
+    }
+    for header in ("etag", "cache-control", "vary"):
+        assert fast.headers.get(header) == standard.headers.get(header)
+
+    again = client.get(f"/api/quizzes/{quiz_id}", headers={"If-None-Match": fast.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_list_and_search_match(client, both_modes):
+    _create_quiz(client)
+
+    _assert_same(*both_modes(lambda: client.get("/api/quizzes")), QuizPage)
+    _assert_same(*both_modes(lambda: client.get("/api/quizzes/search", params={"q": "fast"})), QuizPage)
+
+
+def test_submit_result_matches(client, both_modes):
+    quiz_id = _create_quiz(client)
+
+    standard, fast = both_modes(lambda: _submit(client, quiz_id))
+
+    assert fast.json()["attempt_id"] == standard.json()["attempt_id"] + 1
+    fast_body = {**fast.json(), "attempt_id": standard.json()["attempt_id"]}
+    assert fast_body == standard.json()
+    assert fast.json()["score"] == 2
+    assert SubmitResult.model_validate(fast.json()).model_dump(mode="json") == fast.json()
+
+
+def test_attempt_views_match(client, both_modes):
+    quiz_id = _create_quiz(client)
+    attempt_id = _submit(client, quiz_id).json()["attempt_id"]
+
+    _assert_same(*both_modes(lambda: client.get(f"/api/quizzes/attempts/{attempt_id}")), AttemptDetail)
+    _assert_same(*both_modes(lambda: client.get(f"/api/quizzes/{quiz_id}/my-latest-attempt")))
+    _assert_same(*both_modes(lambda: client.get("/api/quizzes/my-latest-attempts", params={"ids": f"{quiz_id},999"})))
+    _assert_same(*both_modes(lambda: client.get("/api/quizzes/my-results")))
+
+
+def test_ndjson_export_matches(client, both_modes):
+    quiz_id = _create_quiz(client)
+    _submit(client, quiz_id)
+
+    standard, fast = both_modes(
+        lambda: client.get(f"/api/quizzes/{quiz_id}/attempts/export", params={"format": "ndjson"})
+    )
+    assert standard.status_code == fast.status_code == 200
+    assert [json.loads(line) for line in fast.text.splitlines()] == [
+        json.loads(line) for line in standard.text.splitlines()
+    ]
+
+
+def test_openapi_schema_is_unchanged(client, both_modes):
+    def fresh_schema():
+        app.openapi_schema = None  # rebuilt from the routes on the next request
+        return client.get("/openapi.json")
+
+    standard, fast = both_modes(fresh_schema)
+    assert fast.json() == standard.json()
+
+    responses = fast.json()["paths"]["/api/quizzes/{quiz_id}"]["get"]["responses"]
+    assert responses["200"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/QuizDetail"
+    }
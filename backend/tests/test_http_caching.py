@@ -0,0 +1,104 @@
+from contextlib import contextmanager
+
+from app.core import auth as auth_module
+from app.main import app
+
+
+def _create_quiz(client, title="Cached Quiz"):
+    payload = {
+        "title": title,
+        "description": "etag me",
+        "questions": [{"text": "Q1", "correct_answer": "A1"}],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+@contextmanager
+def _as_anonymous():
+    """Serve optional-auth routes as an anonymous visitor."""
+    deps = (auth_module.get_optional_user, auth_module.get_optional_user_async)
+    previous = {dep: app.dependency_overrides.get(dep) for dep in deps}
+    for dep in deps:
+        app.dependency_overrides[dep] = lambda: None
+    try:
+        yield
+    finally:
+        for dep, override in previous.items():
+            if override is None:
+                app.dependency_overrides.pop(dep, None)
+            else:
+                app.dependency_overrides[dep] = override
+
+
+def test_quiz_detail_revalidates_with_304(client):
+    quiz_id = _create_quiz(client)
+
+    first = client.get(f"/api/quizzes/{quiz_id}")
+    etag = first.headers["etag"]
+    assert "Authorization" in first.headers["vary"]
+
+    second = client.get(f"/api/quizzes/{quiz_id}", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_quiz_detail_etag_changes_after_edit(client):
+    quiz_id = _create_quiz(client)
+    etag = client.get(f"/api/quizzes/{quiz_id}").headers["etag"]
+
+    client.put(
+        f"/api/quizzes/{quiz_id}",
+        json={
+            "title": "Cached Quiz",
+            "description": "etag me",
+            "questions": [{"text": "Q1", "correct_answer": "A2"}],
+        },
+    )
+
+    resp = client.get(f"/api/quizzes/{quiz_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert resp.json()["questions"][0]["correct_answer"] == "A2"
+
+
+def test_creator_and_anonymous_views_never_share_cache_entries(client):
+    quiz_id = _create_quiz(client)
+
+    with _as_anonymous():
+        anon = client.get(f"/api/quizzes/{quiz_id}")
+    assert anon.headers["cache-control"].startswith("public")
+    assert anon.json()["questions"][0]["correct_answer"] is None
+
+    creator = client.get(
+        f"/api/quizzes/{quiz_id}", headers={"If-None-Match": anon.headers["etag"]}
+    )
+    assert creator.status_code == 200
+    assert creator.headers["etag"] != anon.headers["etag"]
+    assert creator.headers["cache-control"] == "private, no-cache"
+    assert creator.json()["questions"][0]["correct_answer"] == "A1"
+
+    with _as_anonymous():
+        resp = client.get(
+            f"/api/quizzes/{quiz_id}", headers={"If-None-Match": creator.headers["etag"]}
+        )
+    assert resp.status_code == 200
+    assert resp.json()["questions"][0]["correct_answer"] is None
+
+
+def test_public_listing_is_cacheable_and_conditional(client):
+    _create_quiz(client)
+
+    first = client.get("/api/quizzes")
+    assert first.headers["cache-control"].startswith("public, max-age=")
+    assert "Authorization" in first.headers["vary"]
+
+    second = client.get("/api/quizzes", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+
+    _create_quiz(client, "Another")
+    third = client.get("/api/quizzes", headers={"If-None-Match": first.headers["etag"]})
+    assert third.status_code == 200
+    assert len(third.json()["items"]) == 2
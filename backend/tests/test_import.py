@@ -0,0 +1,103 @@
+import io
+import json
+
+from app.core.config import settings
+from app.services.quiz_import import new_report, read_batches
+
+
+def _ndjson(*records):
+    return "\n".join(r if isinstance(r, str) else json.dumps(r) for r in records) + "\n"
+
+
+def _quiz(title, n=2):
+    return {
+        "title": title,
+        "description": "imported",
+        "questions": [{"text": f"Q{i}", "correct_answer": f"A{i}"} for i in range(n)],
+    }
+
+
+def test_import_ndjson_reports_bad_records(client, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    body = _ndjson(
+        _quiz("One"),
+        _quiz("Two"),
+        "",
+        "{not json",
+        _quiz("Too many", n=11),
+        {"title": " ", "questions": [{"text": "Q", "correct_answer": "A"}]},
+        _quiz("Three", n=10),
+    )
+    resp = client.post(
+        "/api/quizzes/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["imported"], report["failed"]) == (3, 3)
+    assert [e["line"] for e in report["errors"]] == [4, 5, 6]
+    assert report["errors"][0]["error"].startswith("Invalid JSON")
+    assert report["errors"][1]["title"] == "Too many"
+    assert report["errors"][2]["error"] == "Title is required"
+
+    mine = client.get("/api/quizzes/my").json()
+    assert sorted(q["title"] for q in mine) == ["One", "Three", "Two"]
+    three = next(q for q in mine if q["title"] == "Three")
+    assert len(client.get(f"/api/quizzes/{three['id']}").json()["questions"]) == 10
+    assert client.get("/api/quizzes/search?q=three").json()["items"][0]["id"] == three["id"]
+
+
+def test_import_csv_groups_rows_into_quizzes(client):
+    body = (
+        "quiz,title,description,question,correct_answer,match_mode,tolerance,alternatives\n"
+        "1,Capitals,Europe,France?,Paris,folded,,\n"
+        '1,Capitals,Europe,"Spain, really?",Madrid,,,\n'
+        "2,Numbers,,Pi?,3.14,numeric,0.01,\n"
+        "3,Oceans,,Largest?,Pacific,any_of,,Pacific Ocean|The Pacific\n"
+        "4,Broken,,Half?,abc,numeric,,\n"
+    )
+    resp = client.post("/api/quizzes/import?format=csv", content=body)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["imported"], report["failed"]) == (3, 1)
+    assert report["errors"][0]["line"] == 6
+
+    by_title = {q["title"]: q["id"] for q in client.get("/api/quizzes/my").json()}
+    capitals = client.get(f"/api/quizzes/{by_title['Capitals']}").json()
+    assert [q["text"] for q in capitals["questions"]] == ["France?", "Spain, really?"]
+    assert capitals["questions"][0]["match_mode"] == "folded"
+    oceans = client.get(f"/api/quizzes/{by_title['Oceans']}").json()["questions"][0]
+    assert oceans["match_options"]["alternatives"] == ["Pacific Ocean", "The Pacific"]
+
+
+def test_import_rejects_unreadable_uploads(client, monkeypatch):
+    resp = client.post("/api/quizzes/import", content="x", headers={"Content-Type": "text/plain"})
+    assert resp.status_code == 400
+
+    resp = client.post("/api/quizzes/import?format=csv", content="title,answer\nA,B\n")
+    assert resp.status_code == 400
+    assert "question" in resp.json()["detail"]
+
+    # a field over the csv module's size limit is malformed CSV, not a server error
+    resp = client.post(
+        "/api/quizzes/import?format=csv",
+        content='title,question,correct_answer\nT,"' + "x" * 200_000 + '",A\n',
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"].startswith("Invalid CSV at line 2")
+
+    monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 10)
+    resp = client.post("/api/quizzes/import?format=ndjson", content=_ndjson(_quiz("Big")))
+    assert resp.status_code == 413
+
+
+def test_read_batches_validates_without_a_session():
+    upload = io.BytesIO(_ndjson(_quiz("One"), "{not json", _quiz("Two"), _quiz("Three")).encode())
+    report = new_report()
+
+    batches = list(read_batches(upload, "ndjson", report, batch_size=2))
+
+    assert [[title for title, _, _ in batch] for batch in batches] == [["One", "Two"], ["Three"]]
+    assert (report["imported"], report["failed"]) == (0, 1)
+    assert report["errors"][0]["line"] == 2
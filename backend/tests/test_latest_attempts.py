@@ -0,0 +1,69 @@
+from app.models.models import Attempt, LatestAttempt
+from app.services.attempts import backfill_latest_attempts
+
+
+def _create_quiz(client, title="Latest Quiz"):
+    payload = {
+        "title": title,
+        "description": "latest attempt",
+        "questions": [{"text": "Q1", "correct_answer": "A1"}],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _submit(client, quiz_id, answer):
+    question_id = client.get(f"/api/quizzes/{quiz_id}").json()["questions"][0]["id"]
+    resp = client.post(
+        f"/api/quizzes/{quiz_id}/submit",
+        json={"answers": [{"question_id": question_id, "answer": answer}]},
+    )
+    assert resp.status_code == 200
+    return resp.json()["attempt_id"]
+
+
+def test_latest_attempt_tracks_newest_submission(client):
+    quiz_id = _create_quiz(client)
+    assert client.get(f"/api/quizzes/{quiz_id}/my-latest-attempt").json() == {"attempted": False}
+
+    _submit(client, quiz_id, "wrong")
+    second = _submit(client, quiz_id, "a1")
+
+    latest = client.get(f"/api/quizzes/{quiz_id}/my-latest-attempt").json()
+    assert latest["attempted"] is True
+    assert latest["attempt_id"] == second
+    assert (latest["score"], latest["total"]) == (1, 1)
+
+
+def test_batch_latest_attempts(client):
+    attempted = _create_quiz(client, "Attempted")
+    untouched = _create_quiz(client, "Untouched")
+    attempt_id = _submit(client, attempted, "a1")
+
+    resp = client.get("/api/quizzes/my-latest-attempts", params={"ids": f"{attempted},{untouched}"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body[str(attempted)]["attempt_id"] == attempt_id
+    assert body[str(untouched)] == {"attempted": False}
+
+    bad = client.get("/api/quizzes/my-latest-attempts", params={"ids": "1,x"})
+    assert bad.status_code == 400
+
+
+def test_backfill_fills_missing_summaries(client, db):
+    quiz_id = _create_quiz(client)
+    _submit(client, quiz_id, "wrong")
+    newest = _submit(client, quiz_id, "a1")
+
+    db.query(LatestAttempt).delete()
+    db.commit()
+    assert client.get(f"/api/quizzes/{quiz_id}/my-latest-attempt").json() == {"attempted": False}
+
+    assert backfill_latest_attempts(db) == 1
+    db.commit()
+    assert backfill_latest_attempts(db) == 0
+
+    latest = client.get(f"/api/quizzes/{quiz_id}/my-latest-attempt").json()
+    assert latest["attempt_id"] == newest
+    assert db.query(Attempt).count() == 2
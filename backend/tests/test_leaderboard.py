@@ -0,0 +1,198 @@
+from contextlib import contextmanager
+
+from sqlalchemy import select, update
+
+from app.core import auth as auth_module
+from app.core.config import settings
+from app.main import app
+from app.models.models import Attempt, BestAttempt, LeaderboardScore, Quiz, User
+from app.services.leaderboard import leaderboard_cache, rebuild_leaderboard, record_best_attempt
+
+QUESTIONS = [
+    {"text": "Capital of France?", "correct_answer": "Paris"},
+    {"text": "2 + 2?", "correct_answer": "4"},
+    {"text": "Largest ocean?", "correct_answer": "Pacific"},
+]
+RIGHT = ["Paris", "4", "Pacific"]
+
+
+def _create_quiz(client) -> dict:
+    quiz_id = client.post(
+        "/api/quizzes",
+        json={"title": "Ranked quiz", "description": "", "questions": QUESTIONS},
+    ).json()["id"]
+    question_ids = [q["id"] for q in client.get(f"/api/quizzes/{quiz_id}").json()["questions"]]
+    return {"id": quiz_id, "question_ids": question_ids}
+
+
+@contextmanager
+def _as_user(db, uid: str, name: str):
+    """Serve every route as the user `uid` instead of the default test user."""
+    user = db.execute(select(User).where(User.firebase_uid == uid)).scalar()
+    if user is None:
+        user = User(firebase_uid=uid, email=f"{uid}@test.local", display_name=name)
+        db.add(user)
+        db.commit()
+    snapshot = auth_module._user_snapshot(user)
+    deps = (
+        auth_module.get_current_user,
+        auth_module.get_current_user_async,
+        auth_module.get_optional_user,
+        auth_module.get_optional_user_async,
+    )
+    previous = {dep: app.dependency_overrides.get(dep) for dep in deps}
+    for dep in deps:
+        app.dependency_overrides[dep] = lambda: auth_module._detached_user(dict(snapshot))
+    try:
+        yield
+    finally:
+        for dep, override in previous.items():
+            if override is None:
+                app.dependency_overrides.pop(dep, None)
+            else:
+                app.dependency_overrides[dep] = override
+
+
+def _submit(client, quiz: dict, correct: int):
+    answers = RIGHT[:correct] + ["wrong"] * (len(RIGHT) - correct)
+    res = client.post(
+        f"/api/quizzes/{quiz['id']}/submit",
+        json={"answers": [{"question_id": q, "answer": a} for q, a in zip(quiz["question_ids"], answers)]},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _board(client, quiz: dict, **params) -> dict:
+    res = client.get(f"/api/quizzes/{quiz['id']}/leaderboard", params=params)
+    assert res.status_code == 200
+    return res.json()
+
+
+def _stored(db, quiz_id: int) -> tuple[list, list]:
+    best = db.execute(
+        select(BestAttempt.user_id, BestAttempt.attempt_id, BestAttempt.score)
+        .where(BestAttempt.quiz_id == quiz_id)
+        .order_by(BestAttempt.user_id)
+    ).all()
+    counts = db.execute(
+        select(LeaderboardScore.score, LeaderboardScore.users)
+        .where(LeaderboardScore.quiz_id == quiz_id, LeaderboardScore.users != 0)
+        .order_by(LeaderboardScore.score)
+    ).all()
+    return best, counts
+
+
+def test_best_attempt_per_user_ranked_with_shared_ties(client, db):
+    quiz = _create_quiz(client)
+    with _as_user(db, "ada", "Ada"):
+        _submit(client, quiz, 3)
+        _submit(client, quiz, 1)  # a worse retry keeps the best
+    with _as_user(db, "bob", "Bob"):
+        _submit(client, quiz, 2)
+    with _as_user(db, "cy", "Cy"):
+        _submit(client, quiz, 1)
+        _submit(client, quiz, 2)  # improves, but after Bob reached 2
+
+    board = _board(client, quiz)
+
+    assert board["participants"] == 3
+    assert [(e["rank"], e["display_name"], e["score"], e["total"]) for e in board["entries"]] == [
+        (1, "Ada", 3, 3),
+        (2, "Bob", 2, 3),
+        (2, "Cy", 2, 3),
+    ]
+    assert board["me"] is None  # the default test user has not played
+    with _as_user(db, "cy", "Cy"):
+        me = _board(client, quiz)["me"]
+    assert me["rank"] == 2 and me["score"] == 2
+
+
+def test_my_rank_beyond_the_cached_top(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "LEADERBOARD_SIZE", 2)
+    quiz = _create_quiz(client)
+    for i, correct in enumerate([3, 3, 2, 1]):
+        with _as_user(db, f"player-{i}", f"Player {i}"):
+            _submit(client, quiz, correct)
+
+    with _as_user(db, "player-3", "Player 3"):
+        board = _board(client, quiz, limit=10)
+
+    assert [e["display_name"] for e in board["entries"]] == ["Player 0", "Player 1"]
+    assert board["participants"] == 4
+    assert board["me"]["rank"] == 4
+
+
+def test_cached_board_is_refreshed_by_a_new_best(client, db):
+    quiz = _create_quiz(client)
+    with _as_user(db, "ada", "Ada"):
+        _submit(client, quiz, 2)
+
+    _board(client, quiz)
+    _board(client, quiz)
+    assert leaderboard_cache.stats()["hits"] == 1
+
+    with _as_user(db, "bob", "Bob"):
+        _submit(client, quiz, 3)
+    assert [e["display_name"] for e in _board(client, quiz)["entries"]] == ["Bob", "Ada"]
+
+
+def test_rebuild_matches_the_maintained_tables(client, db):
+    quiz = _create_quiz(client)
+    for uid, scores in {"ada": [1, 3, 2], "bob": [2], "cy": [0, 2]}.items():
+        with _as_user(db, uid, uid.title()):
+            for correct in scores:
+                _submit(client, quiz, correct)
+    maintained = _stored(db, quiz["id"])
+
+    rebuild_leaderboard(db, quiz_id=quiz["id"])
+    db.commit()
+
+    assert _stored(db, quiz["id"]) == maintained
+    assert [score for score, _ in maintained[1]] == [2, 3]
+
+
+def test_private_quiz_board_is_hidden_and_deleted_with_the_quiz(client, db):
+    quiz = _create_quiz(client)
+    _submit(client, quiz, 3)
+    db.execute(update(Quiz).where(Quiz.id == quiz["id"]).values(is_public=False))
+    db.commit()
+
+    assert _board(client, quiz)["entries"][0]["score"] == 3  # the creator still sees it
+    with _as_user(db, "ada", "Ada"):
+        assert client.get(f"/api/quizzes/{quiz['id']}/leaderboard").status_code == 404
+    assert client.get("/api/quizzes/999/leaderboard").status_code == 404
+
+    assert client.delete(f"/api/quizzes/{quiz['id']}").status_code == 204
+    assert _stored(db, quiz["id"]) == ([], [])
+    assert client.get(f"/api/quizzes/{quiz['id']}/leaderboard").status_code == 404
+
+
+def test_concurrent_first_submits_count_each_user_once(client, db, monkeypatch):
+    quiz = _create_quiz(client)
+    user = User(firebase_uid="ada", email="ada@test.local", display_name="Ada")
+    db.add(user)
+    db.commit()
+    slow, fast = (Attempt(quiz_id=quiz["id"], user_id=user.id, score=s, total=3) for s in (3, 1))
+    db.add_all([slow, fast])
+    db.flush()
+
+    # the slower submission reads "no best yet", then the faster one records its score first
+    execute = db.execute
+
+    def racing_execute(statement, *args, **kwargs):
+        result = execute(statement, *args, **kwargs)
+        monkeypatch.setattr(db, "execute", execute)
+        assert record_best_attempt(db, user.id, quiz["id"], fast, 1, 3)
+        return result
+
+    monkeypatch.setattr(db, "execute", racing_execute)
+    assert record_best_attempt(db, user.id, quiz["id"], slow, 3, 3)
+    db.commit()
+    maintained = _stored(db, quiz["id"])
+
+    rebuild_leaderboard(db, quiz_id=quiz["id"])
+    db.commit()
+
+    assert maintained == ([(user.id, slow.id, 3)], [(3, 1)])
+    assert _stored(db, quiz["id"]) == maintained
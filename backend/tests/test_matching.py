@@ -0,0 +1,108 @@
+import pytest
+
+from app.services.matching import compile_matcher, parse_number, validate_match
+
+
+@pytest.mark.parametrize(
+    "mode, correct, options, answer, expected",
+    [
+        ("text", "Paris", None, "  paris ", True),
+        ("text", "Paris", None, "Paris.", False),
+        ("exact", "Paris", None, "paris", False),
+        ("exact", "Paris", None, " Paris ", True),
+        ("folded", "Paris", None, "  Paris.", True),
+        ("folded", "Ångström", None, "ångström!", True),
+        ("folded", "ＡＢＣ", None, "abc", True),
+        ("numeric", "3", None, "3.0", True),
+        ("numeric", "1,000", None, "1000", True),
+        ("numeric", "3.14", {"tolerance": 0.01}, "3.141", True),
+        ("numeric", "3.14", {"tolerance": 0.01}, "3.2", False),
+        ("numeric", "3", None, "three", False),
+        ("any_of", "USA", {"alternatives": ["United States", "U.S."]}, "united states", True),
+        ("any_of", "USA", {"alternatives": ["United States", "U.S."]}, "u s", True),
+        ("any_of", "USA", {"alternatives": ["United States"]}, "America", False),
+        ("fuzzy", "Mississippi", {"max_distance": 1}, "Missisippi", True),
+        ("fuzzy", "Mississippi", {"max_distance": 1}, "Misisipi", False),
+        ("fuzzy", "Mississippi", {"max_distance": 3}, "Misisipi", True),
+    ],
+)
+def test_matchers(mode, correct, options, answer, expected):
+    assert compile_matcher(mode, correct, options)(answer) is expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1,000", 1000.0),
+        ("-1,234,567.5", -1234567.5),
+        ("3.5", 3.5),
+        ("3,5", None),  # decimal comma: 3.5 or 35? rejected, not read as 35
+        ("1,00", None),
+        ("12,3456", None),
+        ("1,000,5", None),
+        (",5", None),
+    ],
+)
+def test_parse_number_accepts_commas_only_as_thousands_separators(text, expected):
+    assert parse_number(text) == expected
+
+
+def test_decimal_comma_answer_is_not_graded_as_a_larger_number():
+    matcher = compile_matcher("numeric", "35", None)
+    assert matcher("3,5") is False
+    assert matcher("35") is True
+    with pytest.raises(ValueError):
+        validate_match("numeric", None, "3,5")
+
+
+def test_validate_match_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        validate_match("regex", None, "x")
+    with pytest.raises(ValueError):
+        validate_match("numeric", None, "not a number")
+    with pytest.raises(ValueError):
+        validate_match("fuzzy", {"max_distance": 9}, "x")
+    assert validate_match("fuzzy", None, "x") == ("fuzzy", {"max_distance": 1})
+    assert validate_match("text", {"tolerance": 1}, "x") == ("text", None)
+
+
+def test_submit_grades_with_each_questions_matcher(client):
+    payload = {
+        "title": "Matchers",
+        "description": "",
+        "questions": [
+            {"text": "Capital of France?", "correct_answer": "Paris", "match_mode": "folded"},
+            {
+                "text": "Pi to two places?",
+                "correct_answer": "3.14",
+                "match_mode": "numeric",
+                "match_options": {"tolerance": 0.005},
+            },
+            {
+                "text": "Largest ocean?",
+                "correct_answer": "Pacific",
+                "match_mode": "any_of",
+                "match_options": {"alternatives": ["Pacific Ocean"]},
+            },
+        ],
+    }
+    quiz_id = client.post("/api/quizzes", json=payload).json()["id"]
+    questions = client.get(f"/api/quizzes/{quiz_id}").json()["questions"]
+    assert [q["match_mode"] for q in questions] == ["folded", "numeric", "any_of"]
+
+    answers = ["  paris.", "3.140", "the pacific ocean"]
+    resp = client.post(
+        f"/api/quizzes/{quiz_id}/submit",
+        json={"answers": [{"question_id": q["id"], "answer": a} for q, a in zip(questions, answers)]},
+    )
+    assert [r["is_correct"] for r in resp.json()["results"]] == [True, True, False]
+
+
+def test_create_rejects_invalid_matcher(client):
+    payload = {
+        "title": "Bad",
+        "description": "",
+        "questions": [{"text": "Q", "correct_answer": "abc", "match_mode": "numeric"}],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 400
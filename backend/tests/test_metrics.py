@@ -0,0 +1,85 @@
+from app.core.database import pool_stats
+from app.core.metrics import StatsCollector, registry
+
+
+def _server_timing(resp) -> dict:
+    entries = {}
+    for part in resp.headers["server-timing"].split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        entries[name] = dict(p.split("=", 1) for p in params)
+    return entries
+
+
+def test_server_timing_counts_statements(client):
+    resp = client.post(
+        "/api/quizzes",
+        json={"title": "Timed", "description": "", "questions": [{"text": "Q", "correct_answer": "A"}]},
+    )
+    assert resp.status_code == 201
+    timing = _server_timing(resp)
+    assert set(timing) == {"db", "auth", "app", "serialize", "total"}
+    queries = int(timing["db"]["desc"].strip('"').split()[0])
+    assert queries >= 3
+    assert float(timing["total"]["dur"]) >= float(timing["db"]["dur"])
+
+
+def test_metrics_endpoint_exposes_route_histograms(client):
+    registry.reset()
+    client.get("/api/quizzes")
+    client.get("/api/quizzes/12345")
+    client.get("/no-such-route")
+
+    body = client.get("/metrics").text
+    assert 'quickquiz_requests_total{method="GET",route="/api/quizzes",status="200"} 1' in body
+    assert 'quickquiz_requests_total{method="GET",route="/api/quizzes/{quiz_id}",status="404"} 1' in body
+    assert 'route="unmatched"' in body
+    assert "# TYPE quickquiz_db_statements histogram" in body
+    assert 'quickquiz_request_duration_seconds_count{method="GET",route="/api/quizzes"} 1' in body
+    assert 'quickquiz_db_statements_bucket{method="GET",route="/api/quizzes",le="+Inf"} 1' in body
+
+
+def test_metrics_endpoint_exposes_cache_stats(client):
+    quiz_id = client.post(
+        "/api/quizzes",
+        json={"title": "Ranked", "description": "", "questions": [{"text": "Q", "correct_answer": "A"}]},
+    ).json()["id"]
+    client.get(f"/api/quizzes/{quiz_id}/leaderboard")
+    client.get(f"/api/quizzes/{quiz_id}/leaderboard")
+
+    body = client.get("/metrics").text
+    assert "# TYPE quickquiz_leaderboard_cache_hits_total counter" in body
+    assert "quickquiz_leaderboard_cache_hits_total 1" in body
+    assert "quickquiz_leaderboard_cache_size 1" in body
+    assert "# TYPE quickquiz_token_cache_size gauge" in body
+    assert "quickquiz_user_cache_misses_total" in body
+
+
+def test_stats_collector_labels_and_skips_non_numeric_values():
+    collector = StatsCollector(prefix="t")
+    sync = {"checkouts": 3, "size": 5, "backend": "x"}
+    asynchronous = {"checkouts": 1, "size": 2}
+    collector.register("pool", lambda: sync, "Pool", counters=("checkouts",), labels={"engine": "sync"})
+    collector.register("pool", lambda: asynchronous, "Pool", counters=("checkouts",), labels={"engine": "async"})
+
+    assert collector.render().splitlines() == [
+        "# HELP t_pool_checkouts_total Pool: checkouts",
+        "# TYPE t_pool_checkouts_total counter",
+        't_pool_checkouts_total{engine="sync"} 3',
+        't_pool_checkouts_total{engine="async"} 1',
+        "# HELP t_pool_size Pool: size",
+        "# TYPE t_pool_size gauge",
+        't_pool_size{engine="sync"} 5',
+        't_pool_size{engine="async"} 2',
+    ]
+
+
+def test_metrics_endpoint_exposes_pool_stats(client, monkeypatch):
+    for name, value in (("checkouts", 1), ("timeouts", 1), ("wait_seconds", 1.75), ("max_wait_seconds", 1.5)):
+        monkeypatch.setattr(pool_stats, name, value)
+
+    body = client.get("/metrics").text
+    assert 'quickquiz_db_pool_checkouts_total{engine="sync"} 1' in body
+    assert 'quickquiz_db_pool_timeouts_total{engine="sync"} 1' in body
+    assert 'quickquiz_db_pool_wait_seconds_total{engine="sync"} 1.75' in body
+    assert 'quickquiz_db_pool_wait_seconds_max{engine="sync"} 1.5' in body
+    assert 'quickquiz_db_pool_checkouts_total{engine="async"}' in body
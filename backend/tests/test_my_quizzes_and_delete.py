@@ -35,4 +35,4 @@ def test_delete_quiz_by_owner(client):
     # Confirm it's not in public list
     list_resp = client.get("/api/quizzes")
     assert list_resp.status_code == 200
-    assert all(q["id"] != quiz_id for q in list_resp.json())
+    assert all(q["id"] != quiz_id for q in list_resp.json()["items"])
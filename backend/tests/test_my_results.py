@@ -0,0 +1,49 @@
+def _create_quiz(client, title="Results Quiz"):
+    payload = {
+        "title": title,
+        "description": "for my-results",
+        "questions": [{"text": "Q1", "correct_answer": "A1"}],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _submit(client, quiz_id, answer):
+    question_id = client.get(f"/api/quizzes/{quiz_id}").json()["questions"][0]["id"]
+    resp = client.post(
+        f"/api/quizzes/{quiz_id}/submit",
+        json={"answers": [{"question_id": question_id, "answer": answer}]},
+    )
+    assert resp.status_code == 200
+    return resp.json()["attempt_id"]
+
+
+def test_my_results_pages_newest_first(client):
+    quiz_id = _create_quiz(client)
+    attempt_ids = [_submit(client, quiz_id, "a1" if i % 2 else "nope") for i in range(5)]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/api/quizzes/my-results", params=params)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert len(page["items"]) <= 2
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert [a["id"] for a in seen] == sorted(attempt_ids, reverse=True)
+    assert all(a["quiz_title"] == "Results Quiz" for a in seen)
+    assert [a["score"] for a in seen] == [0, 1, 0, 1, 0]
+    assert all(a["created_at"] for a in seen)
+
+
+def test_my_results_rejects_bad_cursor(client):
+    resp = client.get("/api/quizzes/my-results", params={"cursor": "bogus"})
+    assert resp.status_code == 400
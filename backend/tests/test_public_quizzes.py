@@ -6,5 +6,43 @@ client = TestClient(app)
 def test_list_public_quizzes_initially_empty(client):
     resp = client.get("/api/quizzes")
     assert resp.status_code == 200
-    assert resp.json() == []
+    assert resp.json() == {"items": [], "next_cursor": None}
+
+
+def _create_quiz(client, title):
+    payload = {
+        "title": title,
+        "description": "paging",
+        "questions": [{"text": "Q1", "correct_answer": "A1"}],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def test_list_public_quizzes_paginates_with_cursor(client):
+    ids = [_create_quiz(client, f"Quiz {i}") for i in range(5)]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/api/quizzes", params=params)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert len(page["items"]) <= 2
+        seen.extend(q["id"] for q in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    # newest first, every quiz exactly once
+    assert seen == sorted(ids, reverse=True)
+
+
+def test_list_public_quizzes_rejects_bad_cursor(client):
+    resp = client.get("/api/quizzes", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
 
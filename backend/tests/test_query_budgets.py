@@ -0,0 +1,136 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.models.models import Attempt, AttemptAnswer, LatestAttempt, Question, Quiz, User
+
+
+# ---------------------------------------------------------------------------
+# Query budgets
+# ---------------------------------------------------------------------------
+# Every endpoint is called against databases seeded with 1, 100 and 10k
+# attempts (and as many extra quizzes) and must stay within an explicit
+# statement budget. A budget is what the endpoint needs at every size, not
+# a multiple of it, so an N+1 query fails here at the larger sizes before
+# it reaches production. Cached responses would hide
+# the queries, so every call below is the first of its kind in the test.
+
+SIZES = [1, 100, 10_000]
+
+QUESTIONS = [
+    {"text": "Capital of France?", "correct_answer": "Paris"},
+    {"text": "2 + 2?", "correct_answer": "4"},
+    {"text": "Largest ocean?", "correct_answer": "Pacific"},
+]
+
+
+def _seed(client, db, size: int) -> dict:
+    """One quiz via the API, then `size` attempts at it and `size` more quizzes, in bulk."""
+    quiz_id = client.post(
+        "/api/quizzes",
+        json={"title": "Budget quiz", "description": "seeded", "questions": QUESTIONS},
+    ).json()["id"]
+    user_id = db.execute(select(User.id)).scalar_one()
+    question_ids = db.execute(
+        select(Question.id).where(Question.quiz_id == quiz_id).order_by(Question.order)
+    ).scalars().all()
+
+    start = datetime.utcnow() - timedelta(days=1)
+    attempt_ids = db.execute(
+        insert(Attempt).returning(Attempt.id, sort_by_parameter_order=True),
+        [
+            {
+                "quiz_id": quiz_id,
+                "user_id": user_id,
+                "score": i % 4,
+                "total": 3,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(size)
+        ],
+    ).scalars().all()
+    db.execute(
+        insert(AttemptAnswer),
+        [
+            {"attempt_id": a, "question_id": q, "user_answer": "x", "is_correct": False}
+            for a in attempt_ids
+            for q in question_ids
+        ],
+    )
+    db.execute(
+        insert(LatestAttempt).values(
+            user_id=user_id, quiz_id=quiz_id, attempt_id=attempt_ids[-1], score=0, total=3
+        )
+    )
+    db.execute(
+        insert(Quiz),
+        [
+            {"title": f"Extra {i}", "description": "", "creator_id": user_id, "is_public": True}
+            for i in range(size)
+        ],
+    )
+    db.commit()
+    return {"quiz_id": quiz_id, "question_ids": question_ids, "attempt_id": attempt_ids[-1]}
+
+
+def _update_payload(answer="Lyon"):
+    questions = [dict(q) for q in QUESTIONS]
+    questions[0]["correct_answer"] = answer
+    return {"title": "Budget quiz", "description": "seeded", "questions": questions}
+
+
+def _submit_payload(seeded):
+    return {
+        "answers": [
+            {"question_id": qid, "answer": a}
+            for qid, a in zip(seeded["question_ids"], ["paris", "4", "atlantic"])
+        ]
+    }
+
+
+# (name, budget, call) -- call(client, seeded) makes one request
+ENDPOINTS = [
+    ("list_public_quizzes", 1, lambda c, s: c.get("/api/quizzes")),
+    ("search_public_quizzes", 1, lambda c, s: c.get("/api/quizzes/search?q=budget")),
+    ("list_my_quizzes", 1, lambda c, s: c.get("/api/quizzes/my")),
+    ("get_quiz", 2, lambda c, s: c.get(f"/api/quizzes/{s['quiz_id']}")),
+    ("get_my_results", 1, lambda c, s: c.get("/api/quizzes/my-results")),
+    ("get_my_latest_attempts", 1, lambda c, s: c.get(f"/api/quizzes/my-latest-attempts?ids={s['quiz_id']}")),
+    ("get_my_latest_attempt", 1, lambda c, s: c.get(f"/api/quizzes/{s['quiz_id']}/my-latest-attempt")),
+    ("get_attempt", 1, lambda c, s: c.get(f"/api/quizzes/attempts/{s['attempt_id']}")),
+    ("get_stats", 4, lambda c, s: c.get(f"/api/quizzes/{s['quiz_id']}/stats")),
+    ("get_leaderboard", 3, lambda c, s: c.get(f"/api/quizzes/{s['quiz_id']}/leaderboard")),
+    ("submit_quiz", 12, lambda c, s: c.post(f"/api/quizzes/{s['quiz_id']}/submit", json=_submit_payload(s))),
+    (
+        "create_quiz",
+        4,
+        lambda c, s: c.post(
+            "/api/quizzes", json={"title": "New", "description": "", "questions": QUESTIONS}
+        ),
+    ),
+    ("update_quiz", 6, lambda c, s: c.put(f"/api/quizzes/{s['quiz_id']}", json=_update_payload())),
+    (
+        "import_quizzes",
+        4,
+        lambda c, s: c.post(
+            "/api/quizzes/import?format=ndjson",
+            content="\n".join(
+                json.dumps({"title": f"Imported {i}", "questions": QUESTIONS}) for i in range(50)
+            ),
+        ),
+    ),
+    ("export_attempts", 2, lambda c, s: c.get(f"/api/quizzes/{s['quiz_id']}/attempts/export")),
+    ("delete_quiz", 11, lambda c, s: c.delete(f"/api/quizzes/{s['quiz_id']}")),
+]
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("name, budget, call", ENDPOINTS, ids=[e[0] for e in ENDPOINTS])
+def test_query_budget(client, db, count_queries, size, name, budget, call):
+    seeded = _seed(client, db, size)
+    with count_queries() as queries:
+        resp = call(client, seeded)
+    assert resp.status_code < 400, resp.text
+    assert len(queries) <= budget, "\n".join(queries)
@@ -0,0 +1,73 @@
+from app.models.models import Quiz, QuizStats
+from app.services.stats import rebuild_stats
+
+
+def _create_quiz(client, title="Stats Quiz"):
+    payload = {
+        "title": title,
+        "description": "stats",
+        "questions": [
+            {"text": "Q1", "correct_answer": "A1"},
+            {"text": "Q2", "correct_answer": "A2"},
+        ],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _submit(client, quiz_id, *answers):
+    questions = client.get(f"/api/quizzes/{quiz_id}").json()["questions"]
+    resp = client.post(
+        f"/api/quizzes/{quiz_id}/submit",
+        json={
+            "answers": [
+                {"question_id": q["id"], "answer": a} for q, a in zip(questions, answers)
+            ]
+        },
+    )
+    assert resp.status_code == 200
+
+
+def test_stats_accumulate_on_submit(client):
+    quiz_id = _create_quiz(client)
+    empty = client.get(f"/api/quizzes/{quiz_id}/stats").json()
+    assert empty["attempt_count"] == 0 and empty["median_percent"] is None
+
+    _submit(client, quiz_id, "a1", "a2")
+    _submit(client, quiz_id, "a1", "no")
+    _submit(client, quiz_id, "no", "no")
+
+    stats = client.get(f"/api/quizzes/{quiz_id}/stats").json()
+    assert stats["attempt_count"] == 3
+    assert stats["mean_score"] == 1.0
+    assert stats["mean_percent"] == 50.0
+    assert stats["median_percent"] == 50
+    counts = {b["from_percent"]: b["count"] for b in stats["histogram"]}
+    assert (counts[0], counts[50], counts[100]) == (1, 1, 1)
+    assert [(q["answered"], q["correct"]) for q in stats["questions"]] == [(3, 2), (3, 1)]
+
+
+def test_stats_are_creator_only(client, db):
+    quiz_id = _create_quiz(client)
+    db.query(Quiz).filter(Quiz.id == quiz_id).update({"creator_id": 999})
+    db.commit()
+    assert client.get(f"/api/quizzes/{quiz_id}/stats").status_code == 403
+    assert client.get("/api/quizzes/12345/stats").status_code == 404
+
+
+def test_rebuild_recomputes_and_verifies(client, db):
+    quiz_id = _create_quiz(client)
+    _submit(client, quiz_id, "a1", "a2")
+    _submit(client, quiz_id, "no", "a2")
+
+    assert rebuild_stats(db, verify=True)["mismatched"] == []
+
+    db.query(QuizStats).update({"attempt_count": 42})
+    db.commit()
+    assert rebuild_stats(db, verify=True)["mismatched"] == [quiz_id]
+
+    rebuild_stats(db)
+    db.commit()
+    assert rebuild_stats(db, verify=True)["mismatched"] == []
+    assert client.get(f"/api/quizzes/{quiz_id}/stats").json()["attempt_count"] == 2
@@ -0,0 +1,58 @@
+def _payload(questions, title="Editable Quiz"):
+    return {
+        "title": title,
+        "description": "edit me",
+        "questions": [{"text": t, "correct_answer": a} for t, a in questions],
+    }
+
+
+def _question_ids(client, quiz_id):
+    data = client.get(f"/api/quizzes/{quiz_id}").json()
+    return [(q["id"], q["text"], q["correct_answer"]) for q in data["questions"]]
+
+
+def _create(client, questions):
+    resp = client.post("/api/quizzes", json=_payload(questions))
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def test_update_keeps_ids_of_unchanged_and_edited_questions(client):
+    quiz_id = _create(client, [("Q1", "A1"), ("Q2", "A2"), ("Q3", "A3")])
+    before = _question_ids(client, quiz_id)
+
+    resp = client.put(
+        f"/api/quizzes/{quiz_id}",
+        json=_payload([("Q1", "A1"), ("Q2 fixed", "A2"), ("Q3", "A3")], title="Renamed"),
+    )
+    assert resp.status_code == 200
+    assert resp.json()["title"] == "Renamed"
+
+    after = _question_ids(client, quiz_id)
+    assert [q[0] for q in after] == [q[0] for q in before]
+    assert after[1][1] == "Q2 fixed"
+
+
+def test_update_appends_and_removes_by_order(client):
+    quiz_id = _create(client, [("Q1", "A1"), ("Q2", "A2")])
+    before = _question_ids(client, quiz_id)
+
+    client.put(f"/api/quizzes/{quiz_id}", json=_payload([("Q1", "A1"), ("Q2", "A2"), ("Q3", "A3")]))
+    grown = _question_ids(client, quiz_id)
+    assert [q[0] for q in grown[:2]] == [q[0] for q in before]
+    assert grown[2][1:] == ("Q3", "A3")
+
+    client.put(f"/api/quizzes/{quiz_id}", json=_payload([("Q1", "A1")]))
+    shrunk = _question_ids(client, quiz_id)
+    assert shrunk == [before[0]]
+
+
+def test_update_rejects_empty_question_without_writing(client):
+    quiz_id = _create(client, [("Q1", "A1")])
+
+    resp = client.put(f"/api/quizzes/{quiz_id}", json=_payload([("  ", "A1")], title="Changed"))
+    assert resp.status_code == 400
+
+    data = client.get(f"/api/quizzes/{quiz_id}").json()
+    assert data["title"] == "Editable Quiz"
+    assert data["questions"][0]["text"] == "Q1"
@@ -0,0 +1,124 @@
+import pytest
+
+from app.core.config import settings
+from app.models.models import Attempt, AttemptAnswer, RegradeJob
+from app.services.regrade import regrade_quiz
+
+
+QUESTIONS = [
+    {"text": "Q1", "correct_answer": "A1"},
+    {"text": "Q2", "correct_answer": "A2"},
+]
+
+
+def _create_quiz(client):
+    resp = client.post(
+        "/api/quizzes",
+        json={"title": "Regrade", "description": "", "questions": QUESTIONS},
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _submit(client, quiz_id, *answers):
+    questions = client.get(f"/api/quizzes/{quiz_id}").json()["questions"]
+    resp = client.post(
+        f"/api/quizzes/{quiz_id}/submit",
+        json={
+            "answers": [
+                {"question_id": q["id"], "answer": a} for q, a in zip(questions, answers)
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    return resp.json()["attempt_id"]
+
+
+def _fix_second_answer(client, quiz_id, answer="B"):
+    resp = client.put(
+        f"/api/quizzes/{quiz_id}",
+        json={
+            "title": "Regrade",
+            "description": "",
+            "questions": [QUESTIONS[0], {"text": "Q2", "correct_answer": answer}],
+        },
+    )
+    assert resp.status_code == 200
+
+
+def _scores(db, *attempt_ids):
+    db.expire_all()
+    return [db.get(Attempt, attempt_id).score for attempt_id in attempt_ids]
+
+
+def test_regrade_rewrites_answers_scores_and_aggregates(client, db):
+    quiz_id = _create_quiz(client)
+    first = _submit(client, quiz_id, "a1", "b")
+    second = _submit(client, quiz_id, "x", "b")
+    assert _scores(db, first, second) == [1, 0]
+
+    _fix_second_answer(client, quiz_id)
+    report = regrade_quiz(db, quiz_id, chunk_size=1)
+
+    assert report["status"] == "done"
+    assert (report["scanned"], report["changed"]) == (4, 2)
+    assert _scores(db, first, second) == [2, 1]
+    assert db.query(AttemptAnswer).filter(AttemptAnswer.is_correct == True).count() == 3
+
+    latest = client.get(f"/api/quizzes/{quiz_id}/my-latest-attempt").json()
+    assert latest["score"] == 1
+    stats = client.get(f"/api/quizzes/{quiz_id}/stats").json()
+    assert stats["mean_score"] == 1.5
+    assert [q["correct"] for q in stats["questions"]] == [1, 2]
+
+
+def test_regrade_resumes_from_checkpoint(client, db):
+    quiz_id = _create_quiz(client)
+    attempts = [_submit(client, quiz_id, "a1", "b") for _ in range(3)]
+    _fix_second_answer(client, quiz_id)
+
+    def crash_after_first_chunk(report):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        regrade_quiz(db, quiz_id, chunk_size=2, on_chunk=crash_after_first_chunk)
+    db.rollback()
+    assert db.get(RegradeJob, quiz_id).last_answer_id > 0
+
+    report = regrade_quiz(db, quiz_id, chunk_size=2)
+    assert report["status"] == "done"
+    assert (report["scanned"], report["changed"], report["run_scanned"]) == (6, 3, 4)
+    assert _scores(db, *attempts) == [2, 2, 2]
+
+    again = regrade_quiz(db, quiz_id)
+    assert again["run_scanned"] == 0
+    assert _scores(db, *attempts) == [2, 2, 2]
+
+
+def test_resumed_run_refreshes_cached_boards(client, db):
+    quiz_id = _create_quiz(client)
+    _submit(client, quiz_id, "a1", "b")
+    _fix_second_answer(client, quiz_id)
+    assert client.get(f"/api/quizzes/{quiz_id}/leaderboard").json()["entries"][0]["score"] == 1
+
+    def crash_after_first_chunk(report):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        regrade_quiz(db, quiz_id, chunk_size=2, on_chunk=crash_after_first_chunk)
+    db.rollback()
+
+    report = regrade_quiz(db, quiz_id, chunk_size=2)
+    assert (report["status"], report["changed"], report["run_changed"]) == ("done", 1, 0)
+    assert client.get(f"/api/quizzes/{quiz_id}/leaderboard").json()["entries"][0]["score"] == 2
+
+
+def test_update_schedules_background_regrade(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "REGRADE_ON_UPDATE", True)
+    quiz_id = _create_quiz(client)
+    attempt_id = _submit(client, quiz_id, "a1", "b")
+
+    _fix_second_answer(client, quiz_id)
+
+    assert _scores(db, attempt_id) == [2]
+    assert db.get(RegradeJob, quiz_id).status == "done"
@@ -0,0 +1,120 @@
+import pytest
+
+from app.core.response_cache import CacheBackend, MemoryBackend, ResponseCache, SQLiteBackend, response_cache
+
+
+def _create_quiz(client, title="Cached"):
+    payload = {
+        "title": title,
+        "description": "response cache",
+        "questions": [{"text": "Q1", "correct_answer": "A1"}],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def test_quiz_detail_is_served_from_cache_until_edited(client):
+    quiz_id = _create_quiz(client)
+
+    client.get(f"/api/quizzes/{quiz_id}")
+    client.get(f"/api/quizzes/{quiz_id}")
+    assert response_cache.stats()["hits"] == 1
+
+    client.put(
+        f"/api/quizzes/{quiz_id}",
+        json={
+            "title": "Cached (edited)",
+            "description": "response cache",
+            "questions": [{"text": "Q1", "correct_answer": "A1"}],
+        },
+    )
+    assert client.get(f"/api/quizzes/{quiz_id}").json()["title"] == "Cached (edited)"
+
+
+def test_hit_ratio_and_time_saved_are_exported_as_metrics(client):
+    quiz_id = _create_quiz(client)
+    response_cache.reset_stats()
+
+    client.get(f"/api/quizzes/{quiz_id}")
+    client.get(f"/api/quizzes/{quiz_id}")
+
+    stats = response_cache.stats()
+    body = client.get("/metrics").text
+    assert "quickquiz_response_cache_hits_total 1" in body
+    assert f"quickquiz_response_cache_misses_total {stats['misses']}" in body
+    assert "# TYPE quickquiz_response_cache_hit_ratio gauge" in body
+    assert f"quickquiz_response_cache_hit_ratio {stats['hit_ratio']}" in body
+    assert "# TYPE quickquiz_response_cache_seconds_saved_total counter" in body
+
+
+def test_listing_is_invalidated_by_create_and_delete(client):
+    first_id = _create_quiz(client, "First")
+    assert [q["id"] for q in client.get("/api/quizzes").json()["items"]] == [first_id]
+
+    second_id = _create_quiz(client, "Second")
+    assert [q["id"] for q in client.get("/api/quizzes").json()["items"]] == [second_id, first_id]
+
+    client.delete(f"/api/quizzes/{second_id}")
+    assert [q["id"] for q in client.get("/api/quizzes").json()["items"]] == [first_id]
+
+
+def test_my_results_is_invalidated_by_submit(client):
+    quiz_id = _create_quiz(client)
+    assert client.get("/api/quizzes/my-results").json()["items"] == []
+
+    question_id = client.get(f"/api/quizzes/{quiz_id}").json()["questions"][0]["id"]
+    client.post(
+        f"/api/quizzes/{quiz_id}/submit",
+        json={"answers": [{"question_id": question_id, "answer": "a1"}]},
+    )
+
+    results = client.get("/api/quizzes/my-results").json()["items"]
+    assert len(results) == 1
+    assert results[0]["score"] == 1
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "responses.db")
+    worker_a = ResponseCache(SQLiteBackend(path), ttl=60)
+    worker_b = ResponseCache(SQLiteBackend(path), ttl=60)
+
+    key = f"quiz:1:g{worker_a.generation('quiz:1')}:public"
+    worker_a.set(key, {"title": "v1"}, cost=0.25)
+    assert worker_b.get(key) == {"title": "v1"}
+    assert worker_b.stats()["seconds_saved"] == 0.25
+
+    worker_b.invalidate("quiz:1")
+    new_key = f"quiz:1:g{worker_a.generation('quiz:1')}:public"
+    assert new_key != key
+    assert worker_a.get(new_key) is None
+
+
+def test_memory_backend_expires_and_evicts():
+    now = [0.0]
+    backend = MemoryBackend(max_entries=2, clock=lambda: now[0])
+
+    backend.set("a", b"1", ttl=10)
+    now[0] = 10.0
+    assert backend.get("a") is None
+
+    backend.set("b", b"2", ttl=10)
+    backend.set("c", b"3", ttl=10)
+    backend.set("d", b"4", ttl=10)
+    assert backend.get("b") is None
+    assert backend.get("d") == b"4"
+
+
+def test_incomplete_backend_fails_when_created():
+    class NoCounters(CacheBackend):
+        def get(self, key):
+            return None
+
+        def set(self, key, value, ttl):
+            pass
+
+        def clear(self):
+            pass
+
+    with pytest.raises(TypeError, match="counter"):
+        NoCounters()
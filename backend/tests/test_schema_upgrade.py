@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.database import create_schema, missing_columns, missing_indexes, pending_upgrades
+from app.models.models import Question, Quiz
+from app.services.answer_keys import load_answer_key
+from app.services.scoring import score_answers
+
+
+# -----------------------------------------------------------------------------
+# Upgrading a database created from the original schema
+# -----------------------------------------------------------------------------
+
+BASELINE_DDL = [
+    """CREATE TABLE users (
+        id INTEGER NOT NULL PRIMARY KEY,
+        firebase_uid VARCHAR NOT NULL UNIQUE,
+        email VARCHAR NOT NULL UNIQUE,
+        display_name VARCHAR,
+        picture VARCHAR
+    )""",
+    """CREATE TABLE quizzes (
+        id INTEGER NOT NULL PRIMARY KEY,
+        title VARCHAR NOT NULL,
+        description TEXT,
+        creator_id INTEGER NOT NULL REFERENCES users (id),
+        created_at DATETIME,
+        is_public BOOLEAN
+    )""",
+    """CREATE TABLE questions (
+        id INTEGER NOT NULL PRIMARY KEY,
+        quiz_id INTEGER NOT NULL REFERENCES quizzes (id),
+        "order" INTEGER NOT NULL,
+        text TEXT NOT NULL,
+        correct_answer TEXT NOT NULL
+    )""",
+    """CREATE TABLE attempts (
+        id INTEGER NOT NULL PRIMARY KEY,
+        quiz_id INTEGER REFERENCES quizzes (id),
+        user_id INTEGER REFERENCES users (id),
+        score INTEGER,
+        total INTEGER,
+        details JSON,
+        created_at DATETIME
+    )""",
+    """CREATE TABLE attempt_answers (
+        id INTEGER NOT NULL PRIMARY KEY,
+        attempt_id INTEGER NOT NULL REFERENCES attempts (id) ON DELETE CASCADE,
+        question_id INTEGER NOT NULL REFERENCES questions (id) ON DELETE CASCADE,
+        user_answer VARCHAR NOT NULL,
+        is_correct BOOLEAN
+    )""",
+    "CREATE INDEX ix_attempt_answers_attempt_id ON attempt_answers (attempt_id)",
+    "INSERT INTO users (id, firebase_uid, email) VALUES (1, 'u1', 'u1@test.local')",
+    "INSERT INTO quizzes (id, title, creator_id, is_public) VALUES (1, 'Kept', 1, 1), (2, 'Deleted', 1, 1)",
+    "INSERT INTO questions (id, quiz_id, \"order\", text, correct_answer) VALUES (1, 1, 0, 'Q?', 'A')",
+    "INSERT INTO attempts (id, quiz_id, user_id, score, total) VALUES (1, 2, 1, 1, 1)",
+    "DELETE FROM quizzes WHERE id = 2",
+]
+
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as conn:
+        for statement in BASELINE_DDL:
+            conn.exec_driver_sql(statement)
+    yield engine
+    engine.dispose()
+
+
+def test_existing_quizzes_gain_version_and_keep_ids_unique(baseline_engine):
+    assert "quizzes.version" in missing_columns(baseline_engine)
+    assert "quizzes (AUTOINCREMENT)" in pending_upgrades(baseline_engine)
+
+    create_schema(baseline_engine)
+
+    assert pending_upgrades(baseline_engine) == []
+    indexes = {index["name"] for index in inspect(baseline_engine).get_indexes("quizzes")}
+    assert "ix_quizzes_public_created_id" in indexes
+    with Session(baseline_engine) as db:
+        kept = db.execute(select(Quiz)).scalar_one()
+        assert (kept.id, kept.title, kept.version) == (1, "Kept", 1)
+
+        # quiz 2 was deleted before the upgrade, but its attempts still name it
+        db.add(Quiz(title="New", creator_id=1))
+        db.commit()
+        assert db.execute(select(Quiz.id).where(Quiz.title == "New")).scalar_one() == 3
+
+
+def test_existing_questions_gain_match_columns_and_still_grade(baseline_engine):
+    assert {"questions.match_mode", "questions.match_options"} <= set(missing_columns(baseline_engine))
+
+    create_schema(baseline_engine)
+
+    with Session(baseline_engine) as db:
+        question = db.execute(select(Question)).scalar_one()
+        assert (question.match_mode, question.match_options) == ("text", None)
+
+        key = load_answer_key(db, 1)
+        assert key.version == 1
+        assert score_answers(key, {1: " a "})[0] == 1
+        assert score_answers(key, {1: "b"})[0] == 0
+
+
+def test_existing_tables_gain_the_new_indexes(baseline_engine):
+    expected = {
+        "ix_attempts_user_id_desc",
+        "ix_attempts_user_quiz_created",
+        "ix_attempts_quiz_id",
+        "ix_attempt_answers_attempt_question",
+    }
+    assert expected <= set(missing_indexes(baseline_engine))
+    assert {f"index {name}" for name in expected} <= set(pending_upgrades(baseline_engine))
+
+    create_schema(baseline_engine)
+
+    assert missing_indexes(baseline_engine) == []
+    inspector = inspect(baseline_engine)
+    created = {index["name"] for table in ("attempts", "attempt_answers") for index in inspector.get_indexes(table)}
+    assert expected <= created
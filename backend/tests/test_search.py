@@ -0,0 +1,83 @@
+from app.services.search import rebuild_search_index
+
+
+def _create_quiz(client, title, description="", questions=("Q1",)):
+    payload = {
+        "title": title,
+        "description": description,
+        "questions": [{"text": q, "correct_answer": "A"} for q in questions],
+    }
+    resp = client.post("/api/quizzes", json=payload)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _search(client, q, **params):
+    resp = client.get("/api/quizzes/search", params={"q": q, **params})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_search_ranks_title_over_question_text(client):
+    in_question = _create_quiz(client, "Networking", questions=("What is a photon?",))
+    in_title = _create_quiz(client, "Photon basics", questions=("Speed of light?",))
+    _create_quiz(client, "Unrelated", questions=("Nothing here",))
+
+    ids = [q["id"] for q in _search(client, "photon")["items"]]
+    assert ids == [in_title, in_question]
+
+
+def test_search_prefix_matches_last_term_and_requires_every_term(client):
+    quiz_id = _create_quiz(client, "Cellular biology", description="Mitochondria and more")
+    _create_quiz(client, "Cellular networks")
+
+    assert [q["id"] for q in _search(client, "mitochondria cell")["items"]] == [quiz_id]
+    assert _search(client, "mitochon cellular")["items"] == []
+    assert _search(client, "!!!")["items"] == []
+
+
+def test_search_follows_updates_and_deletes(client):
+    quiz_id = _create_quiz(client, "Astronomy")
+    assert len(_search(client, "astronomy")["items"]) == 1
+
+    client.put(
+        f"/api/quizzes/{quiz_id}",
+        json={
+            "title": "Geology",
+            "description": "",
+            "questions": [{"text": "Name a volcano", "correct_answer": "Etna"}],
+        },
+    )
+    assert _search(client, "astronomy")["items"] == []
+    assert [q["id"] for q in _search(client, "volcano")["items"]] == [quiz_id]
+
+    client.delete(f"/api/quizzes/{quiz_id}")
+    assert _search(client, "volcano")["items"] == []
+
+
+def test_search_pages_with_cursor(client):
+    ids = {_create_quiz(client, f"Chemistry {i}") for i in range(5)}
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = _search(client, "chemistry", **params)
+        seen.extend(q["id"] for q in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 5 and set(seen) == ids
+
+    bad = client.get("/api/quizzes/search", params={"q": "chemistry", "cursor": "junk"})
+    assert bad.status_code == 400
+
+
+def test_rebuild_search_index(client, db):
+    quiz_id = _create_quiz(client, "Rebuilt", questions=("Ancient Rome",))
+
+    assert rebuild_search_index(db) == 1
+    db.commit()
+    assert [q["id"] for q in _search(client, "rome")["items"]] == [quiz_id]
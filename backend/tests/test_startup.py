@@ -0,0 +1,132 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from sqlalchemy import create_engine
+
+from app.core.database import create_schema, missing_tables
+
+
+# -----------------------------------------------------------------------------
+# Startup: importing the app must not touch the database or Firebase. These
+# run in a fresh interpreter, since this one already imported everything.
+# -----------------------------------------------------------------------------
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_python(code: str, tmp_path, **env) -> subprocess.CompletedProcess:
+    child_env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("GOOGLE_APPLICATION_CREDENTIALS", "FIREBASE_CREDENTIALS", "ASYNC_DB")
+    }
+    child_env.update(DATABASE_URL=f"sqlite:///{tmp_path / 'app.db'}", **env)
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=BACKEND_DIR,
+        env=child_env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_import_has_no_database_or_firebase_side_effects(tmp_path):
+    result = _run_python(
+        """
+        import sys
+        import app.main
+        from app.core import auth, database
+
+        assert database._engine is None
+        assert "firebase_admin" not in sys.modules
+        assert not auth.firebase_configured()
+        assert {"import:framework", "import:core", "import:routers"} <= set(app.main.startup_timings.phases)
+        """,
+        tmp_path,
+    )
+    assert result.returncode == 0, result.stderr
+    assert not (tmp_path / "app.db").exists()
+
+
+def test_init_db_command_creates_missing_tables(tmp_path):
+    result = _run_python(
+        """
+        from app.cli import main
+
+        assert main(["init-db", "--check"]) == 1
+        assert main(["init-db"]) == 0
+        assert main(["init-db", "--check"]) == 0
+        """,
+        tmp_path,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "schema: up to date" in result.stdout
+
+
+def test_init_db_backfills_legacy_attempt_answers(tmp_path):
+    result = _run_python(
+        """
+        from app.cli import main
+        from app.core.database import get_engine
+
+        assert main(["init-db"]) == 0
+        with get_engine().begin() as conn:
+            conn.exec_driver_sql("INSERT INTO users (id, firebase_uid, email) VALUES (1, 'u1', 'u1@test.local')")
+            conn.exec_driver_sql("INSERT INTO quizzes (id, title, creator_id) VALUES (1, 'Legacy', 1)")
+            conn.exec_driver_sql(
+                "INSERT INTO questions (id, quiz_id, \\"order\\", text, correct_answer) VALUES (1, 1, 0, 'Q?', 'A')"
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO attempts (id, quiz_id, user_id, score, total, details) VALUES "
+                "(1, 1, 1, 1, 1, '[{\\"question_id\\": 1, \\"user_answer\\": \\"a\\", \\"is_correct\\": true}]')"
+            )
+
+        assert main(["init-db", "--check"]) == 1
+        assert main(["init-db"]) == 0
+        assert main(["init-db", "--check"]) == 0
+        """,
+        tmp_path,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "attempt_answers: backfill pending, 1 row(s) for 1 attempt(s)" in result.stdout
+    assert "attempt_answers: backfilled 1 row(s) for 1 attempt(s)" in result.stdout
+
+
+def test_schema_created_at_startup_when_enabled(tmp_path):
+    result = _run_python(
+        """
+        from fastapi.testclient import TestClient
+        from app.core.database import missing_tables
+        from app.main import app
+
+        with TestClient(app) as client:
+            assert missing_tables() == []
+            assert client.get("/api/quizzes").status_code == 200
+        """,
+        tmp_path,
+        SCHEMA_CREATE_ON_STARTUP="true",
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "startup " in result.stdout  # the per-phase summary line
+
+
+def test_create_schema_reports_created_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    try:
+        missing = missing_tables(engine)
+        assert {"users", "quizzes", "questions", "attempts"} <= set(missing)
+
+        assert create_schema(engine) == missing
+        assert missing_tables(engine) == []
+        assert create_schema(engine) == []
+    finally:
+        engine.dispose()
+
+
+def test_metrics_export_startup_phases(client):
+    body = client.get("/metrics").text
+    assert "# TYPE quickquiz_startup_seconds gauge" in body
+    assert 'quickquiz_startup_seconds{phase="import:routers"}' in body
@@ -12,6 +12,13 @@ def _create_simple_quiz(client):
     assert resp.status_code == 201
     return resp.json()["id"]
 
+def _answers_for(client, quiz_id, answers):
+    questions = client.get(f"/api/quizzes/{quiz_id}").json()["questions"]
+    return [
+        {"question_id": q["id"], "answer": a}
+        for q, a in zip(questions, answers)
+    ]
+
 def test_get_quiz_details(client):
     quiz_id = _create_simple_quiz(client)
 
@@ -25,11 +32,11 @@ def test_submit_quiz_scoring_case_insensitive_and_trim(client):
     quiz_id = _create_simple_quiz(client)
 
     submission = {
-        "answers": [
+        "answers": _answers_for(client, quiz_id, [
             " 4 ",       # correct with spaces
             "blue",      # correct, different case
             "hi",        # correct, lower
-        ]
+        ])
     }
     resp = client.post(f"/api/quizzes/{quiz_id}/submit", json=submission)
     assert resp.status_code == 200
@@ -43,11 +50,11 @@ def test_submit_quiz_handles_incorrect_and_missing(client):
     quiz_id = _create_simple_quiz(client)
 
     submission = {
-        "answers": [
+        "answers": _answers_for(client, quiz_id, [
             "5",  # wrong
             "",   # blank
             # missing third -> should be treated as ""
-        ]
+        ])
     }
     resp = client.post(f"/api/quizzes/{quiz_id}/submit", json=submission)
     assert resp.status_code == 200
@@ -57,3 +64,33 @@ def test_submit_quiz_handles_incorrect_and_missing(client):
     assert data["total"] == 3
     assert len(data["results"]) == 3
     assert all(not r["is_correct"] for r in data["results"])
+
+def test_submit_persists_attempt_answers(client):
+    quiz_id = _create_simple_quiz(client)
+
+    submission = {"answers": _answers_for(client, quiz_id, ["4", "red", "hi"])}
+    data = client.post(f"/api/quizzes/{quiz_id}/submit", json=submission).json()
+    assert data["quiz_title"] == "Math & Color"
+    assert data["score"] == 2
+
+    resp = client.get(f"/api/quizzes/attempts/{data['attempt_id']}")
+    assert resp.status_code == 200
+    detail = resp.json()
+    assert detail["score"] == 2
+    assert [r["is_correct"] for r in detail["results"]] == [True, False, True]
+    assert detail["results"][1]["user_answer"] == "red"
+
+def test_submit_can_skip_details_json(client, db, monkeypatch):
+    from app.core.config import settings
+    from app.models.models import Attempt
+
+    monkeypatch.setattr(settings, "STORE_ATTEMPT_DETAILS", False)
+    quiz_id = _create_simple_quiz(client)
+
+    submission = {"answers": _answers_for(client, quiz_id, ["4", "blue", "hi"])}
+    attempt_id = client.post(f"/api/quizzes/{quiz_id}/submit", json=submission).json()["attempt_id"]
+
+    assert db.get(Attempt, attempt_id).details is None
+    detail = client.get(f"/api/quizzes/attempts/{attempt_id}").json()
+    assert detail["score"] == 3
+    assert len(detail["results"]) == 3
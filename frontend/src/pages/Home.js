@@ -1,37 +1,48 @@
-import React, { useEffect, useState } from "react";
-import { getPublicQuizzes, getMyLatestAttempt } from "../services/api";
+import React, { useCallback, useEffect, useState } from "react";
+import { getPublicQuizzes, getMyLatestAttempts } from "../services/api";
 import QuizCard from "../components/QuizCard";
 
 function Home() {
   const [quizzes, setQuizzes] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(false);
 
-  useEffect(() => {
-    const fetchQuizzes = async () => {
-      try {
-        const res = await getPublicQuizzes();
-        const quizzes = res.data;
-
-        // For each quiz, check if the logged-in user has an attempt
-        const updated = await Promise.all(
-          quizzes.map(async (quiz) => {
-            try {
-              const attemptRes = await getMyLatestAttempt(quiz.id);
-              return { ...quiz, latestAttempt: attemptRes.data };
-            } catch {
-              return { ...quiz, latestAttempt: { attempted: false } };
-            }
-          })
-        );
-
-        setQuizzes(updated);
-      } catch (err) {
-        console.error("Failed to fetch quizzes:", err);
+  // Fetch one page of the listing and append it; `cursor` is null for the first page
+  const fetchQuizzes = useCallback(async (cursor) => {
+    setLoading(true);
+    try {
+      const res = await getPublicQuizzes(cursor);
+      const quizzes = res.data.items;
+
+      // One request for the logged-in user's latest attempt on every card
+      let latest = {};
+      if (quizzes.length > 0) {
+        try {
+          const attemptRes = await getMyLatestAttempts(quizzes.map((q) => q.id));
+          latest = attemptRes.data;
+        } catch {
+          latest = {};
+        }
       }
-    };
 
-    fetchQuizzes();
+      const updated = quizzes.map((quiz) => ({
+        ...quiz,
+        latestAttempt: latest[quiz.id] || { attempted: false },
+      }));
+
+      setQuizzes((previous) => (cursor ? [...previous, ...updated] : updated));
+      setNextCursor(res.data.next_cursor);
+    } catch (err) {
+      console.error("Failed to fetch quizzes:", err);
+    } finally {
+      setLoading(false);
+    }
   }, []);
 
+  useEffect(() => {
+    fetchQuizzes(null);
+  }, [fetchQuizzes]);
+
   return (
     <div className="p-6">
       <h2 className="text-3xl font-bold text-center mb-6">Available Quizzes</h2>
@@ -40,6 +51,17 @@ function Home() {
           <QuizCard key={quiz.id} quiz={quiz} />
         ))}
       </div>
+      {nextCursor && (
+        <div className="text-center mt-6">
+          <button
+            className="bg-blue-600 text-white px-4 py-2 rounded hover:bg-blue-700 disabled:opacity-50"
+            onClick={() => fetchQuizzes(nextCursor)}
+            disabled={loading}
+          >
+            {loading ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
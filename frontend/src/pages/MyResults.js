@@ -1,17 +1,29 @@
-import React, { useEffect, useState } from "react";
+import React, { useCallback, useEffect, useState } from "react";
 import { getMyResults } from "../services/api";
 import { useNavigate } from "react-router-dom";
 
 function MyResults() {
   const [results, setResults] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(false);
   const navigate = useNavigate();
 
-  useEffect(() => {
-    getMyResults()
-      .then((res) => setResults(res.data))
-      .catch((err) => console.error("Error loading results:", err));
+  // Fetch one page of results (newest first) and append it
+  const loadResults = useCallback((cursor) => {
+    setLoading(true);
+    getMyResults(cursor)
+      .then((res) => {
+        setResults((previous) => (cursor ? [...previous, ...res.data.items] : res.data.items));
+        setNextCursor(res.data.next_cursor);
+      })
+      .catch((err) => console.error("Error loading results:", err))
+      .finally(() => setLoading(false));
   }, []);
 
+  useEffect(() => {
+    loadResults(null);
+  }, [loadResults]);
+
   if (!results.length)
     return <div className="p-6 text-center text-gray-600">No results yet.</div>;
 
@@ -42,6 +54,17 @@ function MyResults() {
           </div>
         ))}
       </div>
+      {nextCursor && (
+        <div className="text-center mt-6">
+          <button
+            className="bg-blue-600 text-white px-4 py-2 rounded hover:bg-blue-700 disabled:opacity-50"
+            onClick={() => loadResults(nextCursor)}
+            disabled={loading}
+          >
+            {loading ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -26,16 +26,19 @@ api.interceptors.request.use(
 );
 
 
-export const getPublicQuizzes = () => api.get("/quizzes");
+// Paged: pass the previous page's next_cursor to get the next one
+export const getPublicQuizzes = (cursor) => api.get("/quizzes", { params: { cursor: cursor || undefined } });
 export const getMyQuizzes = () => api.get("/quizzes/my");
 export const getQuizById = (id) => api.get(`/quizzes/${id}`);
-export const getMyResults = () => api.get("/quizzes/my-results");
+export const getMyResults = (cursor) => api.get("/quizzes/my-results", { params: { cursor: cursor || undefined } });
 export const getAttempt = (attemptId) => api.get(`/quizzes/attempts/${attemptId}`); // <-- NEW
 export const createQuiz = (data) => api.post("/quizzes", data);
 export const deleteQuiz = (id) => api.delete(`/quizzes/${id}`);
 export const updateQuiz = (id, data) => api.put(`/quizzes/${id}`, data);
 export const submitQuiz = (id, answers) => api.post(`/quizzes/${id}/submit`, { answers });
 export const getMyLatestAttempt = (id) => api.get(`/quizzes/${id}/my-latest-attempt`);
+export const getMyLatestAttempts = (ids) =>
+  api.get("/quizzes/my-latest-attempts", { params: { ids: ids.join(",") } });
 
 
 export default api;